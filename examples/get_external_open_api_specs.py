@@ -58,7 +58,9 @@ if __name__ == "__main__":
     )
 
     # Get external connector OpenAPI specs:
-    open_api_specs = conn.get_openapi_specs(description, "0.9.2")
+    open_api_specs = conn.get_openapi_specs(
+        description, "0.9.2", controller=conn.controller
+    )
 
     print("-" * 79)
     print(f"> Connector {EXTERNAL_CONNECTOR['CONNECTOR_ID']} OPEN_API SPECS:")
@@ -63,7 +63,9 @@ if __name__ == "__main__":
 
     # Get external connector OpenAPI specs:
     api_version = "0.9.2"
-    open_api_specs = conn.get_openapi_specs(description, api_version)
+    open_api_specs = conn.get_openapi_specs(
+        description, api_version, controller=conn.controller
+    )
 
     # Get first API specification:
     open_api_specs = open_api_specs[0]
@@ -0,0 +1,267 @@
+"""
+
+This is the asyncio counterpart of the generic RequestController. It exposes
+the same interface (request / get / post / put / patch / delete) but each call
+is a coroutine, backed by a single pooled httpx.AsyncClient, so that a single
+event loop can keep many requests in flight at the same time.
+
+"""
+
+import time
+import asyncio
+
+import httpx
+
+from loguru import logger
+
+from tsg_client.controllers.RequestController import RequestController
+from tsg_client.utils.compression import gzip_body
+from tsg_client.utils.deadline import (
+    DeadlineExceeded,
+    bound_timeout,
+    check_deadline,
+    remaining,
+)
+from tsg_client.utils.rate_limit import peer_key
+from tsg_client.utils.single_flight import AsyncSingleFlight, request_key
+from tsg_client.utils.transport import (
+    DEFAULT_TIMEOUT,
+    drop_none,
+    httpx_timeout,
+    url_origin,
+)
+
+
+class AsyncRequestController:
+    # Set to True if you want to verify the SSL certificate or None to ignore
+    verify = True
+
+    def __init__(
+        self,
+        base_url,
+        api_key,
+        connector_id,
+        agent_id=None,
+        max_connections=100,
+        retry_policy=None,
+        coalesce=False,
+        rate_limiter=None,
+        circuit_breaker=None,
+        http2=False,
+        timeout=DEFAULT_TIMEOUT,
+    ):
+        self.base_url = base_url
+        self.api_key = api_key
+        self.connector_id = connector_id
+        self.agent_id = agent_id
+        self.headers = {"Authorization": "Bearer " + api_key}
+        # Origins known not to accept compressed request bodies:
+        self.uncompressed_origins = set()
+        self.retry_policy = retry_policy  # Optional RetryPolicy
+        # Share the response of concurrent identical GET requests:
+        self.single_flight = AsyncSingleFlight() if coalesce else None
+        # Optional RateLimiter, per remote connector:
+        self.rate_limiter = rate_limiter
+        # Optional CircuitBreaker, per remote connector:
+        self.circuit_breaker = circuit_breaker
+        # A client to persist parameters and pool connections, with the
+        # same default (connect, read) timeout as the TSGController requests:
+        self.client = httpx.AsyncClient(
+            http2=http2,  # Multiplex requests over one connection (needs h2)
+            verify=self.verify,
+            timeout=httpx_timeout(timeout),
+            limits=httpx.Limits(max_connections=max_connections),
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    def merge_headers(self, headers=None):
+        return RequestController.merge_headers(self, headers)
+
+    async def request(
+        self,
+        method,
+        endpoint,
+        params=None,
+        data=None,
+        files=None,
+        expected_status_code=None,
+        headers=None,
+        base_url=None,
+        **kwargs,
+    ):
+        headers = self.merge_headers(headers)
+
+        if base_url is None:
+            base_url = self.base_url
+
+        # Raw (str / bytes) payloads are sent as request content in httpx
+        if isinstance(data, (str, bytes)):
+            kwargs["content"] = data
+            data = None
+
+        url = f"{base_url}/{endpoint}"
+        logger.debug(
+            f"method: {method} "
+            f"| url: {url} "
+            f"| params: {kwargs} "
+            f"| headers: {headers}"
+        )
+        # Streamed responses are returned before the body is read (the
+        # caller is responsible for closing them):
+        stream = kwargs.pop("stream", False)
+        timeout = kwargs.pop("timeout", None)
+        compress = kwargs.pop("compress", False)
+        request = self.client.build_request(
+            method,
+            url,
+            params=drop_none(params),
+            data=data,
+            headers=drop_none(headers),
+            files=files,
+            **kwargs,
+        )
+
+        # Gzip large request bodies (compress=True), if the server accepts
+        # them (it answers 415 Unsupported Media Type otherwise, RFC 7694)
+        response = None
+        if compress and url_origin(url) not in self.uncompressed_origins:
+            body = request.read()
+            compressed = gzip_body(body) if body else None
+            if compressed is not None:
+                compressed_request = self.client.build_request(
+                    method,
+                    url,
+                    params=drop_none(params),
+                    content=compressed,
+                    headers={
+                        **drop_none(headers),
+                        "Content-Type": request.headers["content-type"],
+                        "Content-Encoding": "gzip",
+                    },
+                )
+                response = await self.send(compressed_request, stream=stream, timeout=timeout)
+                if response.status_code == 415:
+                    logger.debug(f"url: {url} | compressed request body not accepted")
+                    self.uncompressed_origins.add(url_origin(url))
+                    await response.aclose()
+                    response = None
+        if response is None:
+            response = await self.send(request, stream=stream, timeout=timeout)
+
+        logger.debug(
+            f"method: {method} "
+            f"| url: {url} "
+            f"| params: {kwargs} "
+            f"| headers: {headers} "
+            f"| status: {response.status_code}"
+        )
+
+        RequestController.check_response(method, response, expected_status_code)
+
+        return response
+
+    async def send(self, request, stream=False, timeout=None):
+        """
+        Send a request through the client, retrying failed attempts
+        according to the controller retry policy (if any). The timeout of
+        each attempt is capped to the current deadline (if any). With
+        coalesce, concurrent identical (non streamed) GET requests share a
+        single response.
+        """
+        if self.single_flight is not None and request.method == "GET" and not stream:
+            key = request_key(request.method, str(request.url), headers=dict(request.headers))
+            return await self.single_flight.do(key, self._send, request, stream, timeout)
+        return await self._send(request, stream, timeout)
+
+    async def _send(self, request, stream=False, timeout=None):
+        if self.retry_policy is None:
+            return await self._send_once(request, stream, timeout)
+
+        method, url = request.method, request.url
+        # Buffer the body, so every attempt sends the same content:
+        await request.aread()
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                response = await self._send_once(request, stream, timeout)
+            except httpx.TransportError as e:
+                delay = self.retry_policy.next_delay(method, attempt, start, exception=e)
+                if delay is None:
+                    raise
+                reason = repr(e)
+            else:
+                delay = self.retry_policy.next_delay(
+                    method, attempt, start, response=response
+                )
+                if delay is None:
+                    return response
+                reason = f"status {response.status_code}"
+                await response.aclose()
+            attempt += 1
+            logger.warning(
+                f"method: {method} | url: {url} | {reason} "
+                f"| retry {attempt} in {delay:.2f}s"
+            )
+            await asyncio.sleep(delay)
+
+    async def _send_once(self, request, stream, timeout):
+        if self.rate_limiter is None and self.circuit_breaker is None:
+            return await self._client_send(request, stream, timeout)
+
+        peer = peer_key(str(request.url), dict(request.url.params), request.headers)
+        # An expired local deadline is not a failure of the peer
+        check_deadline()
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.before(peer)
+        if self.rate_limiter is not None:
+            await self.rate_limiter.async_acquire(peer)
+        start = time.monotonic()
+        try:
+            response = await self._client_send(request, stream, timeout)
+        except httpx.TransportError:
+            RequestController._record(self, peer, time.monotonic() - start)
+            raise
+        except BaseException:
+            # E.g., DeadlineExceeded or cancellation: the peer did not fail
+            RequestController._record(self, peer, None)
+            raise
+        RequestController._record(self, peer, time.monotonic() - start, response.status_code)
+        return response
+
+    async def _client_send(self, request, stream, timeout):
+        timeout = bound_timeout(timeout)
+        if timeout is not None:
+            request.extensions["timeout"] = httpx_timeout(timeout).as_dict()
+        try:
+            return await self.client.send(request, stream=stream)
+        except httpx.TimeoutException as e:
+            left = remaining()
+            if left is not None and left <= 0:
+                raise DeadlineExceeded(
+                    f"method: {request.method} | url: {request.url}"
+                ) from e
+            raise
+
+    async def get(self, endpoint, **kwargs):
+        return await self.request("GET", endpoint, **kwargs)
+
+    async def patch(self, endpoint, **kwargs):
+        return await self.request("PATCH", endpoint, **kwargs)
+
+    async def post(self, endpoint, **kwargs):
+        return await self.request("POST", endpoint, **kwargs)
+
+    async def put(self, endpoint, **kwargs):
+        return await self.request("PUT", endpoint, **kwargs)
+
+    async def delete(self, endpoint, **kwargs):
+        return await self.request("DELETE", endpoint, **kwargs)
@@ -0,0 +1,747 @@
+import time
+import functools
+import asyncio
+import httpx
+import bcrypt
+import urllib.parse
+
+from loguru import logger
+
+from tsg_client.controllers.AsyncRequestController import AsyncRequestController
+from tsg_client.controllers.Endpoints import Endpoints
+from tsg_client.controllers.SelfDescription import (
+    ContractOffer,
+    LazySelfDescription,
+    SelfDescription,
+)
+from tsg_client.controllers.TSGController import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_TIMEOUT,
+    TSGController,
+    artifact_file_target,
+    broker_urls,
+    save_artifact_response,
+)
+from tsg_client.utils import json_codec
+from tsg_client.utils.file_handling import async_save_stream_file
+
+
+class AsyncTSGController:
+    """
+    Asyncio counterpart of the TSGController. All the network methods are
+    coroutines with the same arguments, semantics and status code checks as
+    in the TSGController. Usage:
+
+        async with AsyncTSGController(api_key, connector_id, access_url) as conn:
+            self_description = await conn.get_connector_selfdescription(...)
+
+    Requests use the DEFAULT_TIMEOUT (connect, read) timeout, in seconds,
+    unless another timeout is given (None for no timeout).
+    """
+
+    # Parsing helpers do not perform any I/O and are shared with TSGController
+    parse_broker_connectors = staticmethod(TSGController.parse_broker_connectors)
+    parse_resource_catalogs = staticmethod(TSGController.parse_resource_catalogs)
+    parse_catalog_artifacts = staticmethod(TSGController.parse_catalog_artifacts)
+    iter_catalog_artifacts = staticmethod(TSGController.iter_catalog_artifacts)
+
+    def __init__(
+        self,
+        api_key,
+        connector_id,
+        access_url,
+        agent_id=None,
+        metadata_broker_url=None,
+        max_connections=100,
+        agreement_store=None,
+        retry_policy=None,
+        coalesce=False,
+        rate_limiter=None,
+        circuit_breaker=None,
+        broker_hedging=None,
+        compress_uploads=False,
+        http2=False,
+        lazy_selfdescriptions=False,
+        timeout=DEFAULT_TIMEOUT,
+    ):
+        self.catalogs = None
+        self.api_key = api_key
+        self.connector_id = connector_id
+        self.access_url = access_url
+        self.agent_id = agent_id
+        # Metadata broker URL, or list of mirror URLs (primary first):
+        self.metadata_broker_urls = broker_urls(metadata_broker_url)
+        self.metadata_broker_url = next(iter(self.metadata_broker_urls), None)
+        # Optional HedgedRequests, to query the broker mirrors:
+        self.broker_hedging = broker_hedging
+        # Gzip large artifact uploads (if the connector accepts them):
+        self.compress_uploads = compress_uploads
+        # Parse the catalogs of the self-descriptions on first access only:
+        self._selfdescription_class = (
+            LazySelfDescription if lazy_selfdescriptions else SelfDescription
+        )
+        self.agreement_store = agreement_store
+
+        # Start core container (connector) async http requests controller:
+        self.endpoints = Endpoints()
+        self.controller = AsyncRequestController(
+            base_url=self.access_url,
+            connector_id=self.connector_id,
+            agent_id=self.agent_id,
+            api_key=self.api_key,
+            max_connections=max_connections,
+            retry_policy=retry_policy,
+            coalesce=coalesce,
+            rate_limiter=rate_limiter,
+            circuit_breaker=circuit_breaker,
+            http2=http2,
+            timeout=timeout,
+        )
+
+    def __repr__(self):
+        return (
+            f"AsyncTSGController(connector_id={self.connector_id}, "
+            f"access_url={self.access_url}, "
+            f"agent_id={self.agent_id})"
+        )
+
+    async def __aenter__(self):
+        await self.validate_connection()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def aclose(self):
+        await self.controller.aclose()
+
+    async def validate_connection(self):
+        # Check if the inter-connector API is available and reachable with
+        # this API_KEY and ACCESS_URL.
+        try:
+            await self.controller.get(
+                endpoint=self.endpoints.RESOURCES, expected_status_code=200
+            )
+        except Exception as e:
+            raise Exception(f"Error connecting to the TSG connector: {repr(e)}")
+
+    async def get_connector_selfdescription(self,
+                                            access_url,
+                                            agent_id="",
+                                            connector_id="",
+                                            timeout=None):
+        """
+        Get self-descriptions from a connector from another dataspace
+        participant, given its connector CONNECTOR_ID and ACCESS_URL.
+
+        :param access_url: Access URL
+        :type access_url: str
+        :param connector_id: (optional) Connector ID
+        :type connector_id: str
+        :param agent_id: (optional)  Agent ID
+        :type agent_id: str
+        :param timeout: (optional) Request timeout, in seconds
+        :type timeout: float
+        :return: SelfDescription object
+        """
+
+        _access_url = f"{access_url}/selfdescription"
+
+        params = {
+            "connectorId": connector_id,
+            "accessUrl": _access_url,
+            "agentId": agent_id,
+        }
+        rsp = await self.controller.get(
+            endpoint=self.endpoints.DESCRIPTION,
+            params=params,
+            expected_status_code=200,
+            timeout=timeout,
+        )
+        try:
+            selfdescription = self._selfdescription_class.from_dict(json_codec.loads(rsp.content))
+        except ValueError as ve:
+            selfdescription = "error"
+            logger.exception(f"Error creating SelfDescription: {ve}")
+
+        return selfdescription
+
+    async def crawl_selfdescriptions(self, connectors=None, max_concurrency=100, timeout=30):
+        """
+        Fetch and parse the self-descriptions of several dataspace connectors
+        concurrently. Self-descriptions are yielded as soon as they arrive,
+        so a slow connector does not hold up the others. Connectors that
+        fail (or time out) are logged and skipped.
+
+        :param connectors: Metadata broker result, list of connectors
+         (see parse_broker_connectors) or list of access URLs. If None,
+         the metadata broker is queried.
+        :type connectors: list
+        :param max_concurrency: Maximum number of concurrent requests
+        :type max_concurrency: int
+        :param timeout: Total timeout (per connector), in seconds
+        :type timeout: float
+        :return: Async generator of (connector, SelfDescription) tuples
+        """
+        if connectors is None:
+            connectors = await self.query_metadata_broker()
+        connectors = self.parse_broker_connectors(connectors)
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch(connector):
+            async with semaphore:
+                try:
+                    self_description = await asyncio.wait_for(
+                        self.get_connector_selfdescription(
+                            access_url=connector["access_url"],
+                            agent_id=connector["agent_id"],
+                            connector_id=connector["connector_id"],
+                        ),
+                        timeout=timeout,
+                    )
+                except Exception as e:
+                    logger.warning(
+                        f"Error retrieving self-description from "
+                        f"{connector['access_url']}: {repr(e)}"
+                    )
+                    self_description = None
+                return connector, self_description
+
+        tasks = [asyncio.ensure_future(fetch(connector)) for connector in connectors]
+        try:
+            for task in asyncio.as_completed(tasks):
+                connector, self_description = await task
+                if isinstance(self_description, SelfDescription):
+                    yield connector, self_description
+        finally:
+            # Stop pending requests if the generator is closed early
+            for task in tasks:
+                task.cancel()
+
+    async def request_agreement(
+        self, connector_id, artifact_access_url, artifact_contract_offer
+    ):
+        """
+        Request Contract Agreement for a data artifact from another connector,
+
+        :param connector_id: Connector ID
+        :type connector_id: str
+        :param artifact_access_url: Artifact access URL
+        :type artifact_access_url: str
+        :param artifact_contract_offer: Artifact contract offer
+        :type artifact_contract_offer: ContractOffer, dict or str
+        :return: Contract Agreement ID
+
+        If the controller has an agreement_store, a non expired agreement
+        previously obtained for the same offer is returned without a new
+        contract request.
+        """
+        if self.agreement_store is not None:
+            # Reuse a (non expired) agreement previously obtained for this offer
+            agreement_id = self.agreement_store.get(
+                connector_id, artifact_access_url, artifact_contract_offer
+            )
+            if agreement_id is not None:
+                return agreement_id
+
+        payload = {
+            "connectorId": connector_id,
+            "agentId": "",
+            "contractOffer": ContractOffer.dumps(artifact_contract_offer),
+            "accessUrl": artifact_access_url,
+        }
+
+        rsp = await self.controller.post(
+            endpoint=self.endpoints.CONTRACT_REQUEST, data=payload, files={"a": "a"}
+        )
+        agreement = json_codec.loads(rsp.content)
+
+        if self.agreement_store is not None:
+            self.agreement_store.put(
+                connector_id, artifact_access_url, artifact_contract_offer, agreement
+            )
+
+        return agreement["@id"]
+
+    async def request_data_artifact(
+        self,
+        artifact_id,
+        artifact_access_url,
+        connector_id,
+        agent_id,
+        contract_agreement_id,
+        keep_original_format,
+        file_path,
+        stream=False,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+    ):
+        """
+        Request a data artifact from another connector, given the artifact
+         ACCESS_URL.
+
+        :param artifact_id: Artifact ID
+        :type artifact_id: str
+        :param artifact_access_url: Artifact access URL
+        :type artifact_access_url: str
+        :param connector_id: Connector ID
+        :type connector_id: str
+        :param agent_id: Agent ID
+        :type agent_id: str
+        :param contract_agreement_id: Contract agreement ID
+        :type contract_agreement_id: str
+        :param keep_original_format: Keep original format of the artifact (e.g., PDF, CSV, etc.)
+        :type keep_original_format: bool
+        :param file_path: Path to save the artifact file
+        :type file_path: str
+        :param stream: Write the artifact to disk in chunks, as it arrives,
+         instead of loading it in memory (recommended for large artifacts)
+        :type stream: bool
+        :param chunk_size: Size (bytes) of the streamed chunks
+        :type chunk_size: int
+        """
+
+        params = {
+            "artifact": artifact_id,
+            "connectorId": connector_id,
+            "agentId": agent_id,
+            "accessUrl": artifact_access_url,
+            "transferContract": contract_agreement_id,
+        }
+        rsp = await self.controller.get(
+            endpoint=self.endpoints.ARTIFACTS_CONSUMER, params=params, stream=stream
+        )
+
+        if stream:
+            try:
+                # Remove spaces & special characters from artifact_id
+                _artifact_id = artifact_id.strip().replace(":", "_")
+                extension, path = artifact_file_target(
+                    rsp.headers.get("content-type"), keep_original_format, file_path
+                )
+                if extension is None:
+                    return {"message": "Unsupported format"}
+                return await async_save_stream_file(
+                    _artifact_id, rsp.aiter_bytes(chunk_size), extension, path
+                )
+            finally:
+                await rsp.aclose()
+
+        return save_artifact_response(
+            rsp, artifact_id, keep_original_format, file_path
+        )
+
+    async def download_artifacts(
+        self,
+        artifacts,
+        connector_id,
+        agent_id,
+        file_path,
+        keep_original_format=True,
+        max_concurrency=8,
+        stream=True,
+    ):
+        """
+        Request contract agreements and download several data artifacts
+        (e.g., from parse_catalog_artifacts) from another connector,
+        concurrently. A failure on one artifact is recorded in its manifest
+        entry and does not abort the others.
+
+        :param artifacts: Artifacts list (see parse_catalog_artifacts)
+        :type artifacts: list
+        :param connector_id: Connector ID (artifacts provider)
+        :type connector_id: str
+        :param agent_id: Agent ID (artifacts provider)
+        :type agent_id: str
+        :param file_path: Path to save the artifact files
+        :type file_path: str
+        :param keep_original_format: Keep original format of the artifacts
+        :type keep_original_format: bool
+        :param max_concurrency: Maximum number of concurrent downloads
+        :type max_concurrency: int
+        :param stream: Stream the artifacts to disk (see request_data_artifact)
+        :type stream: bool
+        :return: Result manifest (one entry per artifact, in the same order)
+        """
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def download(artifact):
+            start = time.perf_counter()
+            entry = {
+                "id": artifact["id"],
+                "status": "success",
+                "contract_agreement_id": None,
+                "result": None,
+                "error": None,
+            }
+            try:
+                async with semaphore:
+                    entry["contract_agreement_id"] = await self.request_agreement(
+                        connector_id=connector_id,
+                        artifact_access_url=artifact["access_url"],
+                        artifact_contract_offer=artifact["contract_offer"],
+                    )
+                    entry["result"] = await self.request_data_artifact(
+                        artifact_id=artifact["id"],
+                        artifact_access_url=artifact["access_url"],
+                        connector_id=connector_id,
+                        agent_id=agent_id,
+                        contract_agreement_id=entry["contract_agreement_id"],
+                        keep_original_format=keep_original_format,
+                        file_path=file_path,
+                        stream=stream,
+                    )
+            except Exception as e:
+                logger.warning(f"Error downloading artifact {artifact['id']}: {repr(e)}")
+                entry["status"] = "error"
+                entry["error"] = repr(e)
+            entry["elapsed_seconds"] = time.perf_counter() - start
+            return entry
+
+        return list(await asyncio.gather(*[download(a) for a in artifacts]))
+
+    async def publish_data_artifact(self, artifact_file, title, description, contract_offer, catalog_id=None):
+        """
+        Publish a data artifact for this connector
+
+        :param title: Artifact title
+        :type title: str
+        :param artifact_file: Multipart file containing the artifact
+        :type artifact_file: file-like object
+        :param description: Artifact description
+        :type description: str
+        :param contract_offer: Contract offer
+        :type contract_offer: str
+        :param catalog_id: Catalog ID (optional)
+        :type catalog_id: str
+        """
+
+        ids_permission = [
+            permission["@id"] for permission in json_codec.loads(contract_offer).get('ids:permission', [])
+        ]
+
+        if ids_permission:
+            rsp = await self.controller.get(endpoint=self.endpoints.OFFERS)
+            rsp_json = json_codec.loads(rsp.content)
+
+            used_ids_permission = {
+                permission["@id"]
+                for obj in rsp_json
+                for permission in obj.get("ids:permission", [])
+            }
+
+            if set(ids_permission) & used_ids_permission:
+                raise ValueError("It is not allowed to reuse ids:Permission @id on contracts.")
+
+        payload = {
+            "title": title,
+            "description": description,
+            "contractOffer": contract_offer,
+        }
+
+        files = {
+            'artifact': artifact_file
+        }
+
+        rsp = await self.controller.post(
+            endpoint=self.endpoints.ARTIFACTS_PROVIDER,
+            data=payload,
+            files=files,
+            compress=self.compress_uploads,
+        )
+        rsp_json = json_codec.loads(rsp.content)
+
+        if catalog_id:
+            headers = {
+                'Content-type': 'application/json',
+            }
+
+            await self.controller.post(
+                endpoint=f"{self.endpoints.RESOURCES}/{catalog_id}",
+                data=json_codec.dumps(rsp_json),
+                headers=headers,
+            )
+
+        return rsp_json
+
+    async def delete_artifact(self, artifact_id):
+        """
+        Delete an artifact from this connector
+        """
+
+        encoded_string = urllib.parse.quote(artifact_id, safe="")
+        endpoint = self.endpoints.ARTIFACTS_PROVIDER + "/" + encoded_string
+
+        await self.controller.delete(endpoint=endpoint, expected_status_code=200)
+
+    async def edit_artifact(self, artifact_id, artifact, title, description, contract_offer):
+        """
+        Edit an artifact from this connector
+
+        :param artifact_id: Artifact ID
+        :type artifact_id: str
+        :param artifact: Artifact object
+        :type artifact: str
+        :param title: Artifact title
+        :type title: str
+        :param description: Artifact description
+        :type description: str
+        :param contract_offer: Contract offer
+
+        """
+        payload = {
+            "artifact": artifact,
+            "title": title,
+            "description": description,
+            "contractOffer": contract_offer,
+        }
+
+        encoded_string = urllib.parse.quote(artifact_id, safe="")
+        endpoint = self.endpoints.ARTIFACTS_PROVIDER + "/" + encoded_string
+
+        rsp = await self.controller.put(
+            endpoint=endpoint, data=payload, files=payload, compress=self.compress_uploads
+        )
+        return json_codec.loads(rsp.content)
+
+    async def get_connector_self_selfdescription(self):
+        """
+        Get self-description from this connector
+
+        :return: SelfDescription object
+        """
+
+        rsp = await self.controller.get(
+            endpoint=self.endpoints.SELF_DESCRIPTION, expected_status_code=200
+        )
+        try:
+            self_description = self._selfdescription_class.from_dict(json_codec.loads(rsp.content))
+        except ValueError as ve:
+            self_description = "error"
+            logger.exception(f"Error creating SelfDescription: {ve}")
+
+        return self_description
+
+    async def get_openapi_specs(self, external_self_description, api_version):
+        """
+        Get OpenAPI specs from an external connector self-description
+
+        :param external_self_description: External connector self-description
+        :param api_version: Data APP API version
+
+        :return: OpenAPI specs
+        """
+
+        connector_id = external_self_description.id
+        resource_catalog = external_self_description.catalogs
+
+        endpoint_documentation_urls = []
+        for resource in resource_catalog:
+            if resource.id == (connector_id + ":data-app"):
+                offered_resource = resource.offeredResource
+
+                for off_res in offered_resource:
+                    if off_res.path[-len(api_version) :] == api_version:
+                        _openapi_url = off_res.documentation
+                        _path = off_res.path
+                        _agent = _path.split("/")[1:-1][0]
+                        _version = _path.split("/")[-1]
+
+                        try:
+                            # Documentation is hosted outside the connector,
+                            # so no connector auth headers are sent:
+                            _rsp = await self.controller.client.get(_openapi_url)
+                            _endpoints = list(json_codec.loads(_rsp.content)["paths"].keys())
+                        except (httpx.HTTPError, ValueError, KeyError):
+                            _endpoints = None
+
+                        endpoint_documentation_urls.append(
+                            {
+                                "api_version": _version,
+                                "agent": _agent,
+                                "path": _agent,
+                                "openapi_url": _openapi_url,
+                                "endpoints": _endpoints,
+                            }
+                        )
+
+        return endpoint_documentation_urls
+
+    async def openapi_request(
+        self,
+        external_access_url,
+        data_app_agent_id,
+        api_version,
+        endpoint,
+        params="",
+        method="get",
+        headers=None,
+        data=None,
+    ):
+        """
+        Execute an OpenAPI request to an external connector
+
+        :param external_access_url: External access URL
+        :param data_app_agent_id: Data App Agent (retrieved from path)
+        :param api_version: External connector Data APP API version
+        :param endpoint: Target external connector REST API server endpoint
+        :param params: Request query parameters
+        :param method: Request type (get, post, put, delete)
+        :param headers: Request headers
+        :param data: Request payload
+
+        :return: Response object
+        """
+
+        _headers = {
+            "Forward-AccessURL": f"{external_access_url}/router",
+            "Forward-Sender": self.agent_id,
+            "Forward-To": data_app_agent_id,
+            "Forward-Recipient": data_app_agent_id,
+        }
+
+        if headers is None:
+            headers = _headers
+        else:
+            headers.update(_headers)
+
+        full_endpoint = f"{self.endpoints.OPEN_API}/{api_version}{endpoint}"
+
+        if method in ("get", "delete"):
+            return await self.controller.request(
+                method.upper(), full_endpoint, headers=headers, params=params
+            )
+        elif method in ("post", "put", "patch"):
+            return await self.controller.request(
+                method.upper(), full_endpoint, headers=headers, params=params, data=data
+            )
+
+        return ""
+
+    async def query_metadata_broker(self):
+        """
+        Query the DS Metadata Broker for all registered connectors. With
+        broker_hedging, the query is hedged across the broker mirrors.
+        :return: Metadata Broker HTTP Response (JSON)
+        """
+
+        if not self.metadata_broker_url:
+            raise Exception("No metadata broker url provided on " "AsyncTSGController init.")
+
+        # Request data from DS Metadata Broker:
+        calls = [
+            functools.partial(
+                self.controller.get,
+                endpoint=self.endpoints.METADATA_BROKER_CONNECTORS,
+                base_url=url,
+                # Error responses fail over to the next mirror:
+                expected_status_code=200,
+            )
+            for url in self.metadata_broker_urls
+        ]
+        if self.broker_hedging is None:
+            rsp = await calls[0]()
+        else:
+            rsp = await self.broker_hedging.async_call(calls)
+
+        return json_codec.loads(rsp.content)
+
+    async def get_administrative_users(self):
+
+        # Get the Administrative Users:
+        rsp = await self.controller.get(
+            endpoint=self.endpoints.AUTH_USERS_MANAGER)
+
+        return json_codec.loads(rsp.content)
+
+    async def new_administrative_user(self, id, password, roles):
+
+        hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+
+        headers = {
+            'Content-Type': 'application/json'
+        }
+
+        payload = json_codec.dumps({
+            "id": id,
+            "password": hash.decode('utf-8'),
+            "roles": roles
+        })
+
+        # Register de new Administrative User:
+        rsp = await self.controller.post(
+            endpoint=self.endpoints.AUTH_USERS_MANAGER,
+            data=payload, headers=headers)
+
+        if rsp.status_code == 200:
+            return f"New Administrative User created with ID {id}"
+        elif rsp.status_code == 500:
+            return (f"Error creating Administrative User with ID {id}. One possible cause is that a user with ID {id} "
+                    f"already exists.")
+
+    async def update_administrative_user(self, id, new_password, new_roles=None):
+
+        headers = {
+            'Content-Type': 'application/json'
+        }
+
+        endpoint = f"{self.endpoints.AUTH_USERS_MANAGER}/{id}"
+
+        hash = bcrypt.hashpw(new_password.encode('utf-8'), bcrypt.gensalt())
+        payload = {
+            'id': id,
+            'password': hash.decode('utf-8')
+        }
+
+        if new_roles:
+            payload['roles'] = new_roles
+
+        rsp = await self.controller.put(
+            endpoint=endpoint, data=json_codec.dumps(payload), headers=headers)
+
+        if rsp.status_code == 200:
+            return f"Administrative User with ID {id} updated with success"
+
+    async def delete_administrative_user(self, id):
+
+        endpoint = f"{self.endpoints.AUTH_USERS_MANAGER}/{id}"
+
+        # Delete an Administrative User:
+        rsp = await self.controller.delete(
+            endpoint=endpoint)
+
+        if rsp.status_code == 200:
+            return f"Administrative User with ID {id} deleted with success"
+        elif rsp.status_code == 400:
+            return f"Error: Administrative User with ID {id} not found."
+
+    async def get_catalog(self):
+        """
+        Get catalogs from the connector.
+        """
+
+        rsp = await self.controller.get(
+            endpoint=self.endpoints.RESOURCES, expected_status_code=200
+        )
+        catalogs_artifacts = []
+
+        try:
+            for catalog in json_codec.loads(rsp.content):
+                catalogs_artifacts.append({'@type': catalog['@type'], '@id': catalog['@id']})
+
+        except ValueError as ve:
+            logger.exception(f"Error creating SelfDescription: {ve}")
+
+        return catalogs_artifacts
+
+    async def delete_catalog(self, catalog_id):
+        """
+        Delete catalog from the connector.
+        """
+
+        endpoint = f"{self.endpoints.RESOURCES}/{catalog_id}"
+
+        await self.controller.delete(
+            endpoint=endpoint, expected_status_code=200
+        )
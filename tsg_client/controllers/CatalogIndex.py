@@ -0,0 +1,210 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+
+from loguru import logger
+
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
+
+
+def _parse_date(value):
+    try:
+        return datetime.strptime(value, DATE_FORMAT)
+    except (TypeError, ValueError):
+        return None
+
+
+class _IndexEntry:
+    __slots__ = (
+        "position",
+        "catalog_id",
+        "resource",
+        "resource_type",
+        "created",
+        "contract_start",
+        "contract_end",
+        "is_last",
+    )
+
+    def __init__(self, position, catalog_id, resource, contract_offer_dict, is_last):
+        self.position = position
+        self.catalog_id = catalog_id
+        self.resource = resource
+        self.resource_type = contract_offer_dict.get("@type")
+        self.created = _parse_date(resource.created)
+        self.contract_start = _parse_date(
+            contract_offer_dict.get("ids:contractStart", {}).get("@value")
+        )
+        self.contract_end = _parse_date(
+            contract_offer_dict.get("ids:contractEnd", {}).get("@value")
+        )
+        self.is_last = is_last
+
+    def is_contract_valid(self, today):
+        if self.contract_start is None or self.contract_end is None:
+            return False
+        return self.contract_start <= today <= self.contract_end
+
+
+class CatalogIndex:
+    """
+    In-memory index over the artifacts of a connector self-description.
+
+    The index is built once (contract offers and creation dates are parsed a
+    single time) and can then be queried repeatedly with the same filters as
+    TSGController.parse_catalog_artifacts, without scanning every resource:
+
+        index = CatalogIndex(self_description)
+        artifacts = index.filter(catalog_id=..., creation_date_gt=...)
+
+    """
+
+    def __init__(self, self_description):
+        self._entries = []
+        # Hash indexes (value -> list of entry positions, in catalog order):
+        self._by_catalog = {}
+        self._by_type = {}
+        # Last artifact (entry position) of each catalog:
+        self._last_by_catalog = {}
+
+        for catalog in self_description.catalogs or []:
+            offered_resources = catalog.offeredResource
+            for i, resource in enumerate(offered_resources):
+                if resource.contract_offer is None:
+                    logger.warning(
+                        f"Resource {resource.artifact_id} "
+                        f"has no registered "
+                        f"contract offer and "
+                        f"will be ignored."
+                    )
+                    continue
+                entry = _IndexEntry(
+                    position=len(self._entries),
+                    catalog_id=catalog.id,
+                    resource=resource,
+                    contract_offer_dict=resource.contract_offer.to_dict(),
+                    is_last=(i == len(offered_resources) - 1),
+                )
+                self._entries.append(entry)
+                self._by_catalog.setdefault(catalog.id, []).append(entry.position)
+                self._by_type.setdefault(entry.resource_type, []).append(
+                    entry.position
+                )
+                if entry.is_last:
+                    self._last_by_catalog[catalog.id] = entry.position
+
+        # Entries sorted by creation date, for range (bisect) queries:
+        dated = sorted(
+            (e.created, e.position) for e in self._entries if e.created is not None
+        )
+        self._created_keys = [created for created, _ in dated]
+        self._created_positions = [position for _, position in dated]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def last_artifacts(self):
+        """
+        Last artifact of each catalog (precomputed on index build)
+
+        :return: Dictionary of catalog ID -> artifact
+        """
+        return {
+            catalog_id: self._to_artifact(self._entries[position])
+            for catalog_id, position in self._last_by_catalog.items()
+        }
+
+    def filter(
+        self,
+        catalog_id=None,
+        resource_type: str = None,
+        creation_date_gt: str = None,
+        creation_date_lt: str = None,
+        return_last_artifact: bool = False,
+        valid_contract_only: bool = False,
+    ):
+        """
+        Query the indexed artifacts. Arguments and output are the same as in
+        TSGController.parse_catalog_artifacts.
+
+        :param catalog_id: Catalog ID to filter the artifacts
+        :type catalog_id: str
+        :param resource_type: Resource type to filter the artifacts
+        :type resource_type: str
+        :param creation_date_gt: Filter artifacts created after this date
+        :type creation_date_gt: str
+        :param creation_date_lt: Filter artifacts created before this date
+        :type creation_date_lt: str
+        :param return_last_artifact:  Return only the last artifact
+        :type return_last_artifact: bool
+        :param valid_contract_only: Return only valid contracts
+        :type valid_contract_only: bool
+        :return: Valid artifacts list
+        """
+        date_gt = (
+            datetime.strptime(creation_date_gt, DATE_FORMAT)
+            if creation_date_gt
+            else None
+        )
+        date_lt = (
+            datetime.strptime(creation_date_lt, DATE_FORMAT)
+            if creation_date_lt
+            else None
+        )
+
+        # Start from the most selective index available:
+        candidates = range(len(self._entries))
+        if return_last_artifact:
+            if catalog_id:
+                last = self._last_by_catalog.get(catalog_id)
+                candidates = [] if last is None else [last]
+            else:
+                candidates = list(self._last_by_catalog.values())
+        if catalog_id:
+            by_catalog = self._by_catalog.get(catalog_id, [])
+            if len(by_catalog) < len(candidates):
+                candidates = by_catalog
+        if resource_type:
+            by_type = self._by_type.get(resource_type, [])
+            if len(by_type) < len(candidates):
+                candidates = by_type
+        if date_gt or date_lt:
+            lo = bisect_right(self._created_keys, date_gt) if date_gt else 0
+            hi = (
+                bisect_left(self._created_keys, date_lt)
+                if date_lt
+                else len(self._created_keys)
+            )
+            if max(hi - lo, 0) < len(candidates):
+                # Restore catalog order of the artifacts:
+                candidates = sorted(self._created_positions[lo:hi])
+
+        today = datetime.utcnow()
+        artifacts = []
+        for position in candidates:
+            entry = self._entries[position]
+            if catalog_id and entry.catalog_id != catalog_id:
+                continue
+            if resource_type and entry.resource_type != resource_type:
+                continue
+            if date_gt and (entry.created is None or entry.created <= date_gt):
+                continue
+            if date_lt and (entry.created is None or entry.created >= date_lt):
+                continue
+            if return_last_artifact and not entry.is_last:
+                continue
+            if valid_contract_only and not entry.is_contract_valid(today):
+                continue
+            artifacts.append(self._to_artifact(entry))
+        return artifacts
+
+    @staticmethod
+    def _to_artifact(entry):
+        resource = entry.resource
+        return {
+            "id": resource.artifact_id,
+            "contract_offer": resource.contract_offer,
+            "artifact_created": resource.created,
+            "access_url": resource.access_url,
+            "title": resource.title,
+            "description": resource.description,
+        }
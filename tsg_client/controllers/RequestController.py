@@ -9,22 +9,88 @@ external_open_api_request.py file to match your server.
 
 """
 
+import time
+
 import requests
 
 from loguru import logger
 
+from tsg_client.utils.circuit_breaker import CircuitBreaker
+from tsg_client.utils.compression import ACCEPTED_ENCODINGS, encode_body, gzip_body
+from tsg_client.utils.deadline import (
+    DeadlineExceeded,
+    bound_timeout,
+    check_deadline,
+    remaining,
+)
+from tsg_client.utils.rate_limit import peer_key
+from tsg_client.utils.response import JSONResponse, looks_like_json
+from tsg_client.utils.retry import replayable_body
+from tsg_client.utils.single_flight import SingleFlight, request_key
+from tsg_client.utils.transport import TransportProfile, url_origin
+
+# Methods that do not change the target resource (keep the cached responses)
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
 
 class RequestController:
     # Set to True if you want to verify the SSL certificate or None to ignore
     verify = True
 
-    def __init__(self, base_url, api_key, connector_id, agent_id=None):
+    def __init__(
+        self,
+        base_url,
+        api_key,
+        connector_id,
+        agent_id=None,
+        cache=None,
+        retry_policy=None,
+        transport_profile=None,
+        coalesce=False,
+        rate_limiter=None,
+        circuit_breaker=None,
+        transport=None,
+    ):
         self.base_url = base_url
         self.api_key = api_key
         self.connector_id = connector_id
         self.agent_id = agent_id
         self.headers = {"Authorization": "Bearer " + api_key}
         self.session = requests.Session()  # A session to persist parameters
+        # Optional Transport (e.g., HTTP2Transport), instead of the session:
+        self.transport = transport
+        # Negotiate compressed responses (decoded while streamed):
+        self.session.headers["Accept-Encoding"] = ACCEPTED_ENCODINGS
+        # Origins known not to accept compressed request bodies:
+        self.uncompressed_origins = set()
+        self.cache = cache  # Optional ResponseCache, for cache=True GET requests
+        self.retry_policy = retry_policy  # Optional RetryPolicy
+        # Share the response of concurrent identical GET requests:
+        self.single_flight = SingleFlight() if coalesce else None
+        # Optional RateLimiter, per remote connector:
+        self.rate_limiter = rate_limiter
+        # Optional CircuitBreaker, per remote connector:
+        self.circuit_breaker = circuit_breaker
+        # Transport profiles (pooling, timeouts, TLS) per origin, and the
+        # default one for any other origin:
+        self.profiles = {}
+        self.default_profile = transport_profile or TransportProfile()
+        for prefix in ("https://", "http://"):
+            self.session.mount(prefix, self.default_profile.adapter())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        Close the transport (if any) and the session connections.
+        """
+        if self.transport is not None:
+            self.transport.close()
+        self.session.close()
 
     def request(
         self,
@@ -38,33 +104,83 @@ class RequestController:
         base_url=None,
         **kwargs,
     ):
-        if headers is None:
-            headers = self.headers
-        else:
-            for key, value in self.headers.items():
-                if key not in headers:
-                    headers[key] = value
+        headers = self.merge_headers(headers)
 
         if base_url is None:
             base_url = self.base_url
 
         url = f"{base_url}/{endpoint}"
+
+        # Gzip large request bodies (compress=True), if the server accepts
+        # them (it answers 415 Unsupported Media Type otherwise, RFC 7694)
+        compressed = None
+        if kwargs.pop("compress", False) and url_origin(url) not in self.uncompressed_origins:
+            encoded = encode_body(self.session, method, url, data, files, headers)
+            if encoded is not None:
+                data, content_type = encoded
+                files = None
+                headers = {**headers, "Content-Type": content_type}
+                compressed = gzip_body(data)
+
+        # Only the GET requests that opt in (cache=True) use the response
+        # cache (e.g., self-descriptions, catalogs), never live data:
+        use_cache = kwargs.pop("cache", False)
+        cache_key, cache_entry = None, None
+        if use_cache and self.cache is not None and method == "GET" and not kwargs.get("stream"):
+            cache_key = self.cache.key(url, params, headers)
+            cache_entry = self.cache.get(cache_key)
+            if cache_entry is not None and cache_entry.is_fresh:
+                logger.debug(f"method: {method} | url: {url} | cache: hit")
+                self.check_response(method, cache_entry.response, expected_status_code)
+                return cache_entry.response
+            if cache_entry is not None:
+                # Expired, revalidate it with a conditional request:
+                headers = {**headers, **cache_entry.conditional_headers}
+
         logger.debug(
             f"method: {method} "
             f"| url: {url} "
             f"| params: {kwargs} "
             f"| headers: {headers}"
         )
-        response = self.session.request(
-            method,
-            url,
-            verify=self.verify,
-            params=params,
-            data=data,
-            headers=headers,
-            files=files,
-            **kwargs,
-        )
+        response = None
+        if compressed is not None:
+            response = self.send(
+                method,
+                url,
+                params=params,
+                data=compressed,
+                headers={**headers, "Content-Encoding": "gzip"},
+                **kwargs,
+            )
+            if response.status_code == 415:
+                logger.debug(f"url: {url} | compressed request body not accepted")
+                self.uncompressed_origins.add(url_origin(url))
+                response = None
+        if response is None:
+            response = self.send(
+                method,
+                url,
+                params=params,
+                data=data,
+                headers=headers,
+                files=files,
+                **kwargs,
+            )
+
+        if cache_key is not None:
+            if response.status_code == 304 and cache_entry is not None:
+                logger.debug(f"method: {method} | url: {url} | cache: revalidated")
+                response = self.cache.revalidated(cache_key, cache_entry).response
+            elif response.status_code == 200:
+                self.cache.set(cache_key, response)
+        elif (
+            self.cache is not None
+            and method not in SAFE_METHODS
+            and response.status_code < 400
+        ):
+            # The resource (and its collection) changed
+            self.cache.invalidate(url)
 
         logger.debug(
             f"method: {method} "
@@ -74,25 +190,178 @@ class RequestController:
             f"| status: {response.status_code}"
         )
 
+        self.check_response(method, response, expected_status_code)
+
+        return response
+
+    def mount(self, url, profile):
+        """
+        Use a transport profile (connection pool, timeouts, TLS settings)
+        for the requests sent to the origin of `url`.
+
+        :param url: URL (or origin) of the target server
+        :param profile: TransportProfile
+        """
+        origin = url_origin(url)
+        self.profiles[origin] = profile
+        self.session.mount(f"{origin}/", profile.adapter())
+
+    def profile(self, url):
+        return self.profiles.get(url_origin(url), self.default_profile)
+
+    def send(self, method, url, **kwargs):
+        """
+        Send a request through the session, with the transport profile
+        settings of its origin, retrying failed attempts according to the
+        controller retry policy (if any). With coalesce, concurrent
+        identical (non streamed) GET requests share a single response.
+
+        The timeout (seconds, or a (connect, read) tuple) of each attempt is
+        capped to the remaining time of the current deadline (see
+        tsg_client.utils.deadline), raising DeadlineExceeded once it runs out.
+        """
+        kwargs = self.profile(url).request_kwargs(kwargs, default_verify=self.verify)
+        if self.single_flight is not None and method == "GET" and not kwargs.get("stream"):
+            key = request_key(method, url, kwargs.get("params"), kwargs.get("headers"))
+            return self.single_flight.do(key, self._send, method, url, **kwargs)
+        return self._send(method, url, **kwargs)
+
+    def _send(self, method, url, **kwargs):
+        if self.retry_policy is None:
+            return self._send_once(method, url, **kwargs)
+
+        kwargs, rewind = replayable_body(method, url, kwargs)
+        if rewind is None:
+            # Streamed body, that can not be sent again
+            return self._send_once(method, url, **kwargs)
+
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            rewind()
+            try:
+                response = self._send_once(method, url, **kwargs)
+            except requests.exceptions.RequestException as e:
+                delay = self.retry_policy.next_delay(method, attempt, start, exception=e)
+                if delay is None:
+                    raise
+                reason = repr(e)
+            else:
+                delay = self.retry_policy.next_delay(
+                    method, attempt, start, response=response
+                )
+                if delay is None:
+                    return response
+                reason = f"status {response.status_code}"
+                response.close()
+            attempt += 1
+            logger.warning(
+                f"method: {method} | url: {url} | {reason} "
+                f"| retry {attempt} in {delay:.2f}s"
+            )
+            time.sleep(delay)
+
+    def _send_once(self, method, url, **kwargs):
+        if self.rate_limiter is None and self.circuit_breaker is None:
+            return self._session_request(method, url, **kwargs)
+
+        peer = peer_key(url, kwargs.get("params"), kwargs.get("headers"))
+        # An expired local deadline is not a failure of the peer
+        check_deadline()
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.before(peer)
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(peer)
+        start = time.monotonic()
+        try:
+            response = self._session_request(method, url, **kwargs)
+        except requests.exceptions.RequestException:
+            self._record(peer, time.monotonic() - start)
+            raise
+        except BaseException:
+            # E.g., DeadlineExceeded: the peer did not fail
+            self._record(peer, None)
+            raise
+        self._record(peer, time.monotonic() - start, response.status_code)
+        return response
+
+    def _record(self, peer, latency, status_code=None):
+        # Report a request outcome (status_code None for transport errors)
+        # to the rate limiter / circuit breaker, or only free the rate
+        # limiter slot if latency is None (no outcome, e.g., local deadline
+        # exceeded). Shared with the async controller.
+        if latency is None:
+            if self.rate_limiter is not None:
+                self.rate_limiter.release(peer)
+            return
+        if self.rate_limiter is not None:
+            ok = status_code is not None and self.rate_limiter.is_ok(status_code)
+            self.rate_limiter.release(peer, latency, ok)
+        if self.circuit_breaker is not None:
+            ok = status_code is not None and CircuitBreaker.is_ok(status_code)
+            self.circuit_breaker.record(peer, ok)
+
+    def _session_request(self, method, url, timeout=None, **kwargs):
+        try:
+            response = (self.transport or self.session).request(
+                method, url, timeout=bound_timeout(timeout), **kwargs
+            )
+            # Parse the JSON body once, however many times it is read:
+            return JSONResponse.wrap(response)
+        except requests.exceptions.Timeout as e:
+            left = remaining()
+            if left is not None and left <= 0:
+                raise DeadlineExceeded(f"method: {method} | url: {url}") from e
+            raise
+
+    def get_parsed(self, endpoint, parser, **kwargs):
+        """
+        GET request (cached, with a response cache), parsing the response
+        with `parser`. With a response cache, the parsed object is reused
+        while the response is unchanged.
+        """
+        response = self.get(endpoint, cache=True, **kwargs)
+        if self.cache is None:
+            return parser(response)
+        return self.cache.parse(response, parser)
+
+    def merge_headers(self, headers=None):
+        # Add the controller default headers (e.g., Authorization) to the
+        # request headers, without overriding the ones set by the caller
+        if headers is None:
+            return self.headers
+        for key, value in self.headers.items():
+            if key not in headers:
+                headers[key] = value
+        return headers
+
+    @staticmethod
+    def check_response(method, response, expected_status_code=None):
+        """
+        Validate the response status code (and JSON body) against the
+        expected status code. Shared by the sync and async controllers.
+
+        The body is only parsed if its content type and first bytes do not
+        tell it is JSON.
+        """
         if expected_status_code and (response.status_code != expected_status_code):
             raise Exception(
                 f"Expected status_code {expected_status_code}, "
                 f"but got status_code {response.status_code}. "
                 f"Response content: {response.content}"
             )
-        elif expected_status_code and (response.status_code == expected_status_code):
+        elif expected_status_code and method != 'DELETE':
             # Check if response has JSON content
+            if looks_like_json(response):
+                return
             try:
                 response.json()
-            except requests.exceptions.JSONDecodeError:
-                if method != 'DELETE':
-                    raise Exception(
-                        f"Response does not contain any JSON object. "
-                        f"Response status_code: {response.status_code}. "
-                        f"Response content: {response.content}"
-                    )
-
-        return response
+            except ValueError:
+                raise Exception(
+                    f"Response does not contain any JSON object. "
+                    f"Response status_code: {response.status_code}. "
+                    f"Response content: {response.content}"
+                )
 
     def get(self, endpoint, **kwargs):
         return self.request("GET", endpoint, **kwargs)
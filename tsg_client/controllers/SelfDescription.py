@@ -1,13 +1,94 @@
+import sys
+import json
+
 from typing import List
 from typing import Any
 from dataclasses import dataclass
 from typing import Union
+from collections.abc import Mapping
+
+
+def _intern(value):
+    # Access URLs, paths, catalog IDs, etc. are repeated across thousands of
+    # resources: share a single copy of each string
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class ContractOffer(Mapping):
+    """
+    Read-only view over a resource contract offer (JSON-LD object), as
+    advertised in the self-description. Only the canonical JSON
+    serialization (needed to request a contract agreement) is kept, and
+    parsed on access: a catalog holds thousands of offers, whose nested
+    dicts take several times the memory of their JSON text. To read
+    several fields, parse it once with to_dict().
+    """
+
+    __slots__ = ("_json",)
+
+    def __init__(self, offer: dict):
+        self._json = self._canonical(offer)
+
+    @staticmethod
+    def _canonical(offer: dict) -> str:
+        return json.dumps(offer, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+    def __getitem__(self, key):
+        return self.to_dict()[key]
+
+    def __iter__(self):
+        return iter(self.to_dict())
+
+    def __len__(self):
+        return len(self.to_dict())
+
+    def __eq__(self, other):
+        if isinstance(other, ContractOffer):
+            return self._json == other._json
+        return Mapping.__eq__(self, other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"ContractOffer({self.to_dict()!r})"
+
+    def __str__(self):
+        return self.to_json()
+
+    def to_json(self) -> str:
+        return self._json
+
+    def to_dict(self) -> dict:
+        return json.loads(self._json)
+
+    @staticmethod
+    def dumps(contract_offer: Union["ContractOffer", dict, str]) -> str:
+        """
+        Serialize a contract offer (ContractOffer, dict or JSON string) into
+        its JSON string representation.
+        """
+        if isinstance(contract_offer, ContractOffer):
+            return contract_offer.to_json()
+        if isinstance(contract_offer, dict):
+            return ContractOffer._canonical(contract_offer)
+        return contract_offer
 
 
 @dataclass
 class OfferedResource:
+    __slots__ = (
+        "artifact_id",
+        "contract_offer",
+        "created",
+        "access_url",
+        "path",
+        "documentation",
+        "title",
+        "description",
+    )
+
     artifact_id: str
-    contract_offer: str
+    contract_offer: Union[ContractOffer, None]
     created: Union[str, None]
     access_url: str
     path: str
@@ -30,7 +111,10 @@ class OfferedResource:
             path = None
             documentation = None
 
-        contract_offer = str(obj.get("ids:contractOffer", [""])[0])
+        _contract_offer = obj.get("ids:contractOffer", [None])[0]
+        contract_offer = (
+            ContractOffer(_contract_offer) if _contract_offer is not None else None
+        )
         created = (
             str(obj.get("ids:created").get("@value"))
             if obj.get("ids:created")
@@ -45,7 +129,7 @@ class OfferedResource:
             else None
         )
 
-        if contract_offer != "":
+        if contract_offer is not None:
             artifact_id = obj["ids:representation"][0]["ids:instance"][0]["@id"]
         else:
             artifact_id = obj["@id"]
@@ -54,9 +138,9 @@ class OfferedResource:
             artifact_id,
             contract_offer,
             created,
-            access_url,
-            path,
-            documentation,
+            _intern(access_url),
+            _intern(path),
+            _intern(documentation),
             title,
             description,
         )
@@ -64,7 +148,9 @@ class OfferedResource:
     def to_dict(self) -> dict:
         return {
             "artifact_id": self.artifact_id,
-            "contract_offer": self.contract_offer,
+            "contract_offer": (
+                self.contract_offer.to_dict() if self.contract_offer is not None else None
+            ),
             "created": self.created,
             "access_url": self.access_url,
             "path": self.path,
@@ -76,12 +162,14 @@ class OfferedResource:
 
 @dataclass
 class ResourceCatalog:
+    __slots__ = ("id", "offeredResource")
+
     id: str
     offeredResource: List[OfferedResource]
 
     @staticmethod
     def from_dict(obj: Any) -> "ResourceCatalog":
-        _id = str(obj.get("@id"))
+        _id = _intern(str(obj.get("@id")))
         _offeredResource = [
             OfferedResource.from_dict(y) for y in obj.get("ids:offeredResource", [])
         ]
@@ -96,6 +184,17 @@ class ResourceCatalog:
 
 @dataclass(frozen=True)
 class SelfDescription:
+    __slots__ = (
+        "id",
+        "title",
+        "description",
+        "securityProfile",
+        "curator",
+        "maintainer",
+        "endpoints",
+        "catalogs",
+    )
+
     id: str
     title: str
     description: str
@@ -116,34 +215,46 @@ class SelfDescription:
         """
 
         try:
-            _id = str(obj.get("@id"))
-            _title = str(obj.get("ids:title")[0].get("@value"))
-            _description = str(obj.get("ids:description")[0].get("@value"))
-            _security_profile = str(obj.get("ids:securityProfile").get("@id"))
-            _curator = str(obj.get("ids:curator").get("@id"))
-            _maintainer = str(obj.get("ids:maintainer").get("@id"))
-            _endpoints = str(
-                obj.get("ids:hasDefaultEndpoint").get("ids:accessURL").get("@id")
-            )
             resource_catalogs = obj.get("ids:resourceCatalog", [])
             _catalogs = (
                 [ResourceCatalog.from_dict(y) for y in resource_catalogs]
                 if resource_catalogs
                 else []
             )
-            return SelfDescription(
-                _id,
-                _title,
-                _description,
-                _security_profile,
-                _curator,
-                _maintainer,
-                _endpoints,
-                _catalogs,
-            )
+            return SelfDescription(*SelfDescription._header(obj), _catalogs)
         except (KeyError, AttributeError, IndexError) as e:
             raise ValueError(f"Error creating SelfDescription: {e}")
 
+    @staticmethod
+    def _header(obj: Any) -> tuple:
+        # Self-description fields, except the catalogs
+        _id = str(obj.get("@id"))
+        _title = str(obj.get("ids:title")[0].get("@value"))
+        _description = str(obj.get("ids:description")[0].get("@value"))
+        _security_profile = str(obj.get("ids:securityProfile").get("@id"))
+        _curator = str(obj.get("ids:curator").get("@id"))
+        _maintainer = str(obj.get("ids:maintainer").get("@id"))
+        _endpoints = str(
+            obj.get("ids:hasDefaultEndpoint").get("ids:accessURL").get("@id")
+        )
+        return (
+            _intern(_id),
+            _title,
+            _description,
+            _intern(_security_profile),
+            _intern(_curator),
+            _intern(_maintainer),
+            _intern(_endpoints),
+        )
+
+    def __getstate__(self):
+        # Frozen and slotted: pickled / copied field by field
+        return [getattr(self, name) for name in SelfDescription.__slots__]
+
+    def __setstate__(self, state):
+        for name, value in zip(SelfDescription.__slots__, state):
+            object.__setattr__(self, name, value)
+
     def to_dict(self) -> dict:
         return {
             "id": self.id,
@@ -155,3 +266,98 @@ class SelfDescription:
             "endpoints": self.endpoints,
             "catalogs": [x.to_dict() for x in self.catalogs],
         }
+
+
+class LazyResourceCatalog(ResourceCatalog):
+    """
+    ResourceCatalog that keeps its raw offered resources (JSON-LD objects)
+    and only builds the OfferedResource objects on first access to
+    offeredResource.
+    """
+
+    __slots__ = ("_raw_resources", "_resources")
+
+    def __init__(self, id: str, raw_resources: list):
+        self.id = id
+        self._raw_resources = raw_resources
+        self._resources = None
+
+    @staticmethod
+    def from_dict(obj: Any) -> "LazyResourceCatalog":
+        return LazyResourceCatalog(
+            _intern(str(obj.get("@id"))), obj.get("ids:offeredResource", [])
+        )
+
+    @property
+    def offeredResource(self) -> List[OfferedResource]:
+        if self._resources is None:
+            try:
+                self._resources = [
+                    OfferedResource.from_dict(y) for y in self._raw_resources
+                ]
+            except (KeyError, AttributeError, IndexError) as e:
+                raise ValueError(f"Error creating SelfDescription: {e}")
+            self._raw_resources = None
+        return self._resources
+
+    def __getstate__(self):
+        return self.id, self._raw_resources, self._resources
+
+    def __setstate__(self, state):
+        self.id, self._raw_resources, self._resources = state
+
+
+class LazySelfDescription(SelfDescription):
+    """
+    SelfDescription that only parses the header fields (id, title,
+    securityProfile, endpoints, ...) up front. The raw catalogs are kept
+    and materialized on first access to catalogs (and the resources of
+    each catalog on first access to its offeredResource, see
+    LazyResourceCatalog), then cached.
+    """
+
+    __slots__ = ("_raw_catalogs", "_catalogs")
+
+    def __init__(self, header: tuple, raw_catalogs: list):
+        for name, value in zip(SelfDescription.__slots__, header):
+            object.__setattr__(self, name, value)
+        object.__setattr__(self, "_raw_catalogs", raw_catalogs)
+        object.__setattr__(self, "_catalogs", None)
+
+    @staticmethod
+    def from_dict(obj: Any) -> "LazySelfDescription":
+        """
+        Converts self-description dictionary into a LazySelfDescription
+        object (see SelfDescription.from_dict).
+
+        :param obj: self-description dictionary
+        :return: LazySelfDescription object
+        """
+
+        try:
+            header = SelfDescription._header(obj)
+        except (KeyError, AttributeError, IndexError) as e:
+            raise ValueError(f"Error creating SelfDescription: {e}")
+        return LazySelfDescription(header, obj.get("ids:resourceCatalog") or [])
+
+    @property
+    def catalogs(self) -> List[ResourceCatalog]:
+        if self._catalogs is None:
+            try:
+                catalogs = [
+                    LazyResourceCatalog.from_dict(y) for y in self._raw_catalogs
+                ]
+            except AttributeError as e:
+                raise ValueError(f"Error creating SelfDescription: {e}")
+            object.__setattr__(self, "_catalogs", catalogs)
+            object.__setattr__(self, "_raw_catalogs", None)
+        return self._catalogs
+
+    def __getstate__(self):
+        header = [getattr(self, name) for name in SelfDescription.__slots__[:-1]]
+        return header, self._raw_catalogs, self._catalogs
+
+    def __setstate__(self, state):
+        header, raw_catalogs, catalogs = state
+        LazySelfDescription.__init__(self, header, raw_catalogs)
+        object.__setattr__(self, "_catalogs", catalogs)
@@ -1,16 +1,69 @@
 import os
-import json
-import requests
+import time
+import functools
 import bcrypt
+import requests
 import urllib.parse
 
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
 from loguru import logger
 
 from tsg_client.controllers.RequestController import RequestController
 from tsg_client.controllers.Endpoints import Endpoints
-from tsg_client.controllers.SelfDescription import SelfDescription
-from tsg_client.utils.file_handling import save_pdf_file, save_csv_file, save_json_file
+from tsg_client.controllers.SelfDescription import (
+    ContractOffer,
+    LazySelfDescription,
+    SelfDescription,
+)
+from tsg_client.utils.deadline import deadline, with_deadline
+from tsg_client.utils.refresher import BackgroundRefresher
+from tsg_client.utils.transport import DEFAULT_TIMEOUT, TransportProfile
+from tsg_client.utils.segmented_download import (
+    SegmentedDownload,
+    parse_content_range,
+)
+from tsg_client.utils import json_codec
+from tsg_client.utils.file_handling import (
+    save_pdf_file,
+    save_csv_file,
+    save_json_file,
+    save_stream_file,
+)
+
+# Default chunk size (bytes) for streamed artifact downloads
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# Default transport profiles. The core container serves the concurrent
+# crawls / downloads, so it keeps a larger connection pool:
+DEFAULT_TRANSPORT_PROFILES = {
+    "core": TransportProfile(pool_maxsize=32, timeout=DEFAULT_TIMEOUT),
+    "broker": TransportProfile(timeout=DEFAULT_TIMEOUT),
+    "default": TransportProfile(timeout=DEFAULT_TIMEOUT),
+}
+
+
+def _pooled_session(profile):
+    session = requests.Session()
+    for prefix in ("https://", "http://"):
+        session.mount(prefix, profile.adapter())
+    return session
+
+
+# Pooled session (default transport profile) for the requests sent without
+# a RequestController, e.g., static get_openapi_specs calls:
+_DEFAULT_SESSION = _pooled_session(DEFAULT_TRANSPORT_PROFILES["default"])
+
+
+def _default_send(method, url, **kwargs):
+    kwargs = DEFAULT_TRANSPORT_PROFILES["default"].request_kwargs(kwargs)
+    return _DEFAULT_SESSION.request(method, url, **kwargs)
+
+ARTIFACT_FILE_EXTENSIONS = {
+    "application/json": "json",
+    "application/pdf": "pdf",
+    "text/csv": "csv",
+}
 
 
 def is_contract_valid(contract_offer_dict):
@@ -32,16 +85,142 @@ def is_contract_valid(contract_offer_dict):
     return start_date <= today <= end_date
 
 
+def save_artifact_response(rsp, artifact_id, keep_original_format, file_path):
+    """
+    Save a data artifact HTTP response to disk, according to its content type.
+
+    :param rsp: Artifact HTTP response (requests or httpx response)
+    :param artifact_id: Artifact ID
+    :param keep_original_format: Keep original format of the artifact
+    :param file_path: Path to save the artifact file
+    :return: Dictionary with the operation result message
+    """
+    # Remove spaces & special characters from artifact_id
+    artifact_id = artifact_id.strip().replace(":", "_")
+
+    if not keep_original_format:
+        txt_filename = f"{artifact_id}.txt"
+        txt_path = os.path.join(os.getcwd(), txt_filename)
+        with open(txt_path, "w", encoding="utf-8") as txt_file:
+            txt_file.write(rsp.text)
+        return {"message": f"Text file saved to {txt_path}"}
+
+    content_type = rsp.headers.get("content-type")
+    if content_type == "application/json":
+        return save_json_file(artifact_id, rsp.text, file_path)
+    elif content_type == "application/pdf":
+        return save_pdf_file(artifact_id, rsp.content, file_path)
+    elif content_type == "text/csv":
+        return save_csv_file(artifact_id, rsp.text, file_path)
+    else:
+        return {"message": "Unsupported format"}
+
+
+def _parse_selfdescription(rsp):
+    return SelfDescription.from_dict(rsp.json())
+
+
+def _parse_lazy_selfdescription(rsp):
+    return LazySelfDescription.from_dict(rsp.json())
+
+
+def broker_urls(metadata_broker_url):
+    """
+    List of metadata broker URLs (primary first), from a single URL or a
+    list of mirror URLs.
+    """
+    if not metadata_broker_url:
+        return []
+    if isinstance(metadata_broker_url, str):
+        return [metadata_broker_url]
+    return list(metadata_broker_url)
+
+
+def artifact_file_target(content_type, keep_original_format, file_path):
+    """
+    File extension and directory where a data artifact is saved, according
+    to its content type (None if the format is not supported).
+    """
+    if not keep_original_format:
+        return "txt", os.getcwd()
+    extension = ARTIFACT_FILE_EXTENSIONS.get(content_type)
+    if extension is None:
+        return None, None
+    return extension, file_path
+
+
+def save_artifact_stream(
+    rsp, artifact_id, keep_original_format, file_path, chunk_size=DEFAULT_CHUNK_SIZE
+):
+    """
+    Save a streamed data artifact HTTP response to disk, in fixed-size
+    chunks, as it arrives (the content is never fully loaded in memory).
+
+    :param rsp: Artifact HTTP response (requests response, with stream=True)
+    :param artifact_id: Artifact ID
+    :param keep_original_format: Keep original format of the artifact
+    :param file_path: Path to save the artifact file
+    :param chunk_size: Size (bytes) of the chunks written to disk
+    :return: Dictionary with the operation result message, bytes written
+     and throughput
+    """
+    # Remove spaces & special characters from artifact_id
+    artifact_id = artifact_id.strip().replace(":", "_")
+
+    extension, path = artifact_file_target(
+        rsp.headers.get("content-type"), keep_original_format, file_path
+    )
+    if extension is None:
+        return {"message": "Unsupported format"}
+
+    return save_stream_file(
+        artifact_id, rsp.iter_content(chunk_size=chunk_size), extension, path
+    )
+
+
 class TSGController:
     def __init__(
-        self, api_key, connector_id, access_url, agent_id=None, metadata_broker_url=None
+        self,
+        api_key,
+        connector_id,
+        access_url,
+        agent_id=None,
+        metadata_broker_url=None,
+        agreement_store=None,
+        cache=None,
+        retry_policy=None,
+        coalesce=False,
+        rate_limiter=None,
+        circuit_breaker=None,
+        transport_profiles=None,
+        broker_hedging=None,
+        compress_uploads=False,
+        transport=None,
+        lazy_selfdescriptions=False,
     ):
         self.catalogs = None
         self.api_key = api_key
         self.connector_id = connector_id
         self.access_url = access_url
         self.agent_id = agent_id
-        self.metadata_broker_url = metadata_broker_url
+        # Metadata broker URL, or list of mirror URLs (primary first):
+        self.metadata_broker_urls = broker_urls(metadata_broker_url)
+        self.metadata_broker_url = next(iter(self.metadata_broker_urls), None)
+        # Optional HedgedRequests, to query the broker mirrors:
+        self.broker_hedging = broker_hedging
+        # Gzip large artifact uploads (if the connector accepts them):
+        self.compress_uploads = compress_uploads
+        # Parse the catalogs of the self-descriptions on first access only:
+        self._parse_selfdescription = (
+            _parse_lazy_selfdescription if lazy_selfdescriptions else _parse_selfdescription
+        )
+        self.agreement_store = agreement_store
+        self.refresher = None
+
+        # Pooled transports for the core container ("core"), the metadata
+        # broker ("broker") and any other host, e.g., the external data-app
+        # documentation hosts ("default"):
+        transport_profiles = {**DEFAULT_TRANSPORT_PROFILES, **(transport_profiles or {})}
 
         # Start core container (connector) http requests controller:
         self.endpoints = Endpoints()
@@ -50,7 +229,17 @@ class TSGController:
             connector_id=self.connector_id,
             agent_id=self.agent_id,
             api_key=self.api_key,
+            cache=cache,
+            retry_policy=retry_policy,
+            coalesce=coalesce,
+            rate_limiter=rate_limiter,
+            circuit_breaker=circuit_breaker,
+            transport=transport,
+            transport_profile=transport_profiles["default"],
         )
+        self.controller.mount(self.access_url, transport_profiles["core"])
+        for url in self.metadata_broker_urls:
+            self.controller.mount(url, transport_profiles["broker"])
 
         self.__validate_connection()
 
@@ -61,6 +250,20 @@ class TSGController:
             f"agent_id={self.agent_id})"
         )
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        Stop the background refresh (if enabled) and close the connections
+        (e.g., the HTTP2Transport clients).
+        """
+        self.disable_background_refresh()
+        self.controller.close()
+
     def __validate_connection(self):
         # Check if the inter-connector API is available and reachable with
         # this API_KEY and ACCESS_URL.
@@ -74,7 +277,8 @@ class TSGController:
     def get_connector_selfdescription(self,
                                       access_url,
                                       agent_id="",
-                                      connector_id=""):
+                                      connector_id="",
+                                      timeout=None):
         """
         Get self-descriptions from a connector from another dataspace
         participant, given its connector CONNECTOR_ID and ACCESS_URL.
@@ -85,6 +289,8 @@ class TSGController:
         :type connector_id: str
         :param agent_id: (optional)  Agent ID
         :type agent_id: str
+        :param timeout: (optional) Request timeout, in seconds
+        :type timeout: float
         :return: SelfDescription object
         """
 
@@ -95,17 +301,225 @@ class TSGController:
             "accessUrl": _access_url,
             "agentId": agent_id,
         }
-        rsp = self.controller.get(
-            endpoint=self.endpoints.DESCRIPTION, params=params, expected_status_code=200
-        )
         try:
-            selfdescription = SelfDescription.from_dict(rsp.json())
+            if self.refresher is not None:
+                selfdescription = self.refresher.get(
+                    (access_url, agent_id, connector_id), params, timeout
+                )
+            else:
+                selfdescription = self._fetch_selfdescription(params, timeout)
         except ValueError as ve:
             selfdescription = "error"
             logger.exception(f"Error creating SelfDescription: {ve}")
 
         return selfdescription
 
+    def _fetch_selfdescription(self, params, timeout=None):
+        return self.controller.get_parsed(
+            endpoint=self.endpoints.DESCRIPTION,
+            parser=self._parse_selfdescription,
+            params=params,
+            expected_status_code=200,
+            timeout=timeout,
+        )
+
+    def iter_connector_catalogs(self,
+                                access_url,
+                                agent_id="",
+                                connector_id="",
+                                timeout=None):
+        """
+        Stream the self-description of a connector from another dataspace
+        participant (see get_connector_selfdescription), yielding its
+        resource catalogs as they are parsed: the full JSON-LD document is
+        never loaded in memory. Requires the ijson package.
+
+        :param access_url: Access URL
+        :type access_url: str
+        :param connector_id: (optional) Connector ID
+        :type connector_id: str
+        :param agent_id: (optional)  Agent ID
+        :type agent_id: str
+        :param timeout: (optional) Request timeout, in seconds
+        :type timeout: float
+        :return: Generator of ResourceCatalog objects
+        """
+        # Imported here: selfdescription_stream imports the SelfDescription
+        # models from this package (circular import at module level)
+        from tsg_client.utils.selfdescription_stream import iter_catalogs
+
+        params = {
+            "connectorId": connector_id,
+            "accessUrl": f"{access_url}/selfdescription",
+            "agentId": agent_id,
+        }
+        rsp = self.controller.get(
+            endpoint=self.endpoints.DESCRIPTION,
+            params=params,
+            timeout=timeout,
+            stream=True,
+        )
+        with rsp:
+            if rsp.status_code != 200:
+                raise Exception(
+                    f"Expected status_code 200, "
+                    f"but got status_code {rsp.status_code}. "
+                    f"Response content: {rsp.content}"
+                )
+            yield from iter_catalogs(rsp.iter_content(chunk_size=64 * 1024))
+
+    def enable_background_refresh(self, ttl=300, refresh_ahead=30, max_workers=4, **kwargs):
+        """
+        Serve external connectors self-descriptions (see
+        get_connector_selfdescription) from memory, refreshing them in
+        background: the most read ones are re-fetched shortly before they
+        expire and the others on their first read after expiry, so readers
+        always get the last good self-description immediately.
+
+        :param ttl: Time to live of the self-descriptions, in seconds
+        :type ttl: float
+        :param refresh_ahead: Re-fetch the most read self-descriptions this
+         many seconds before expiry
+        :type refresh_ahead: float
+        :param max_workers: Number of background refresh threads
+        :type max_workers: int
+        :param kwargs: Other BackgroundRefresher options
+        """
+        self.disable_background_refresh()
+        self.refresher = BackgroundRefresher(
+            self._fetch_selfdescription,
+            ttl=ttl,
+            refresh_ahead=refresh_ahead,
+            max_workers=max_workers,
+            **kwargs,
+        )
+
+    def disable_background_refresh(self):
+        if self.refresher is not None:
+            self.refresher.stop()
+            self.refresher = None
+
+    def crawl_selfdescriptions(self, connectors=None, max_workers=16, timeout=30):
+        """
+        Fetch and parse the self-descriptions of several dataspace connectors
+        concurrently. Self-descriptions are yielded as soon as they arrive,
+        so a slow connector does not hold up the others. Connectors that
+        fail (or time out) are logged and skipped.
+
+        :param connectors: Metadata broker result, list of connectors
+         (see parse_broker_connectors) or list of access URLs. If None,
+         the metadata broker is queried.
+        :type connectors: list
+        :param max_workers: Maximum number of concurrent requests
+        :type max_workers: int
+        :param timeout: Total timeout (per connector), in seconds
+        :type timeout: float
+        :return: Generator of (connector, SelfDescription) tuples
+        """
+        if connectors is None:
+            connectors = self.query_metadata_broker()
+        connectors = self.parse_broker_connectors(connectors)
+
+        # Start time of each connector fetch (they may wait for a worker)
+        started = {}
+
+        def fetch(index, connector):
+            started[index] = time.monotonic()
+            # Bound all the connector requests, not each socket read
+            with deadline(timeout):
+                return self.get_connector_selfdescription(
+                    access_url=connector["access_url"],
+                    agent_id=connector["agent_id"],
+                    connector_id=connector["connector_id"],
+                    timeout=timeout,
+                )
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            futures = {
+                executor.submit(with_deadline(fetch), index, connector): (index, connector)
+                for index, connector in enumerate(connectors)
+            }
+            pending = set(futures)
+            while pending:
+                expiries = [
+                    started[futures[future][0]] + timeout
+                    for future in pending
+                    if futures[future][0] in started
+                ]
+                wait_time = max(0, min(expiries) - time.monotonic()) if expiries else timeout
+                done, pending = wait(pending, timeout=wait_time, return_when=FIRST_COMPLETED)
+                for future in done:
+                    _, connector = futures[future]
+                    try:
+                        self_description = future.result()
+                    except Exception as e:
+                        logger.warning(
+                            f"Error retrieving self-description from "
+                            f"{connector['access_url']}: {repr(e)}"
+                        )
+                        continue
+                    if isinstance(self_description, SelfDescription):
+                        yield connector, self_description
+                # Give up on the connectors running for longer than timeout
+                # (their requests fail once the deadline runs out)
+                now = time.monotonic()
+                for future in list(pending):
+                    index, connector = futures[future]
+                    if index in started and now >= started[index] + timeout:
+                        pending.discard(future)
+                        logger.warning(
+                            f"Error retrieving self-description from "
+                            f"{connector['access_url']}: timed out after {timeout}s"
+                        )
+        finally:
+            # Stop pending requests if the generator is closed early
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def parse_broker_connectors(broker_connectors):
+        """
+        Extract the connector ID, access URL and agent ID of each connector
+        registered in the metadata broker (see query_metadata_broker).
+
+        :param broker_connectors: Metadata broker result, list of
+         connectors or list of access URLs
+        :type broker_connectors: list
+        :return: List of connectors (dict w/ connector_id, access_url and
+         agent_id keys)
+        """
+        connectors = []
+        for connector in broker_connectors:
+            if isinstance(connector, str):
+                connectors.append(
+                    {"connector_id": "", "access_url": connector, "agent_id": ""}
+                )
+            elif "access_url" in connector:
+                connectors.append(
+                    {
+                        "connector_id": connector.get("connector_id", ""),
+                        "access_url": connector["access_url"],
+                        "agent_id": connector.get("agent_id", ""),
+                    }
+                )
+            else:
+                try:
+                    access_url = connector["ids:hasEndpoint"][0]["ids:accessURL"]["@id"]
+                except (KeyError, IndexError, TypeError):
+                    logger.warning(
+                        f"Connector {connector.get('@id')} has no registered "
+                        f"access URL and will be ignored."
+                    )
+                    continue
+                connectors.append(
+                    {
+                        "connector_id": connector.get("@id", ""),
+                        "access_url": access_url.split("/router")[0],
+                        "agent_id": connector.get("ids:maintainer", {}).get("@id", ""),
+                    }
+                )
+        return connectors
+
     @staticmethod
     def parse_resource_catalogs(self_description):
         return self_description.catalogs
@@ -119,6 +533,7 @@ class TSGController:
         creation_date_lt: str = None,
         return_last_artifact: bool = False,
         valid_contract_only: bool = False,
+        limit: int = None,
     ):
         """
         Parse the artifacts from a connector's self-description catalog.
@@ -137,56 +552,96 @@ class TSGController:
         :type return_last_artifact: bool
         :param valid_contract_only: Return only valid contracts
         :type valid_contract_only: bool
+        :param limit: (optional) Maximum number of artifacts returned
+        :type limit: int
         :return: Valid artifacts list
         """
-        artifacts = []
+        return list(
+            TSGController.iter_catalog_artifacts(
+                self_description,
+                catalog_id=catalog_id,
+                resource_type=resource_type,
+                creation_date_gt=creation_date_gt,
+                creation_date_lt=creation_date_lt,
+                return_last_artifact=return_last_artifact,
+                valid_contract_only=valid_contract_only,
+                limit=limit,
+            )
+        )
 
-        if self_description.catalogs:
-            for catalog in self_description.catalogs:
-                if catalog_id and catalog.id != catalog_id:
-                    continue
-                for resource in catalog.offeredResource:
-                    if resource.contract_offer == "":
-                        logger.warning(
-                            f"Resource {resource.artifact_id} "
-                            f"has no registered "
-                            f"contract offer and "
-                            f"will be ignored."
-                        )
-                        continue
-                    contract_offer_str = resource.contract_offer
-                    contract_offer_str_fixed = contract_offer_str.replace("'", '"')
-                    contract_offer_dict = json.loads(contract_offer_str_fixed)
-                    if resource_type and contract_offer_dict["@type"] != resource_type:
-                        continue
-                    creation_date = datetime.strptime(
-                        resource.created, "%Y-%m-%dT%H:%M:%S.%fZ"
-                    )
-                    if creation_date_gt and creation_date <= datetime.strptime(
-                        creation_date_gt, "%Y-%m-%dT%H:%M:%S.%fZ"
-                    ):
-                        continue
-                    if creation_date_lt and creation_date >= datetime.strptime(
-                        creation_date_lt, "%Y-%m-%dT%H:%M:%S.%fZ"
-                    ):
-                        continue
-                    if return_last_artifact and resource != catalog.offeredResource[-1]:
-                        continue
-                    if valid_contract_only and not is_contract_valid(
-                        contract_offer_dict
-                    ):
-                        continue
-                    artifacts.append(
-                        {
-                            "id": resource.artifact_id,
-                            "contract_offer": resource.contract_offer,
-                            "artifact_created": resource.created,
-                            "access_url": resource.access_url,
-                            "title": resource.title,
-                            "description": resource.description,
-                        }
+    @staticmethod
+    def iter_catalog_artifacts(
+        self_description,
+        catalog_id=None,
+        resource_type: str = None,
+        creation_date_gt: str = None,
+        creation_date_lt: str = None,
+        return_last_artifact: bool = False,
+        valid_contract_only: bool = False,
+        limit: int = None,
+    ):
+        """
+        Same as parse_catalog_artifacts, yielding the artifacts as they are
+        found: the scan stops as soon as `limit` artifacts are yielded (or
+        the generator is closed), and only the last resource of each
+        catalog is visited with return_last_artifact.
+
+        :return: Generator of valid artifacts
+        """
+        if limit is not None and limit <= 0:
+            return
+        date_gt = (
+            datetime.strptime(creation_date_gt, "%Y-%m-%dT%H:%M:%S.%fZ")
+            if creation_date_gt
+            else None
+        )
+        date_lt = (
+            datetime.strptime(creation_date_lt, "%Y-%m-%dT%H:%M:%S.%fZ")
+            if creation_date_lt
+            else None
+        )
+        found = 0
+
+        for catalog in self_description.catalogs or []:
+            if catalog_id and catalog.id != catalog_id:
+                continue
+            resources = catalog.offeredResource
+            if return_last_artifact:
+                resources = resources[-1:]
+            for resource in resources:
+                if resource.contract_offer is None:
+                    logger.warning(
+                        f"Resource {resource.artifact_id} "
+                        f"has no registered "
+                        f"contract offer and "
+                        f"will be ignored."
                     )
-        return artifacts
+                    continue
+                contract_offer_dict = resource.contract_offer.to_dict()
+                if resource_type and contract_offer_dict["@type"] != resource_type:
+                    continue
+                creation_date = datetime.strptime(
+                    resource.created, "%Y-%m-%dT%H:%M:%S.%fZ"
+                )
+                if date_gt and creation_date <= date_gt:
+                    continue
+                if date_lt and creation_date >= date_lt:
+                    continue
+                if valid_contract_only and not is_contract_valid(
+                    contract_offer_dict
+                ):
+                    continue
+                yield {
+                    "id": resource.artifact_id,
+                    "contract_offer": resource.contract_offer,
+                    "artifact_created": resource.created,
+                    "access_url": resource.access_url,
+                    "title": resource.title,
+                    "description": resource.description,
+                }
+                found += 1
+                if found == limit:
+                    return
 
     def request_agreement(
         self, connector_id, artifact_access_url, artifact_contract_offer
@@ -199,21 +654,39 @@ class TSGController:
         :param artifact_access_url: Artifact access URL
         :type artifact_access_url: str
         :param artifact_contract_offer: Artifact contract offer
-        :type artifact_contract_offer: str
+        :type artifact_contract_offer: ContractOffer, dict or str
         :return: Contract Agreement ID
+
+        If the controller has an agreement_store, a non expired agreement
+        previously obtained for the same offer is returned without a new
+        contract request.
         """
+        if self.agreement_store is not None:
+            # Reuse a (non expired) agreement previously obtained for this offer
+            agreement_id = self.agreement_store.get(
+                connector_id, artifact_access_url, artifact_contract_offer
+            )
+            if agreement_id is not None:
+                return agreement_id
+
         payload = {
             "connectorId": connector_id,
             "agentId": "",
-            "contractOffer": artifact_contract_offer,
+            "contractOffer": ContractOffer.dumps(artifact_contract_offer),
             "accessUrl": artifact_access_url,
         }
 
         rsp = self.controller.post(
             endpoint=self.endpoints.CONTRACT_REQUEST, data=payload, files={"a": "a"}
         )
+        agreement = rsp.json()
+
+        if self.agreement_store is not None:
+            self.agreement_store.put(
+                connector_id, artifact_access_url, artifact_contract_offer, agreement
+            )
 
-        return rsp.json()["@id"]
+        return agreement["@id"]
 
     def request_data_artifact(
         self,
@@ -224,6 +697,9 @@ class TSGController:
         contract_agreement_id,
         keep_original_format,
         file_path,
+        stream=False,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        segments=1,
     ):
         """
         Request a data artifact from another connector, given the artifact
@@ -243,6 +719,16 @@ class TSGController:
         :type keep_original_format: bool
         :param file_path: Path to save the artifact file
         :type file_path: str
+        :param stream: Write the artifact to disk in chunks, as it arrives,
+         instead of loading it in memory (recommended for large artifacts)
+        :type stream: bool
+        :param chunk_size: Size (bytes) of the streamed chunks
+        :type chunk_size: int
+        :param segments: Number of byte ranges downloaded in parallel. If
+         higher than 1, the artifact is downloaded in segments (and
+         resumed, if interrupted), falling back to a single stream when the
+         server does not support range requests
+        :type segments: int
         """
 
         params = {
@@ -252,29 +738,138 @@ class TSGController:
             "accessUrl": artifact_access_url,
             "transferContract": contract_agreement_id,
         }
+
+        if segments > 1:
+            return self._request_data_artifact_segmented(
+                params, artifact_id, keep_original_format, file_path, segments, chunk_size
+            )
+
         rsp = self.controller.get(
-            endpoint=self.endpoints.ARTIFACTS_CONSUMER, params=params
+            endpoint=self.endpoints.ARTIFACTS_CONSUMER, params=params, stream=stream
+        )
+
+        if stream:
+            with rsp:
+                return save_artifact_stream(
+                    rsp, artifact_id, keep_original_format, file_path, chunk_size
+                )
+
+        return save_artifact_response(
+            rsp, artifact_id, keep_original_format, file_path
+        )
+
+    def _request_data_artifact_segmented(
+        self, params, artifact_id, keep_original_format, file_path, segments, chunk_size
+    ):
+        def fetch_range(start, end):
+            return self.controller.get(
+                endpoint=self.endpoints.ARTIFACTS_CONSUMER,
+                params=params,
+                # Ranges of the identity (not compressed) content:
+                headers={"Range": f"bytes={start}-{end}", "Accept-Encoding": "identity"},
+                stream=True,
+            )
+
+        # Probe range requests support (and the artifact size) with the
+        # first byte of the artifact:
+        rsp = fetch_range(0, 0)
+        size = parse_content_range(rsp.headers.get("content-range"))
+        if rsp.status_code != 206 or not size:
+            # Server ignored the Range header, so this is the full artifact
+            logger.debug(
+                f"Range requests not supported for artifact {artifact_id}. "
+                f"Falling back to a single stream."
+            )
+            with rsp:
+                return save_artifact_stream(
+                    rsp, artifact_id, keep_original_format, file_path, chunk_size
+                )
+        rsp.close()
+
+        extension, path = artifact_file_target(
+            rsp.headers.get("content-type"), keep_original_format, file_path
         )
+        if extension is None:
+            return {"message": "Unsupported format"}
 
         # Remove spaces & special characters from artifact_id
         artifact_id = artifact_id.strip().replace(":", "_")
+        download = SegmentedDownload(
+            file_path=os.path.join(path, f"{artifact_id}.{extension}"),
+            size=size,
+            validator=rsp.headers.get("etag") or rsp.headers.get("last-modified"),
+            segments=segments,
+            chunk_size=chunk_size,
+        )
+        return download.run(fetch_range)
 
-        if not keep_original_format:
-            txt_filename = f"{artifact_id}.txt"
-            txt_path = os.path.join(os.getcwd(), txt_filename)
-            with open(txt_path, "w", encoding="utf-8") as txt_file:
-                txt_file.write(rsp.text)
-            return {"message": f"Text file saved to {txt_path}"}
-
-        content_type = rsp.headers.get("content-type")
-        if content_type == "application/json":
-            return save_json_file(artifact_id, rsp.text, file_path)
-        elif content_type == "application/pdf":
-            return save_pdf_file(artifact_id, rsp.content, file_path)
-        elif content_type == "text/csv":
-            return save_csv_file(artifact_id, rsp.text, file_path)
-        else:
-            return {"message": "Unsupported format"}
+    def download_artifacts(
+        self,
+        artifacts,
+        connector_id,
+        agent_id,
+        file_path,
+        keep_original_format=True,
+        max_workers=8,
+        stream=True,
+    ):
+        """
+        Request contract agreements and download several data artifacts
+        (e.g., from parse_catalog_artifacts) from another connector,
+        concurrently. A failure on one artifact is recorded in its manifest
+        entry and does not abort the others.
+
+        :param artifacts: Artifacts list (see parse_catalog_artifacts)
+        :type artifacts: list
+        :param connector_id: Connector ID (artifacts provider)
+        :type connector_id: str
+        :param agent_id: Agent ID (artifacts provider)
+        :type agent_id: str
+        :param file_path: Path to save the artifact files
+        :type file_path: str
+        :param keep_original_format: Keep original format of the artifacts
+        :type keep_original_format: bool
+        :param max_workers: Maximum number of concurrent downloads
+        :type max_workers: int
+        :param stream: Stream the artifacts to disk (see request_data_artifact)
+        :type stream: bool
+        :return: Result manifest (one entry per artifact, in the same order)
+        """
+
+        def download(artifact):
+            start = time.perf_counter()
+            entry = {
+                "id": artifact["id"],
+                "status": "success",
+                "contract_agreement_id": None,
+                "result": None,
+                "error": None,
+            }
+            try:
+                entry["contract_agreement_id"] = self.request_agreement(
+                    connector_id=connector_id,
+                    artifact_access_url=artifact["access_url"],
+                    artifact_contract_offer=artifact["contract_offer"],
+                )
+                entry["result"] = self.request_data_artifact(
+                    artifact_id=artifact["id"],
+                    artifact_access_url=artifact["access_url"],
+                    connector_id=connector_id,
+                    agent_id=agent_id,
+                    contract_agreement_id=entry["contract_agreement_id"],
+                    keep_original_format=keep_original_format,
+                    file_path=file_path,
+                    stream=stream,
+                )
+            except Exception as e:
+                logger.warning(f"Error downloading artifact {artifact['id']}: {repr(e)}")
+                entry["status"] = "error"
+                entry["error"] = repr(e)
+            entry["elapsed_seconds"] = time.perf_counter() - start
+            return entry
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(with_deadline(download), artifacts))
 
     def publish_data_artifact(self, artifact_file, title, description, contract_offer, catalog_id=None):
         """
@@ -293,7 +888,7 @@ class TSGController:
         """
 
         ids_permission = [
-            permission["@id"] for permission in json.loads(contract_offer).get('ids:permission', [])
+            permission["@id"] for permission in json_codec.loads(contract_offer).get('ids:permission', [])
         ]
 
         if ids_permission:
@@ -327,7 +922,7 @@ class TSGController:
         endpoint = self.endpoints.ARTIFACTS_PROVIDER
 
         rsp = self.controller.post(
-            endpoint=endpoint, data=payload, files=files
+            endpoint=endpoint, data=payload, files=files, compress=self.compress_uploads
         )
         rsp_json = rsp.json()
 
@@ -339,7 +934,7 @@ class TSGController:
             }
 
             self.controller.post(
-                endpoint=endpoint, data=rsp_json, headers=headers
+                endpoint=endpoint, data=json_codec.dumps(rsp_json), headers=headers
             )
 
         return rsp_json
@@ -380,7 +975,9 @@ class TSGController:
         encoded_string = urllib.parse.quote(artifact_id, safe="")
         endpoint = self.endpoints.ARTIFACTS_PROVIDER + "/" + encoded_string
 
-        rsp = self.controller.put(endpoint=endpoint, data=payload, files=payload)
+        rsp = self.controller.put(
+            endpoint=endpoint, data=payload, files=payload, compress=self.compress_uploads
+        )
         return rsp.json()
 
     def get_connector_self_selfdescription(self):
@@ -390,11 +987,12 @@ class TSGController:
         :return: SelfDescription object
         """
 
-        rsp = self.controller.get(
-            endpoint=self.endpoints.SELF_DESCRIPTION, expected_status_code=200
-        )
         try:
-            self_description = SelfDescription.from_dict(rsp.json())
+            self_description = self.controller.get_parsed(
+                endpoint=self.endpoints.SELF_DESCRIPTION,
+                parser=self._parse_selfdescription,
+                expected_status_code=200,
+            )
         except ValueError as ve:
             self_description = "error"
             logger.exception(f"Error creating SelfDescription: {ve}")
@@ -402,18 +1000,23 @@ class TSGController:
         return self_description
 
     @staticmethod
-    def get_openapi_specs(external_self_description, api_version):
+    def get_openapi_specs(external_self_description, api_version, controller=None):
         """
         Get OpenAPI specs from an external connector self-description
 
         :param external_self_description: External connector self-description
         :param api_version: Data APP API version
+        :param controller: RequestController used to fetch the OpenAPI
+         documents (e.g., `TSGController.controller`, to reuse its session
+         and transport settings). If None, a module-level session pooled
+         with the default transport profile (and DEFAULT_TIMEOUT) is used.
 
         :return: OpenAPI specs
         """
 
         connector_id = external_self_description.id
         resource_catalog = external_self_description.catalogs
+        send = controller.send if controller is not None else _default_send
 
         endpoint_documentation_urls = []
         for resource in resource_catalog:
@@ -429,7 +1032,7 @@ class TSGController:
 
                         try:
                             _endpoints = list(
-                                requests.get(_openapi_url).json()["paths"].keys()
+                                send("GET", _openapi_url).json()["paths"].keys()
                             )
                         except Exception:
                             _endpoints = None
@@ -514,7 +1117,8 @@ class TSGController:
 
     def query_metadata_broker(self):
         """
-        Query the DS Metadata Broker for all registered connectors
+        Query the DS Metadata Broker for all registered connectors. With
+        broker_hedging, the query is hedged across the broker mirrors.
         :return: Metadata Broker HTTP Response (JSON)
         """
 
@@ -522,10 +1126,20 @@ class TSGController:
             raise Exception("No metadata broker url provided on " "TSGController init.")
 
         # Request data from DS Metadata Broker:
-        rsp = self.controller.get(
-            endpoint=self.endpoints.METADATA_BROKER_CONNECTORS,
-            base_url=self.metadata_broker_url,
-        )
+        calls = [
+            functools.partial(
+                self.controller.get,
+                endpoint=self.endpoints.METADATA_BROKER_CONNECTORS,
+                base_url=url,
+                # Error responses fail over to the next mirror:
+                expected_status_code=200,
+            )
+            for url in self.metadata_broker_urls
+        ]
+        if self.broker_hedging is None:
+            rsp = calls[0]()
+        else:
+            rsp = self.broker_hedging.call(calls)
 
         return rsp.json()
 
@@ -546,7 +1160,7 @@ class TSGController:
             'Content-Type': 'application/json'
         }
 
-        payload = json.dumps({
+        payload = json_codec.dumps({
             "id": id,
             "password": hash.decode('utf-8'),
             "roles": roles
@@ -583,7 +1197,7 @@ class TSGController:
 
         # Delete an Administrative User:
         rsp = self.controller.put(
-            endpoint=endpoint, data=json.dumps(payload), headers=headers)
+            endpoint=endpoint, data=json_codec.dumps(payload), headers=headers)
 
         if rsp.status_code == 200:
             return f"Administrative User with ID {id} updated with success"
@@ -607,7 +1221,7 @@ class TSGController:
         """
 
         rsp = self.controller.get(
-            endpoint=self.endpoints.RESOURCES, expected_status_code=200
+            endpoint=self.endpoints.RESOURCES, expected_status_code=200, cache=True
         )
         catalogs_artifacts = []
 
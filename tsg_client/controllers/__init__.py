@@ -1,2 +1,4 @@
 # flake8: noqa
 from .TSGController import TSGController
+from .AsyncTSGController import AsyncTSGController
+from .CatalogIndex import CatalogIndex
@@ -0,0 +1,122 @@
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+from datetime import datetime, timezone
+
+from tsg_client.controllers.SelfDescription import ContractOffer
+
+
+def _contract_end(contract):
+    # Expiration (epoch seconds) of a contract offer / agreement, if any
+    try:
+        end_date = datetime.strptime(
+            contract["ids:contractEnd"]["@value"], "%Y-%m-%dT%H:%M:%S.%fZ"
+        )
+    except (KeyError, TypeError, ValueError):
+        return None
+    return end_date.replace(tzinfo=timezone.utc).timestamp()
+
+
+def _load_contract_offer(contract_offer):
+    if isinstance(contract_offer, str):
+        try:
+            contract_offer = json.loads(contract_offer)
+        except ValueError:
+            return None
+    return contract_offer if isinstance(contract_offer, (dict, ContractOffer)) else None
+
+
+class AgreementStore:
+    """
+    Store of the contract agreements obtained for artifact contract offers,
+    keyed by connector ID, artifact access URL and (canonical) contract
+    offer. Agreements expire on their `ids:contractEnd` date.
+
+    Agreements are kept in memory and, if a `db_path` is given, persisted
+    in a SQLite database so they can be reused across processes.
+    """
+
+    def __init__(self, db_path=None):
+        self._lock = threading.Lock()
+        self._agreements = {}
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            with self._db:
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS agreements ("
+                    "key TEXT PRIMARY KEY, agreement_id TEXT NOT NULL, expires_at REAL)"
+                )
+
+    @staticmethod
+    def key(connector_id, access_url, contract_offer):
+        contract_offer = _load_contract_offer(contract_offer) or contract_offer
+        canonical = "\n".join(
+            [connector_id or "", access_url or "", ContractOffer.dumps(contract_offer)]
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, connector_id, access_url, contract_offer):
+        """
+        Get a (non expired) contract agreement ID for a contract offer
+
+        :return: Contract Agreement ID or None
+        """
+        key = self.key(connector_id, access_url, contract_offer)
+        with self._lock:
+            entry = self._agreements.get(key)
+            if entry is None and self._db is not None:
+                entry = self._db.execute(
+                    "SELECT agreement_id, expires_at FROM agreements WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                if entry is not None:
+                    self._agreements[key] = entry
+            if entry is None:
+                return None
+            agreement_id, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                self._delete(key)
+                return None
+            return agreement_id
+
+    def put(self, connector_id, access_url, contract_offer, agreement):
+        """
+        Store the contract agreement obtained for a contract offer. It
+        expires on the agreement (or, if not set, the offer) contract end.
+
+        :param agreement: Contract agreement (JSON-LD dict) or its ID
+        """
+        key = self.key(connector_id, access_url, contract_offer)
+        if isinstance(agreement, dict):
+            agreement_id = agreement["@id"]
+            expires_at = _contract_end(agreement)
+        else:
+            agreement_id = agreement
+            expires_at = None
+        if expires_at is None:
+            expires_at = _contract_end(_load_contract_offer(contract_offer))
+        with self._lock:
+            self._agreements[key] = (agreement_id, expires_at)
+            if self._db is not None:
+                with self._db:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO agreements VALUES (?, ?, ?)",
+                        (key, agreement_id, expires_at),
+                    )
+
+    def _delete(self, key):
+        self._agreements.pop(key, None)
+        if self._db is not None:
+            with self._db:
+                self._db.execute("DELETE FROM agreements WHERE key = ?", (key,))
+
+    def clear(self):
+        with self._lock:
+            self._agreements.clear()
+            if self._db is not None:
+                with self._db:
+                    self._db.execute("DELETE FROM agreements")
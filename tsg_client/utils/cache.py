@@ -0,0 +1,322 @@
+import os
+import time
+import json
+import hashlib
+import urllib.parse
+import requests
+import itertools
+import threading
+
+from collections import OrderedDict
+
+
+class CacheEntry:
+    """
+    Cached HTTP response, with its expiration time and validators (used to
+    revalidate it with a conditional request once expired).
+    """
+
+    def __init__(self, response, ttl, version):
+        self.response = response
+        self.version = version
+        self.etag = response.headers.get("etag")
+        self.last_modified = response.headers.get("last-modified")
+        self.size = len(response.content)
+        self.refresh(ttl)
+
+    def refresh(self, ttl):
+        self.expires_at = time.time() + ttl
+
+    @property
+    def is_fresh(self):
+        return time.time() < self.expires_at
+
+    @property
+    def conditional_headers(self):
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def to_dict(self):
+        """
+        Response metadata (JSON serializable), without the content.
+        """
+        return {
+            "url": self.response.url,
+            "status_code": self.response.status_code,
+            "reason": self.response.reason,
+            "encoding": self.response.encoding,
+            "headers": list(self.response.headers.items()),
+            "version": self.version,
+            "expires_at": self.expires_at,
+        }
+
+    @classmethod
+    def from_dict(cls, obj, content):
+        response = requests.Response()
+        response.url = obj["url"]
+        response.status_code = obj["status_code"]
+        response.reason = obj["reason"]
+        response.encoding = obj["encoding"]
+        response.headers.update(obj["headers"])
+        response._content = content
+        response._content_consumed = True
+        entry = cls(response, 0, obj["version"])
+        entry.expires_at = obj["expires_at"]
+        return entry
+
+
+class MemoryCacheBackend:
+    """
+    In-memory cache backend, with LRU eviction once the total size of the
+    cached responses exceeds max_size (bytes).
+    """
+
+    def __init__(self, max_size=64 * 1024 * 1024):
+        self.max_size = max_size
+        self._size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous.size
+            self._entries[key] = entry
+            self._size += entry.size
+            while self._size > self.max_size and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.size
+
+    def delete(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._size -= entry.size
+
+    def delete_prefix(self, prefix):
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                self._size -= self._entries.pop(key).size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+class DiskCacheBackend:
+    """
+    On-disk cache backend (one file per response in `directory`), with LRU
+    eviction once the total size of the cached responses exceeds max_size
+    (bytes). Cached responses survive process restarts.
+
+    Each file holds the response metadata (one JSON line) followed by the
+    raw response content, so loading a cached response never executes code
+    (unlike pickle).
+    """
+
+    def __init__(self, directory, max_size=512 * 1024 * 1024):
+        self.directory = directory
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        # Index of the cached files (least recently used first):
+        files = [
+            os.path.join(directory, name)
+            for name in os.listdir(directory)
+            if name.endswith(".cache")
+        ]
+        files.sort(key=os.path.getmtime)
+        self._index = OrderedDict((path, os.path.getsize(path)) for path in files)
+        self._size = sum(self._index.values())
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.cache")
+
+    def get(self, key):
+        path = self._path(key)
+        with self._lock:
+            if path not in self._index:
+                return None
+            try:
+                with open(path, "rb") as cache_file:
+                    metadata = json.loads(cache_file.readline())
+                    entry = CacheEntry.from_dict(metadata, cache_file.read())
+            except (OSError, ValueError, KeyError, TypeError):
+                self._remove(path)
+                return None
+            os.utime(path)
+            self._index.move_to_end(path)
+            return entry
+
+    def set(self, key, entry):
+        path = self._path(key)
+        with self._lock:
+            with open(f"{path}.tmp", "wb") as cache_file:
+                cache_file.write(json.dumps(entry.to_dict()).encode("utf-8"))
+                cache_file.write(b"\n")
+                cache_file.write(entry.response.content)
+            os.replace(f"{path}.tmp", path)
+            self._size -= self._index.pop(path, 0)
+            self._index[path] = os.path.getsize(path)
+            self._size += self._index[path]
+            while self._size > self.max_size and len(self._index) > 1:
+                self._remove(next(iter(self._index)))
+
+    def _remove(self, path):
+        self._size -= self._index.pop(path, 0)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def delete(self, key):
+        with self._lock:
+            self._remove(self._path(key))
+
+    def delete_prefix(self, prefix):
+        with self._lock:
+            for path in [p for p in self._index if os.path.basename(p).startswith(prefix)]:
+                self._remove(path)
+
+    def clear(self):
+        with self._lock:
+            for path in list(self._index):
+                self._remove(path)
+
+
+class ResponseCache:
+    """
+    HTTP response cache for the RequestController GET requests.
+
+    Responses are served from the cache while fresh (ttl, in seconds). Once
+    expired, they are revalidated with a conditional request
+    (If-None-Match / If-Modified-Since) and reused if the server answers
+    304 Not Modified. Objects parsed from cached responses (e.g.,
+    SelfDescription) are also kept (LRU), while the response content is
+    unchanged.
+
+    :param ttl: Time to live of the cached responses, in seconds
+    :param backend: Cache backend (MemoryCacheBackend by default)
+    :param max_parsed: Maximum number of parsed objects kept in memory
+    :param max_parsed_size: Maximum total size (bytes) of the responses the
+     parsed objects kept in memory come from
+    """
+
+    def __init__(self, ttl=300, backend=None, max_parsed=128, max_parsed_size=64 * 1024 * 1024):
+        self.ttl = ttl
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        self.max_parsed = max_parsed
+        self.max_parsed_size = max_parsed_size
+        self._versions = itertools.count()
+        # (version, parser) -> (parsed object, response size)
+        self._parsed = OrderedDict()
+        self._parsed_size = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _digest(value):
+        return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def key(cls, url, params=None, headers=None):
+        # "<url digest>-<params and headers digest>", so that all the
+        # responses cached for a URL can be found (see invalidate)
+        if isinstance(params, dict):
+            params = sorted((k, str(v)) for k, v in params.items() if v is not None)
+        headers = sorted((headers or {}).items())
+        return f"{cls._digest(url)}-{cls._digest(repr((params, headers)))}"
+
+    def get(self, key):
+        entry = self.backend.get(key)
+        if entry is not None:
+            # Tag the response with the version of its content, to reuse the
+            # objects parsed from it (see parse):
+            entry.response.cache_version = entry.version
+        return entry
+
+    def set(self, key, response):
+        if "no-store" in response.headers.get("cache-control", ""):
+            return None
+        entry = CacheEntry(response, self.ttl, f"{key}:{next(self._versions)}:{time.time()}")
+        self.backend.set(key, entry)
+        self._forget_parsed(key)
+        response.cache_version = entry.version
+        return entry
+
+    def revalidated(self, key, entry):
+        # Server answered 304 Not Modified: the cached response is fresh again
+        entry.refresh(self.ttl)
+        self.backend.set(key, entry)
+        return entry
+
+    def delete(self, key):
+        self.backend.delete(key)
+        self._forget_parsed(key)
+
+    def invalidate(self, url):
+        """
+        Drop the responses cached for a URL (with any params / headers) and
+        for its parent paths, e.g., after a successful POST, PUT, PATCH or
+        DELETE request on it: api/resources/{id} also drops api/resources.
+        """
+        scheme, netloc, path, _, _ = urllib.parse.urlsplit(url)
+        segments = path.rstrip("/").split("/")
+        while len(segments) > 1:
+            path = "/".join(segments)
+            prefix = f"{self._digest(f'{scheme}://{netloc}{path}')}-"
+            self.backend.delete_prefix(prefix)
+            self._forget_parsed(prefix)
+            segments.pop()
+
+    def clear(self):
+        self.backend.clear()
+        with self._lock:
+            self._parsed.clear()
+            self._parsed_size = 0
+
+    def _forget_parsed(self, key):
+        # Drop the objects parsed from previous versions of a response (or
+        # of any response with a key starting with `key`)
+        prefix = key if key.endswith("-") else f"{key}:"
+        with self._lock:
+            for parsed_key in [k for k in self._parsed if k[0].startswith(prefix)]:
+                self._parsed_size -= self._parsed.pop(parsed_key)[1]
+
+    def parse(self, response, parser):
+        """
+        Parse a response with `parser`, reusing the previously parsed object
+        if the response content is the same (cached) one.
+        """
+        version = getattr(response, "cache_version", None)
+        if version is None:
+            return parser(response)
+        parsed_key = (version, parser)
+        with self._lock:
+            if parsed_key in self._parsed:
+                self._parsed.move_to_end(parsed_key)
+                return self._parsed[parsed_key][0]
+        parsed = parser(response)
+        size = len(response.content)
+        with self._lock:
+            self._parsed_size -= self._parsed.pop(parsed_key, (None, 0))[1]
+            self._parsed[parsed_key] = (parsed, size)
+            self._parsed_size += size
+            while self._parsed and (
+                len(self._parsed) > self.max_parsed
+                or self._parsed_size > self.max_parsed_size
+            ):
+                self._parsed_size -= self._parsed.popitem(last=False)[1][1]
+        return parsed
@@ -0,0 +1,119 @@
+import time
+import threading
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitOpenError(Exception):
+    """
+    Request not sent, the circuit of the remote connector is open (it kept
+    failing recently).
+    """
+
+    def __init__(self, peer, retry_in):
+        super().__init__(
+            f"Circuit open for {peer}, next probe in {max(retry_in, 0):.1f}s"
+        )
+        self.peer = peer
+        self.retry_in = retry_in
+
+
+class _Circuit:
+    __slots__ = ("state", "failures", "successes", "next_probe")
+
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.successes = 0
+        self.next_probe = 0
+
+
+class CircuitBreaker:
+    """
+    Per-peer (remote connector, see rate_limit.peer_key) circuit breaker.
+
+    After failure_threshold consecutive failures (transport errors or 5xx
+    responses) the circuit of a peer opens and its requests fail right
+    away with CircuitOpenError. After recovery_timeout seconds the circuit
+    is half-open: one probe request is let through every probe_interval
+    seconds, and success_threshold successful probes close it again (a
+    failed probe opens it again).
+
+    :param failure_threshold: Consecutive failures that open the circuit
+    :param recovery_timeout: Time (seconds) before probing an open circuit
+    :param probe_interval: Time (seconds) between probes, while half-open
+    :param success_threshold: Successful probes that close the circuit
+    """
+
+    def __init__(
+        self,
+        failure_threshold=5,
+        recovery_timeout=30,
+        probe_interval=5,
+        success_threshold=1,
+    ):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.probe_interval = probe_interval
+        self.success_threshold = success_threshold
+        self._circuits = {}
+        self._lock = threading.Lock()
+
+    def _circuit(self, peer):
+        circuit = self._circuits.get(peer)
+        if circuit is None:
+            circuit = self._circuits[peer] = _Circuit()
+        return circuit
+
+    def state(self, peer):
+        with self._lock:
+            return self._circuit(peer).state
+
+    def before(self, peer):
+        """
+        Check if a request to `peer` can be sent (raises CircuitOpenError
+        if it can not).
+        """
+        with self._lock:
+            circuit = self._circuit(peer)
+            if circuit.state == CLOSED:
+                return
+            now = time.monotonic()
+            if now < circuit.next_probe:
+                raise CircuitOpenError(peer, circuit.next_probe - now)
+            # Let a probe request through
+            circuit.state = HALF_OPEN
+            circuit.next_probe = now + self.probe_interval
+
+    def record(self, peer, ok):
+        """
+        Record the outcome of a request to `peer`.
+        """
+        with self._lock:
+            circuit = self._circuit(peer)
+            if ok:
+                circuit.failures = 0
+                if circuit.state == HALF_OPEN:
+                    circuit.successes += 1
+                    if circuit.successes >= self.success_threshold:
+                        circuit.state = CLOSED
+                        circuit.successes = 0
+                return
+            circuit.failures += 1
+            if circuit.state == HALF_OPEN or circuit.failures >= self.failure_threshold:
+                circuit.state = OPEN
+                circuit.successes = 0
+                circuit.next_probe = time.monotonic() + self.recovery_timeout
+
+    def reset(self, peer=None):
+        with self._lock:
+            if peer is None:
+                self._circuits.clear()
+            else:
+                self._circuits.pop(peer, None)
+
+    @staticmethod
+    def is_ok(status_code):
+        return status_code < 500
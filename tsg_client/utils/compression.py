@@ -0,0 +1,43 @@
+import gzip
+
+import requests
+
+from urllib3.util.request import ACCEPT_ENCODING
+
+# Response encodings that can be decoded (gzip and deflate, plus brotli and
+# zstd when the brotli / zstandard packages are installed). Responses are
+# decoded while streamed (see requests Response.iter_content).
+ACCEPTED_ENCODINGS = ACCEPT_ENCODING
+
+# Request bodies smaller than this (bytes) are not worth compressing
+COMPRESS_MIN_SIZE = 1024
+
+
+def encode_body(session, method, url, data=None, files=None, headers=None):
+    """
+    Encode a request body (form / multipart / raw data) as requests would.
+
+    :return: Tuple with the body (bytes) and its content type, or None if
+     the request has no body
+    """
+    prepared = session.prepare_request(
+        requests.Request(method, url, data=data, files=files, headers=headers)
+    )
+    body = prepared.body
+    if not body:
+        return None
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    return body, prepared.headers.get("Content-Type")
+
+
+def gzip_body(body, min_size=COMPRESS_MIN_SIZE):
+    """
+    Gzip compressed body, or None if it is too small (or incompressible).
+    """
+    if len(body) < min_size:
+        return None
+    compressed = gzip.compress(body, compresslevel=6)
+    if len(compressed) >= len(body):
+        return None
+    return compressed
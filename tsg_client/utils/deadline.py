@@ -0,0 +1,96 @@
+import time
+import functools
+import contextvars
+
+from contextlib import contextmanager
+
+# Absolute deadline (time.monotonic) of the current flow, if any
+_deadline = contextvars.ContextVar("tsg_client_deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """
+    The time budget of the current deadline (see `deadline`) ran out.
+    """
+
+
+@contextmanager
+def deadline(seconds):
+    """
+    Time budget (seconds) for all the requests made within the context,
+    e.g., a self-description -> agreement -> artifact flow:
+
+        with deadline(30):
+            agreement_id = conn.request_agreement(...)
+            conn.request_data_artifact(...)
+
+    Nested deadlines can only shrink the outer budget. Request timeouts are
+    capped to the remaining time and requests fail fast with
+    DeadlineExceeded once it runs out. The deadline is inherited by asyncio
+    tasks, and by the TSGController worker threads.
+    """
+    new = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        new = min(new, current)
+    token = _deadline.set(new)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining():
+    """
+    Remaining time (seconds) of the current deadline, None if there is none.
+    """
+    current = _deadline.get()
+    if current is None:
+        return None
+    return current - time.monotonic()
+
+
+def check_deadline():
+    """
+    Raise DeadlineExceeded if the current deadline has run out.
+    """
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded(f"Deadline exceeded by {-left:.3f}s")
+
+
+def bound_timeout(timeout=None):
+    """
+    Cap a request timeout (seconds, or a (connect, read) tuple) to the
+    remaining time of the current deadline.
+
+    Note that the read timeout bounds each socket read, so a streamed
+    response body must also check the deadline (see check_deadline).
+    """
+    left = remaining()
+    if left is None:
+        return timeout
+    check_deadline()
+    if timeout is None:
+        return left
+    if isinstance(timeout, tuple):
+        return tuple(left if t is None else min(t, left) for t in timeout)
+    return min(timeout, left)
+
+
+def with_deadline(fn):
+    """
+    Wrap `fn` to run with the current deadline, e.g., in a worker thread
+    (threads do not inherit context variables).
+    """
+    current = _deadline.get()
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        token = _deadline.set(current)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _deadline.reset(token)
+
+    return wrapper
@@ -1,4 +1,8 @@
 import os
+import time
+import asyncio
+
+from tsg_client.utils.deadline import check_deadline
 
 
 def save_json_file(artifact_id, content, path="."):
@@ -23,3 +27,55 @@ def save_csv_file(artifact_id, content, path="."):
     with open(csv_path, "w", newline="", encoding="utf-8") as csv_file:
         csv_file.write(content)
     return {"message": f"CSV file saved to {csv_path}", "file_path": csv_path}
+
+
+def _stream_result(file_path, bytes_written, elapsed):
+    return {
+        "message": f"File saved to {file_path}",
+        "file_path": file_path,
+        "bytes_written": bytes_written,
+        "elapsed_seconds": elapsed,
+        "throughput": bytes_written / elapsed if elapsed > 0 else None,
+    }
+
+
+def save_stream_file(artifact_id, chunks, extension, path="."):
+    """
+    Write an iterable of byte chunks to disk as they arrive, without
+    buffering the whole content in memory. Stops with DeadlineExceeded if
+    the current deadline (if any) runs out.
+
+    :return: Dictionary with the file path, bytes written, elapsed time
+     (seconds) and throughput (bytes per second)
+    """
+    file_path = os.path.join(path, f"{artifact_id}.{extension}")
+    bytes_written = 0
+    start = time.perf_counter()
+    with open(file_path, "wb") as file:
+        for chunk in chunks:
+            check_deadline()
+            if chunk:
+                file.write(chunk)
+                bytes_written += len(chunk)
+    return _stream_result(file_path, bytes_written, time.perf_counter() - start)
+
+
+async def async_save_stream_file(artifact_id, chunks, extension, path="."):
+    """
+    Same as save_stream_file, for an async iterable of byte chunks. The
+    (blocking) file operations run in a worker thread, so the event loop
+    keeps serving the other tasks while the chunks are written.
+    """
+    file_path = os.path.join(path, f"{artifact_id}.{extension}")
+    bytes_written = 0
+    start = time.perf_counter()
+    file = await asyncio.to_thread(open, file_path, "wb")
+    try:
+        async for chunk in chunks:
+            check_deadline()
+            if chunk:
+                await asyncio.to_thread(file.write, chunk)
+                bytes_written += len(chunk)
+    finally:
+        await asyncio.to_thread(file.close)
+    return _stream_result(file_path, bytes_written, time.perf_counter() - start)
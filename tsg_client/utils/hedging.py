@@ -0,0 +1,183 @@
+import math
+import time
+import asyncio
+import threading
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from tsg_client.utils.deadline import DeadlineExceeded, remaining, with_deadline
+
+
+class HedgedRequests:
+    """
+    Hedged calls to replicas of a service (e.g., metadata broker mirrors).
+
+    The call is sent to the first replica. If it has not answered within
+    the `percentile` latency of the recent calls, it is also sent to the
+    next replica (and so on), and the first successful answer is used.
+    Failed calls fail over to the next replica right away.
+
+    :param percentile: Latency percentile that triggers a hedged call
+    :param initial_delay: Hedging delay (seconds) until min_samples
+     latencies are known
+    :param min_delay: Minimum hedging delay, in seconds
+    :param min_samples: Number of latencies needed to use the percentile
+    :param window: Number of recent latencies kept
+    :param max_workers: Number of threads for the (sync) hedged calls
+    """
+
+    def __init__(
+        self,
+        percentile=95,
+        initial_delay=1.0,
+        min_delay=0.05,
+        min_samples=10,
+        window=100,
+        max_workers=4,
+    ):
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.hedged = 0  # Number of hedged (duplicate) calls sent
+        self.hedge_wins = 0  # Number of calls answered first by a replica
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="tsg-hedge"
+        )
+
+    def delay(self):
+        """
+        Time (seconds) to wait for an answer before sending a hedged call.
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if len(latencies) < self.min_samples:
+            return self.initial_delay
+        index = max(0, math.ceil(self.percentile / 100 * len(latencies)) - 1)
+        return max(self.min_delay, latencies[index])
+
+    def _record(self, latency):
+        with self._lock:
+            self._latencies.append(latency)
+
+    def _answered(self, index, latency):
+        self._record(latency)
+        if index > 0:
+            with self._lock:
+                self.hedge_wins += 1
+
+    def _abandoned(self, pending):
+        # Attempts still running once the call is answered (or failed) are
+        # at least this slow: record it, so a slow replica raises the delay
+        now = time.monotonic()
+        for _, start in pending.values():
+            self._record(now - start)
+
+    def _wait_timeout(self, launched, replicas):
+        # Wait for the hedging delay while there are replicas left,
+        # otherwise until the deadline (if any)
+        if launched < replicas:
+            return self.delay()
+        left = remaining()
+        if left is not None and left <= 0:
+            raise DeadlineExceeded("Deadline exceeded waiting for the replicas")
+        return left
+
+    def call(self, calls):
+        """
+        Hedged call.
+
+        :param calls: List of callables, one per replica (primary first)
+        :return: First successful result (raises the last error if all the
+         replicas fail)
+        """
+        pending = {}
+        errors = []
+        launched = 0
+
+        def launch():
+            nonlocal launched
+            future = self._executor.submit(with_deadline(calls[launched]))
+            pending[future] = (launched, time.monotonic())
+            launched += 1
+
+        launch()
+        try:
+            while pending:
+                done, _ = wait(
+                    pending,
+                    timeout=self._wait_timeout(launched, len(calls)),
+                    return_when=FIRST_COMPLETED,
+                )
+                if not done:
+                    if launched < len(calls):
+                        with self._lock:
+                            self.hedged += 1
+                        launch()
+                    continue
+                for future in done:
+                    index, start = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        self._record(time.monotonic() - start)
+                        errors.append(e)
+                        continue
+                    self._answered(index, time.monotonic() - start)
+                    return result
+                if launched < len(calls):
+                    # Fail over to the next replica
+                    launch()
+            raise errors[-1]
+        finally:
+            self._abandoned(pending)
+            for future in pending:
+                future.cancel()
+
+    async def async_call(self, calls):
+        """
+        Same as call, with coroutine functions (one per replica).
+        """
+        pending = {}
+        errors = []
+        launched = 0
+
+        def launch():
+            nonlocal launched
+            task = asyncio.ensure_future(calls[launched]())
+            pending[task] = (launched, time.monotonic())
+            launched += 1
+
+        launch()
+        try:
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=self._wait_timeout(launched, len(calls)),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    if launched < len(calls):
+                        self.hedged += 1
+                        launch()
+                    continue
+                for task in done:
+                    index, start = pending.pop(task)
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        self._record(time.monotonic() - start)
+                        errors.append(e)
+                        continue
+                    self._answered(index, time.monotonic() - start)
+                    return result
+                if launched < len(calls):
+                    launch()
+            raise errors[-1]
+        finally:
+            self._abandoned(pending)
+            for task in pending:
+                task.cancel()
@@ -0,0 +1,91 @@
+"""
+
+JSON codec used to decode the responses and encode the request payloads.
+The fastest installed library is used (orjson, then msgspec), falling back
+to the standard library json module. Use `use_backend` to pick one.
+
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+def _orjson_loads(data):
+    return orjson.loads(data)
+
+
+def _orjson_dumps(obj):
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+
+def _msgspec_loads(data):
+    try:
+        return msgspec.json.decode(data)
+    except msgspec.DecodeError as e:
+        raise ValueError(str(e)) from e
+
+
+def _msgspec_dumps(obj):
+    return msgspec.json.encode(obj).decode("utf-8")
+
+
+def _json_loads(data):
+    if isinstance(data, (bytes, bytearray)):
+        data = data.decode("utf-8")
+    return json.loads(data)
+
+
+def _json_dumps(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+BACKENDS = {
+    "orjson": (_orjson_loads, _orjson_dumps) if orjson is not None else None,
+    "msgspec": (_msgspec_loads, _msgspec_dumps) if msgspec is not None else None,
+    "json": (_json_loads, _json_dumps),
+}
+
+backend = None
+_loads = _dumps = None
+
+
+def use_backend(name=None):
+    """
+    Select the JSON backend ("orjson", "msgspec" or "json"). If None, the
+    fastest installed one is used.
+    """
+    global backend, _loads, _dumps
+    if name is None:
+        name = next(name for name, codec in BACKENDS.items() if codec is not None)
+    if BACKENDS.get(name) is None:
+        raise ValueError(f"JSON backend {name} is not available")
+    backend = name
+    _loads, _dumps = BACKENDS[name]
+
+
+def loads(data):
+    """
+    Decode a JSON document (str or UTF-8 bytes). Raises ValueError if it
+    is not valid JSON.
+    """
+    return _loads(data)
+
+
+def dumps(obj):
+    """
+    Encode an object as a compact JSON string (non ASCII characters are not
+    escaped).
+    """
+    return _dumps(obj)
+
+
+use_backend()
@@ -0,0 +1,210 @@
+import time
+import asyncio
+import threading
+
+from tsg_client.utils.deadline import DeadlineExceeded, remaining
+from tsg_client.utils.transport import url_origin
+
+
+def peer_key(url, params=None, headers=None):
+    """
+    Remote connector targeted by a request. Requests to other connectors go
+    through the local core container, with the remote access URL in the
+    accessUrl query parameter (or the Forward-AccessURL header).
+
+    :return: Origin of the remote connector (or of the request URL)
+    """
+    access_url = None
+    if isinstance(params, dict):
+        access_url = params.get("accessUrl")
+    if not access_url and headers:
+        access_url = headers.get("Forward-AccessURL")
+    return url_origin(access_url or url)
+
+
+class _PeerState:
+    __slots__ = (
+        "tokens", "updated", "inflight", "limit", "min_latency", "last_decrease", "waiters"
+    )
+
+    def __init__(self, burst, limit):
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.inflight = 0
+        self.limit = limit
+        self.min_latency = None
+        self.last_decrease = 0
+        # (loop, future) of the coroutines waiting for a concurrency slot
+        self.waiters = []
+
+
+class RateLimiter:
+    """
+    Per-peer (remote connector, see peer_key) request rate limit (token
+    bucket) and concurrency cap.
+
+    In adaptive mode the concurrency limit of each peer is tuned with AIMD:
+    it grows by ~1 per round trip while requests succeed with a latency
+    within latency_tolerance times the lowest one seen, and it is cut by
+    backoff_ratio (at most once per round trip) on errors (5xx, 429,
+    transport errors) or when latency degrades.
+
+    :param rate: Maximum requests per second, per peer (None for no limit)
+    :param burst: Token bucket size (defaults to max(1, rate))
+    :param max_concurrency: Maximum concurrent requests, per peer
+    :param adaptive: Tune the concurrency limit (AIMD)
+    :param initial_concurrency: Starting concurrency limit in adaptive mode
+    :param min_concurrency: Minimum concurrency limit in adaptive mode
+    :param latency_tolerance: Latency degradation factor that triggers a
+     decrease, in adaptive mode
+    :param backoff_ratio: Multiplicative decrease factor, in adaptive mode
+    """
+
+    def __init__(
+        self,
+        rate=None,
+        burst=None,
+        max_concurrency=None,
+        adaptive=False,
+        initial_concurrency=4,
+        min_concurrency=1,
+        latency_tolerance=2.0,
+        backoff_ratio=0.5,
+    ):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, rate or 0)
+        self.adaptive = adaptive
+        self.max_concurrency = max_concurrency
+        if adaptive:
+            self.max_concurrency = max_concurrency or 64
+            initial_concurrency = min(initial_concurrency, self.max_concurrency)
+        self.initial_concurrency = initial_concurrency
+        self.min_concurrency = min_concurrency
+        self.latency_tolerance = latency_tolerance
+        self.backoff_ratio = backoff_ratio
+        self._peers = {}
+        self._lock = threading.Lock()
+        # Notified when a concurrency slot is released
+        self._released = threading.Condition(self._lock)
+
+    def _state(self, peer):
+        state = self._peers.get(peer)
+        if state is None:
+            if self.adaptive:
+                limit = self.initial_concurrency
+            else:
+                limit = self.max_concurrency or float("inf")
+            state = self._peers[peer] = _PeerState(self.burst, limit)
+        return state
+
+    def _reserve(self, peer):
+        # Take a token and a concurrency slot (with the lock held), or return
+        # the time (seconds) until the next token, or None if the peer is at
+        # its concurrency limit (wait for a release)
+        state = self._state(peer)
+        if state.inflight + 1 > state.limit:
+            return None
+        if self.rate:
+            now = time.monotonic()
+            state.tokens = min(
+                self.burst, state.tokens + (now - state.updated) * self.rate
+            )
+            state.updated = now
+            if state.tokens < 1:
+                return (1 - state.tokens) / self.rate
+            state.tokens -= 1
+        state.inflight += 1
+        return 0
+
+    @staticmethod
+    def _wait_time(peer, delay):
+        # Time to wait, bounded by the current deadline (None for no bound)
+        left = remaining()
+        if left is None:
+            return delay
+        if left <= 0 or (delay is not None and delay >= left):
+            raise DeadlineExceeded(f"Deadline exceeded waiting for {peer} rate limit")
+        return left if delay is None else delay
+
+    def acquire(self, peer):
+        with self._released:
+            while True:
+                delay = self._reserve(peer)
+                if delay == 0:
+                    return
+                self._released.wait(self._wait_time(peer, delay))
+
+    async def async_acquire(self, peer):
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                delay = self._reserve(peer)
+                if delay == 0:
+                    return
+                timeout = self._wait_time(peer, delay)
+                if delay is None:
+                    waiter = loop.create_future()
+                    self._state(peer).waiters.append((loop, waiter))
+            if delay is not None:
+                await asyncio.sleep(timeout)
+                continue
+            try:
+                await asyncio.wait_for(waiter, timeout)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                with self._lock:
+                    waiters = self._state(peer).waiters
+                    if (loop, waiter) in waiters:
+                        waiters.remove((loop, waiter))
+
+    @staticmethod
+    def _wake(waiter):
+        if not waiter.done():
+            waiter.set_result(None)
+
+    def release(self, peer, latency=None, ok=True):
+        """
+        Release a concurrency slot, reporting the request latency (seconds)
+        and outcome (ok False for errors / overload responses). With no
+        latency (the request was not answered by the peer, e.g., local
+        deadline exceeded) the slot is released without reporting anything.
+        """
+        with self._lock:
+            state = self._state(peer)
+            state.inflight -= 1
+            self._released.notify_all()
+            for loop, waiter in state.waiters:
+                loop.call_soon_threadsafe(self._wake, waiter)
+            state.waiters.clear()
+            if not self.adaptive or latency is None:
+                return
+            if ok:
+                # Lowest latency seen, slowly drifting up so that it follows
+                # lasting changes of the peer latency
+                state.min_latency = (
+                    latency
+                    if state.min_latency is None
+                    else min(latency, state.min_latency * 1.01)
+                )
+            healthy = ok and latency <= state.min_latency * self.latency_tolerance
+            now = time.monotonic()
+            if healthy:
+                state.limit = min(self.max_concurrency, state.limit + 1 / state.limit)
+            elif now - state.last_decrease > latency:
+                state.limit = max(self.min_concurrency, state.limit * self.backoff_ratio)
+                state.last_decrease = now
+
+    @staticmethod
+    def is_ok(status_code):
+        return status_code < 500 and status_code != 429
+
+    def stats(self):
+        """
+        Current concurrency limit and in-flight requests, per peer.
+        """
+        with self._lock:
+            return {
+                peer: {"limit": state.limit, "inflight": state.inflight}
+                for peer, state in self._peers.items()
+            }
@@ -0,0 +1,163 @@
+import time
+import random
+import threading
+
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from loguru import logger
+
+
+class _RefreshEntry:
+    __slots__ = (
+        "args",
+        "value",
+        "loaded_at",
+        "reads",
+        "failures",
+        "next_attempt",
+        "inflight",
+    )
+
+    def __init__(self, args):
+        self.args = args
+        self.value = None
+        self.loaded_at = None
+        self.reads = 0
+        self.failures = 0
+        self.next_attempt = 0
+        self.inflight = None
+
+
+class BackgroundRefresher:
+    """
+    Stale-while-revalidate store of values loaded by `loader(*args)`.
+
+    Readers always get the last good value immediately. The most read keys
+    (hot keys) are reloaded on a small thread pool shortly before they
+    expire, and other expired keys are reloaded in the background on their
+    next read. Concurrent reloads of the same key are deduplicated and keys
+    whose loader keeps failing are retried with exponential backoff.
+
+    :param loader: Callable that loads the value of a key
+    :param ttl: Time to live of the loaded values, in seconds
+    :param refresh_ahead: Reload hot keys this many seconds before expiry
+    :param max_workers: Number of background reload threads
+    :param max_hot: Maximum number of hot keys reloaded ahead of expiry
+    :param min_reads: Minimum number of reads for a key to be hot
+    :param max_backoff: Maximum backoff (seconds) for failing keys
+    :param poll_interval: Interval (seconds) between scheduler checks
+    """
+
+    def __init__(
+        self,
+        loader,
+        ttl=300,
+        refresh_ahead=30,
+        max_workers=4,
+        max_hot=50,
+        min_reads=2,
+        max_backoff=600,
+        poll_interval=1.0,
+    ):
+        self.loader = loader
+        self.ttl = ttl
+        self.refresh_ahead = refresh_ahead
+        self.max_hot = max_hot
+        self.min_reads = min_reads
+        self.max_backoff = max_backoff
+        self.poll_interval = poll_interval
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="tsg-refresher"
+        )
+        self._stop = threading.Event()
+        self._scheduler = threading.Thread(
+            target=self._schedule, name="tsg-refresher-scheduler", daemon=True
+        )
+        self._scheduler.start()
+
+    def get(self, key, *args):
+        """
+        Get the value of `key` (loaded with `loader(*args)`). Only the first
+        read of a key waits for it to load.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _RefreshEntry(args)
+            entry.args = args
+            entry.reads += 1
+            if entry.loaded_at is None:
+                future = self._refresh(key, entry)
+            else:
+                if self._is_expired(entry, time.time()):
+                    self._refresh(key, entry)
+                return entry.value
+        # First read, wait for the value to load (raises on failure):
+        return future.result()
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def stop(self):
+        self._stop.set()
+        self._scheduler.join()
+        self._executor.shutdown(wait=False)
+
+    def _is_expired(self, entry, now, ahead=0):
+        return entry.loaded_at is not None and now >= entry.loaded_at + self.ttl - ahead
+
+    def _refresh(self, key, entry):
+        # Must be called with the lock held. Deduplicates reloads of a key.
+        if entry.inflight is not None:
+            return entry.inflight
+        if entry.loaded_at is not None and time.time() < entry.next_attempt:
+            return None
+        entry.inflight = future = Future()
+        self._executor.submit(self._load, key, entry, future)
+        return future
+
+    def _load(self, key, entry, future):
+        try:
+            value = self.loader(*entry.args)
+        except Exception as e:
+            with self._lock:
+                entry.inflight = None
+                entry.failures += 1
+                backoff = min(self.max_backoff, 2 ** entry.failures)
+                entry.next_attempt = time.time() + random.uniform(backoff / 2, backoff)
+                if entry.loaded_at is None:
+                    # Nothing to serve yet, the next read retries
+                    self._entries.pop(key, None)
+            logger.warning(f"Error refreshing {key}: {repr(e)}")
+            future.set_exception(e)
+            return
+        with self._lock:
+            if entry.loaded_at is not None:
+                # Decay the read count, so hotness follows recent reads
+                entry.reads //= 2
+            entry.value = value
+            entry.loaded_at = time.time()
+            entry.failures = 0
+            entry.next_attempt = 0
+            entry.inflight = None
+        future.set_result(value)
+
+    def _schedule(self):
+        while not self._stop.wait(self.poll_interval):
+            now = time.time()
+            with self._lock:
+                hot = sorted(
+                    (
+                        (key, entry)
+                        for key, entry in self._entries.items()
+                        if entry.reads >= self.min_reads
+                    ),
+                    key=lambda item: item[1].reads,
+                    reverse=True,
+                )[: self.max_hot]
+                for key, entry in hot:
+                    if self._is_expired(entry, now, ahead=self.refresh_ahead):
+                        self._refresh(key, entry)
@@ -0,0 +1,50 @@
+import requests
+
+from tsg_client.utils import json_codec
+
+_UNSET = object()
+
+# First bytes of a JSON object / array
+_JSON_START = tuple(b"{[")
+
+
+def looks_like_json(response):
+    """
+    Cheap check of a JSON response body (without parsing it): JSON content
+    type and a body starting as a JSON object or array. Other responses
+    must be parsed to tell whether they are JSON.
+    """
+    content_type = response.headers.get("content-type", "")
+    if "json" not in content_type:
+        return False
+    head = response.content[:32].lstrip()
+    return bool(head) and head[0] in _JSON_START
+
+
+class JSONResponse(requests.Response):
+    """
+    requests.Response that decodes its JSON body once (with the fastest
+    JSON backend, see json_codec): json() returns the same (memoized)
+    object on every call.
+    """
+
+    _json = _UNSET
+
+    @classmethod
+    def wrap(cls, response):
+        if isinstance(response, cls) or not isinstance(response, requests.Response):
+            return response
+        wrapped = cls.__new__(cls)
+        wrapped.__dict__.update(response.__dict__)
+        return wrapped
+
+    def json(self, **kwargs):
+        if kwargs:
+            return super().json(**kwargs)
+        if self._json is _UNSET:
+            try:
+                self._json = json_codec.loads(self.content)
+            except ValueError:
+                # Not UTF-8 encoded (or invalid, raising the requests error)
+                self._json = super().json()
+        return self._json
@@ -0,0 +1,204 @@
+import time
+import random
+import threading
+
+from collections import Counter
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import httpx
+import requests
+
+from tsg_client.utils.deadline import remaining
+
+# Methods that can be safely sent more than once (RFC 9110)
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"})
+
+RETRYABLE_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+
+def _is_connect_error(exception):
+    # True if the request surely never reached the server
+    if isinstance(
+        exception,
+        (requests.exceptions.ConnectTimeout, httpx.ConnectError, httpx.ConnectTimeout),
+    ):
+        return True
+    if isinstance(exception, requests.exceptions.ConnectionError):
+        if isinstance(exception.__cause__, httpx.ConnectError):
+            # Raised by the HTTP2Transport
+            return True
+        reason = getattr(exception.args[0], "reason", None) if exception.args else None
+        return type(reason).__name__ == "NewConnectionError"
+    return False
+
+
+def replayable_body(method, url, kwargs):
+    """
+    Make a request body safe to send more than once. Multipart files are
+    encoded once, up front: the file objects would otherwise be read
+    (emptied) by the first attempt. File-like bodies are rewound before
+    each attempt.
+
+    :param method: Request method
+    :param url: Request URL
+    :param kwargs: Request kwargs (data, files, headers, ...)
+    :return: Tuple with the request kwargs and a function rewinding the body
+     before an attempt (None if the body can only be sent once, e.g., a
+     generator or a non seekable stream)
+    """
+    data, files = kwargs.get("data"), kwargs.get("files")
+    if files:
+        prepared = requests.Request(
+            method, url, data=data, files=files, headers=kwargs.get("headers")
+        ).prepare()
+        headers = {
+            **(kwargs.get("headers") or {}),
+            "Content-Type": prepared.headers["Content-Type"],
+        }
+        kwargs = {**kwargs, "data": prepared.body, "files": None, "headers": headers}
+        return kwargs, _no_rewind
+    if hasattr(data, "read"):
+        try:
+            if not data.seekable():
+                return kwargs, None
+            position = data.tell()
+        except (AttributeError, OSError):
+            return kwargs, None
+        return kwargs, lambda: data.seek(position)
+    if data is not None and not isinstance(data, (str, bytes, bytearray, dict, list, tuple)):
+        # Generator / iterator body
+        return kwargs, None
+    return kwargs, _no_rewind
+
+
+def _no_rewind():
+    pass
+
+
+class RetryPolicy:
+    """
+    Retry policy for the RequestController requests.
+
+    Failed requests (connection errors, timeouts or retryable status codes)
+    are retried with exponential backoff and full jitter, honouring the
+    server Retry-After header, within a maximum number of attempts and a
+    maximum total time (and the current deadline). Non idempotent methods (e.g., POST) are only
+    retried if the request never reached the server.
+
+    :param max_attempts: Maximum number of attempts (including the first)
+    :param backoff_base: Base backoff delay, in seconds
+    :param backoff_max: Maximum backoff delay, in seconds
+    :param max_total_time: Maximum time (seconds) spent on a request,
+     including retries
+    :param retry_status_codes: Status codes that are retried
+    :param idempotent_methods: Methods that are retried on any failure
+    :param respect_retry_after: Wait for the Retry-After header delay
+    """
+
+    def __init__(
+        self,
+        max_attempts=3,
+        backoff_base=0.5,
+        backoff_max=30,
+        max_total_time=60,
+        retry_status_codes=RETRYABLE_STATUS_CODES,
+        idempotent_methods=IDEMPOTENT_METHODS,
+        respect_retry_after=True,
+    ):
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_total_time = max_total_time
+        self.retry_status_codes = frozenset(retry_status_codes)
+        self.idempotent_methods = frozenset(m.upper() for m in idempotent_methods)
+        self.respect_retry_after = respect_retry_after
+        self._stats = Counter()
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self):
+        """
+        Retry counters: requests, retries, gave_up (retryable failures not
+        retried due to attempts / time limits) and retries per reason
+        (e.g., "status_503" or "ConnectionError").
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats.clear()
+
+    def _count(self, *keys):
+        with self._lock:
+            self._stats.update(keys)
+
+    def backoff(self, attempt):
+        # Exponential backoff with full jitter
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    @staticmethod
+    def retry_after(response):
+        """
+        Delay (seconds) requested by the server Retry-After header, if any.
+        """
+        value = response.headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_date = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_date.tzinfo is None:
+            retry_date = retry_date.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_date - datetime.now(timezone.utc)).total_seconds())
+
+    def next_delay(self, method, attempt, start, response=None, exception=None):
+        """
+        Delay (seconds) before retrying a failed attempt, or None if it must
+        not be retried.
+
+        :param method: Request method
+        :param attempt: Number of the failed attempt (0 for the first one)
+        :param start: Request start time (time.monotonic)
+        :param response: Attempt response (if any)
+        :param exception: Attempt exception (if any)
+        """
+        if attempt == 0:
+            self._count("requests")
+
+        idempotent = method.upper() in self.idempotent_methods
+        if exception is not None:
+            if not (idempotent or _is_connect_error(exception)):
+                return None
+            reason = type(exception).__name__
+        elif response is not None and response.status_code in self.retry_status_codes:
+            if not idempotent:
+                return None
+            reason = f"status_{response.status_code}"
+        else:
+            return None
+
+        delay = self.backoff(attempt)
+        if self.respect_retry_after and response is not None:
+            retry_after = self.retry_after(response)
+            if retry_after is not None:
+                delay = retry_after
+
+        elapsed = time.monotonic() - start
+        left = remaining()
+        if (
+            attempt + 1 >= self.max_attempts
+            or elapsed + delay > self.max_total_time
+            or (left is not None and delay >= left)
+        ):
+            self._count("gave_up")
+            return None
+
+        self._count("retries", reason)
+        return delay
@@ -0,0 +1,181 @@
+import os
+import json
+import time
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+from tsg_client.utils.deadline import check_deadline, with_deadline
+
+
+def parse_content_range(content_range):
+    """
+    Get the total size from a Content-Range header (e.g., "bytes 0-0/1234").
+
+    :return: Total size in bytes or None if unknown
+    """
+    try:
+        total = content_range.rsplit("/", 1)[1].strip()
+        return int(total) if total != "*" else None
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+class SegmentedDownload:
+    """
+    Download a file as N byte ranges, fetched in parallel and written at
+    their offsets into a preallocated ".part" file. Progress is persisted in
+    a ".part.json" state file, so an interrupted download resumes from where
+    each segment stopped instead of restarting from zero.
+
+    The ranges are fetched through a `fetch_range(start, end)` callable that
+    must return a streamed HTTP response (206 Partial Content). The state
+    file is checkpointed every `checkpoint_bytes` bytes or
+    `checkpoint_interval` seconds (and when a segment ends or fails), so an
+    interruption re-downloads at most that much data.
+    """
+
+    def __init__(
+        self,
+        file_path,
+        size,
+        validator=None,
+        segments=4,
+        chunk_size=1024 * 1024,
+        checkpoint_bytes=8 * 1024 * 1024,
+        checkpoint_interval=1.0,
+    ):
+        self.file_path = file_path
+        self.part_path = f"{file_path}.part"
+        self.state_path = f"{file_path}.part.json"
+        self.size = size
+        self.validator = validator
+        self.chunk_size = chunk_size
+        self.checkpoint_bytes = checkpoint_bytes
+        self.checkpoint_interval = checkpoint_interval
+        self._lock = threading.Lock()
+        self._unsaved_bytes = 0
+        self._saved_at = time.monotonic()
+        self._state = self._load_state() or self._new_state(segments)
+
+    def _load_state(self):
+        # Resume only if a previous download of the same content exists
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as state_file:
+                state = json.load(state_file)
+        except (OSError, ValueError):
+            return None
+        if (
+            state.get("size") != self.size
+            or state.get("validator") != self.validator
+            or not os.path.exists(self.part_path)
+        ):
+            return None
+        return state
+
+    def _new_state(self, segments):
+        # Preallocate the file, so each segment can be written at its offset
+        with open(self.part_path, "wb") as part_file:
+            part_file.truncate(self.size)
+        segments = max(1, min(segments, self.size))
+        step = -(-self.size // segments)
+        state = {
+            "size": self.size,
+            "validator": self.validator,
+            "segments": [
+                [start, min(start + step, self.size) - 1, 0]
+                for start in range(0, self.size, step)
+            ],
+        }
+        self._save_state(state)
+        return state
+
+    def _save_state(self, state):
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as state_file:
+            json.dump(state, state_file)
+        os.replace(tmp_path, self.state_path)
+
+    def _checkpoint(self, force=False):
+        # Must be called with the lock held
+        now = time.monotonic()
+        if not force and (
+            self._unsaved_bytes < self.checkpoint_bytes
+            and now - self._saved_at < self.checkpoint_interval
+        ):
+            return
+        self._save_state(self._state)
+        self._unsaved_bytes = 0
+        self._saved_at = now
+
+    @property
+    def bytes_done(self):
+        return sum(done for _, _, done in self._state["segments"])
+
+    def _download_segment(self, segment, fetch_range):
+        start, end, done = segment
+        if start + done > end:
+            return 0
+        bytes_written = 0
+        with fetch_range(start + done, end) as rsp:
+            if rsp.status_code != 206:
+                raise Exception(
+                    f"Expected status_code 206 for range {start + done}-{end}, "
+                    f"but got status_code {rsp.status_code}."
+                )
+            try:
+                with open(self.part_path, "r+b") as part_file:
+                    part_file.seek(start + done)
+                    for chunk in rsp.iter_content(chunk_size=self.chunk_size):
+                        check_deadline()
+                        if not chunk:
+                            continue
+                        chunk = chunk[: end + 1 - (start + segment[2])]
+                        part_file.write(chunk)
+                        part_file.flush()
+                        bytes_written += len(chunk)
+                        with self._lock:
+                            segment[2] += len(chunk)
+                            self._unsaved_bytes += len(chunk)
+                            self._checkpoint()
+                        if start + segment[2] > end:
+                            break
+            finally:
+                # Persist the progress on segment completion (or failure)
+                with self._lock:
+                    self._checkpoint(force=True)
+        if start + segment[2] <= end:
+            raise Exception(f"Incomplete range {start}-{end} download.")
+        return bytes_written
+
+    def run(self, fetch_range):
+        """
+        Download the missing byte ranges and move the complete file to its
+        final path.
+
+        :param fetch_range: Callable (start, end) -> streamed HTTP response
+        :return: Dictionary with the file path, bytes written, resumed
+         bytes, elapsed time (seconds) and throughput (bytes per second)
+        """
+        resumed_bytes = self.bytes_done
+        segments = self._state["segments"]
+        start = time.perf_counter()
+        download_segment = with_deadline(self._download_segment)
+        with ThreadPoolExecutor(max_workers=len(segments)) as executor:
+            # Submitted upfront (unlike executor.map, a failed segment does
+            # not cancel the others, so they keep their progress)
+            futures = [executor.submit(download_segment, s, fetch_range) for s in segments]
+            bytes_written = sum(future.result() for future in futures)
+        elapsed = time.perf_counter() - start
+
+        os.replace(self.part_path, self.file_path)
+        os.remove(self.state_path)
+        return {
+            "message": f"File saved to {self.file_path}",
+            "file_path": self.file_path,
+            "bytes_written": bytes_written,
+            "resumed_bytes": resumed_bytes,
+            "segments": len(segments),
+            "elapsed_seconds": elapsed,
+            "throughput": bytes_written / elapsed if elapsed > 0 else None,
+        }
@@ -0,0 +1,192 @@
+"""
+
+Streaming (incremental) parser of connector self-descriptions. The JSON-LD
+document is parsed from the HTTP stream as it arrives (ijson events), and
+only the fields used by the SelfDescription models are kept: large unused
+subtrees (e.g., ids:publicKey) are skipped without being built. Requires the
+ijson package (`pip install tsg-client[streaming]`).
+
+"""
+
+from dataclasses import replace
+
+from tsg_client.controllers.SelfDescription import (
+    OfferedResource,
+    ResourceCatalog,
+    SelfDescription,
+    _intern,
+)
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Self-description fields used by SelfDescription.from_dict
+# (ids:resourceCatalog is parsed item by item)
+HEADER_KEYS = frozenset(
+    (
+        "@id",
+        "ids:title",
+        "ids:description",
+        "ids:securityProfile",
+        "ids:curator",
+        "ids:maintainer",
+        "ids:hasDefaultEndpoint",
+    )
+)
+
+# Offered resource fields used by OfferedResource.from_dict
+RESOURCE_KEYS = frozenset(
+    (
+        "@id",
+        "ids:resourceEndpoint",
+        "ids:contractOffer",
+        "ids:created",
+        "ids:title",
+        "ids:description",
+        "ids:representation",
+    )
+)
+
+_CATALOG = "ids:resourceCatalog.item"
+_RESOURCES = f"{_CATALOG}.ids:offeredResource"
+_RESOURCE = f"{_RESOURCES}.item"
+
+
+class _IterReader:
+    # File-like reader over an iterable of bytes chunks
+    # (e.g., requests Response.iter_content)
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buffer = b""
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            data, self._buffer = self._buffer + b"".join(self._chunks), b""
+            return data
+        while len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+def _events(source):
+    if ijson is None:
+        raise ImportError(
+            "Streaming self-description parsing requires the ijson package"
+        )
+    if not hasattr(source, "read"):
+        source = _IterReader(source)
+    return iter(ijson.parse(source, use_float=True))
+
+
+def _build(events):
+    # Build the next JSON value (scalar, object or array) of the events
+    builder = ijson.ObjectBuilder()
+    depth = 0
+    for _, event, value in events:
+        builder.event(event, value)
+        if event in ("start_map", "start_array"):
+            depth += 1
+        elif event in ("end_map", "end_array"):
+            depth -= 1
+        if depth == 0:
+            return builder.value
+
+
+def _skip(events):
+    # Consume the next JSON value of the events, without building it
+    depth = 0
+    for _, event, _ in events:
+        if event in ("start_map", "start_array"):
+            depth += 1
+        elif event in ("end_map", "end_array"):
+            depth -= 1
+        if depth == 0:
+            return
+
+
+def _build_map(events, keys):
+    # Build the object being parsed (after its start_map event), with the
+    # given keys only
+    obj = {}
+    for _, event, value in events:
+        if event == "end_map":
+            return obj
+        if value in keys:
+            obj[value] = _build(events)
+        else:
+            _skip(events)
+
+
+def _parse(source, header):
+    # Yield the resource catalogs of a self-description stream, filling in
+    # the header dictionary with its (non catalog) fields as they come
+    events = _events(source)
+    catalog = None
+    for prefix, event, value in events:
+        if prefix == "" and event == "map_key":
+            if value in HEADER_KEYS:
+                header[value] = _build(events)
+            elif value != "ids:resourceCatalog":
+                _skip(events)
+        elif prefix == _CATALOG:
+            if event == "start_map":
+                # Same ID as ResourceCatalog.from_dict for catalogs without @id
+                catalog = ResourceCatalog(_intern("None"), [])
+            elif event == "end_map":
+                yield catalog
+            elif value == "@id":
+                catalog.id = _intern(str(_build(events)))
+            elif value != "ids:offeredResource":
+                _skip(events)
+        elif prefix == _RESOURCE and event == "start_map":
+            resource = _build_map(events, RESOURCE_KEYS)
+            catalog.offeredResource.append(OfferedResource.from_dict(resource))
+
+
+def iter_catalogs(source):
+    """
+    Parse the resource catalogs of a self-description as it is read,
+    yielding them one by one (only one catalog is kept in memory).
+
+    :param source: Self-description JSON document, as a file-like object
+     or an iterable of bytes chunks (e.g., Response.iter_content())
+    :return: Generator of ResourceCatalog objects
+    """
+    try:
+        yield from _parse(source, {})
+    except (KeyError, AttributeError, IndexError, TypeError) as e:
+        raise ValueError(f"Error creating SelfDescription: {e}")
+
+
+def iter_offered_resources(source):
+    """
+    Same as iter_catalogs, yielding the offered resources of each catalog.
+
+    :return: Generator of (catalog ID, OfferedResource) tuples
+    """
+    for catalog in iter_catalogs(source):
+        for resource in catalog.offeredResource:
+            yield catalog.id, resource
+
+
+def parse_selfdescription(source):
+    """
+    Parse a self-description as it is read (see iter_catalogs).
+
+    :param source: Self-description JSON document, as a file-like object
+     or an iterable of bytes chunks
+    :return: SelfDescription object
+    """
+    header = {}
+    try:
+        catalogs = list(_parse(source, header))
+    except (KeyError, AttributeError, IndexError, TypeError) as e:
+        raise ValueError(f"Error creating SelfDescription: {e}")
+    return replace(SelfDescription.from_dict(header), catalogs=catalogs)
@@ -0,0 +1,94 @@
+import asyncio
+import threading
+import concurrent.futures
+
+from tsg_client.utils.deadline import DeadlineExceeded, remaining
+
+
+def request_key(method, url, params=None, headers=None):
+    """
+    Key identifying identical requests (same method, URL, query parameters
+    and headers).
+    """
+    if isinstance(params, dict):
+        params = tuple(sorted((k, str(v)) for k, v in params.items() if v is not None))
+    elif params is not None:
+        params = repr(params)
+    headers = tuple(sorted((headers or {}).items()))
+    return method, url, params, headers
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical calls (threads): while a call for a key is
+    in flight, callers with the same key wait for, and share, its result
+    (or exception) instead of making their own call.
+    """
+
+    def __init__(self):
+        self.coalesced = 0  # Number of calls that shared an in-flight call
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = concurrent.futures.Future()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            try:
+                return future.result(timeout=remaining())
+            except concurrent.futures.TimeoutError:
+                raise DeadlineExceeded(f"Deadline exceeded waiting for {key[:2]}")
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            self._done(key)
+            future.set_exception(e)
+            raise
+        self._done(key)
+        future.set_result(result)
+        return result
+
+    def _done(self, key):
+        # Calls made from now on are not coalesced with the finished one
+        with self._lock:
+            self._calls.pop(key, None)
+
+
+class AsyncSingleFlight:
+    """
+    Same as SingleFlight, for coroutines (asyncio). The shared call is not
+    cancelled if one of its callers is.
+    """
+
+    def __init__(self):
+        self.coalesced = 0
+        self._calls = {}
+
+    async def do(self, key, fn, *args, **kwargs):
+        task = self._calls.get(key)
+        if task is None:
+            task = self._calls[key] = asyncio.ensure_future(fn(*args, **kwargs))
+            task.add_done_callback(lambda t: self._done(key, t))
+        else:
+            self.coalesced += 1
+        left = remaining()
+        if left is None:
+            return await asyncio.shield(task)
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), max(left, 0))
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded(f"Deadline exceeded waiting for {key[:2]}")
+
+    def _done(self, key, task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Retrieve the exception, in case all the callers were cancelled
+            task.exception()
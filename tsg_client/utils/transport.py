@@ -0,0 +1,256 @@
+import abc
+import threading
+
+import httpx
+import requests
+
+from urllib.parse import urlsplit
+
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+# Default (connect, read) request timeout, in seconds, of the sync and async
+# controllers. The read timeout bounds each socket read, not the whole
+# (possibly streamed) response:
+DEFAULT_TIMEOUT = (10, 300)
+
+
+def url_origin(url):
+    """
+    Origin (scheme://host[:port]) of an URL, e.g.
+    https://connector.test/selfdescription -> https://connector.test
+    """
+    parts = urlsplit(url)
+    return f"{parts.scheme.lower()}://{parts.netloc.lower()}"
+
+
+def drop_none(values):
+    # Mimic requests behaviour, which silently drops None valued
+    # headers / query parameters
+    if not isinstance(values, dict):
+        return values
+    return {k: v for k, v in values.items() if v is not None}
+
+
+def httpx_timeout(timeout):
+    # requests style timeout (seconds, or a (connect, read) tuple) to httpx
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
+
+
+class TransportProfile:
+    """
+    Connection pooling, timeout and TLS settings of the requests sent to
+    an origin (see RequestController.mount).
+
+    :param pool_connections: Number of per-host connection pools kept
+    :param pool_maxsize: Maximum number of connections kept per host
+    :param pool_block: Block when pool_maxsize connections are in use,
+     instead of opening (and discarding) extra connections
+    :param keep_alive: Reuse connections between requests
+    :param timeout: Default request timeout, in seconds (or a
+     (connect, read) tuple). None to wait forever
+    :param verify: Verify the TLS certificate (or CA bundle path). None to
+     use the controller verify setting
+    :param cert: Client certificate (path or (cert, key) tuple)
+    """
+
+    def __init__(
+        self,
+        pool_connections=10,
+        pool_maxsize=10,
+        pool_block=False,
+        keep_alive=True,
+        timeout=None,
+        verify=None,
+        cert=None,
+    ):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self.verify = verify
+        self.cert = cert
+
+    def __repr__(self):
+        return (
+            f"TransportProfile(pool_maxsize={self.pool_maxsize}, "
+            f"keep_alive={self.keep_alive}, "
+            f"timeout={self.timeout})"
+        )
+
+    def adapter(self):
+        return HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+        )
+
+    def request_kwargs(self, kwargs, default_verify=True):
+        """
+        Fill in the profile settings missing from the request kwargs.
+        """
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        if kwargs.get("verify") is None:
+            kwargs["verify"] = default_verify if self.verify is None else self.verify
+        if self.cert is not None:
+            kwargs.setdefault("cert", self.cert)
+        if not self.keep_alive:
+            kwargs["headers"] = {**(kwargs.get("headers") or {}), "Connection": "close"}
+        return kwargs
+
+
+class Transport(abc.ABC):
+    """
+    Interface of the RequestController transports: a requests.Session
+    compatible `request(method, url, **kwargs)` method, returning a
+    requests.Response. The default transport is the controller
+    requests.Session (HTTP/1.1, pooled per origin, see TransportProfile).
+    """
+
+    @abc.abstractmethod
+    def request(self, method, url, **kwargs):
+        """
+        Send a request, returning a requests.Response.
+        """
+
+    def close(self):
+        """
+        Release the transport connections (see RequestController.close).
+        """
+
+
+class _StreamedBody:
+    # File-like raw body of a streamed requests.Response, read from an
+    # httpx streamed response (see requests Response.iter_content)
+
+    def __init__(self, response):
+        self._response = response
+
+    def stream(self, chunk_size, decode_content=True):
+        yield from self._response.iter_bytes(chunk_size)
+
+    def read(self, size=None):
+        return self._response.read()
+
+    def close(self):
+        self._response.close()
+
+
+class HTTP2Transport(Transport):
+    """
+    HTTP/2 transport (httpx, requires the h2 package): concurrent requests
+    to the same origin are multiplexed over a single connection, instead of
+    one HTTP/1.1 connection each. Servers without HTTP/2 support are used
+    over HTTP/1.1.
+
+    httpx applies the TLS settings per client, so requests with other TLS
+    settings (verify, cert, e.g., from a transport profile) than the
+    transport ones are sent through a separate client, one per settings.
+
+    :param verify: Verify the TLS certificate (or CA bundle path)
+    :param cert: Client certificate (path or (cert, key) tuple)
+    :param max_connections: Maximum number of connections
+    """
+
+    def __init__(self, verify=True, cert=None, max_connections=100):
+        self.verify = verify
+        self.cert = cert
+        self.max_connections = max_connections
+        self.client = self._new_client(verify, cert)
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def _new_client(self, verify, cert):
+        return httpx.Client(
+            http2=True,
+            verify=verify,
+            cert=cert,
+            timeout=None,
+            limits=httpx.Limits(max_connections=self.max_connections),
+        )
+
+    def _client(self, verify=None, cert=None):
+        # Client with the given TLS settings (None for the transport ones)
+        verify = self.verify if verify is None else verify
+        cert = self.cert if cert is None else cert
+        if (verify, cert) == (self.verify, self.cert):
+            return self.client
+        with self._lock:
+            client = self._clients.get((verify, cert))
+            if client is None:
+                client = self._clients[(verify, cert)] = self._new_client(verify, cert)
+            return client
+
+    def request(
+        self,
+        method,
+        url,
+        params=None,
+        data=None,
+        headers=None,
+        files=None,
+        json=None,
+        timeout=None,
+        stream=False,
+        verify=None,
+        cert=None,
+        allow_redirects=True,
+        **kwargs,
+    ):
+        if kwargs:
+            raise TypeError(
+                f"Unsupported HTTP2Transport request arguments: {', '.join(kwargs)}"
+            )
+        content = None
+        if isinstance(data, (str, bytes)):
+            content, data = data, None
+        client = self._client(verify, cert)
+        request = client.build_request(
+            method,
+            url,
+            params=drop_none(params),
+            data=data,
+            content=content,
+            files=files,
+            json=json,
+            headers=drop_none(headers),
+            timeout=httpx_timeout(timeout),
+        )
+        try:
+            response = client.send(
+                request, stream=stream, follow_redirects=allow_redirects
+            )
+        except httpx.ConnectTimeout as e:
+            raise requests.exceptions.ConnectTimeout(e) from e
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.ReadTimeout(e) from e
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(e) from e
+        return self._to_requests_response(response, stream)
+
+    @staticmethod
+    def _to_requests_response(response, stream):
+        rsp = requests.Response()
+        rsp.status_code = response.status_code
+        rsp.reason = response.reason_phrase
+        rsp.url = str(response.url)
+        rsp.headers = CaseInsensitiveDict(response.headers.multi_items())
+        rsp.encoding = response.charset_encoding
+        # Closable raw body (e.g., closed by the retries)
+        rsp.raw = _StreamedBody(response)
+        if not stream:
+            rsp._content = response.content
+            rsp._content_consumed = True
+        return rsp
+
+    def close(self):
+        self.client.close()
+        with self._lock:
+            for client in self._clients.values():
+                client.close()
+            self._clients.clear()
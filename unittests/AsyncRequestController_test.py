@@ -0,0 +1,70 @@
+# flake8: noqa
+import unittest
+
+import httpx
+
+from tsg_client.controllers.AsyncRequestController import AsyncRequestController
+
+
+class TestAsyncRequestController(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.requests = []
+
+        def handler(request):
+            self.requests.append(request)
+            if request.url.path == "/api/resources":
+                return httpx.Response(200, json=[{"@id": "catalog"}])
+            if request.url.path == "/api/not-json":
+                return httpx.Response(200, text="plain text")
+            return httpx.Response(404, text="not found")
+
+        self.controller = AsyncRequestController(
+            base_url="https://connector.test", api_key="key", connector_id="id"
+        )
+        await self.controller.client.aclose()
+        self.controller.client = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        )
+
+    async def asyncTearDown(self):
+        await self.controller.aclose()
+
+    async def test_get_with_expected_status_code(self):
+        rsp = await self.controller.get(
+            "api/resources", params={"a": "1", "b": None}, expected_status_code=200
+        )
+
+        self.assertEqual(rsp.json(), [{"@id": "catalog"}])
+        self.assertEqual(self.requests[0].headers["Authorization"], "Bearer key")
+        self.assertEqual(str(self.requests[0].url), "https://connector.test/api/resources?a=1")
+
+    async def test_default_timeout(self):
+        # Same (connect, read) default timeout as the TSGController
+        controller = AsyncRequestController(
+            base_url="https://connector.test", api_key="key", connector_id="id"
+        )
+        async with controller:
+            self.assertEqual(controller.client.timeout, httpx.Timeout(300, connect=10))
+
+        controller = AsyncRequestController(
+            base_url="https://connector.test", api_key="key", connector_id="id", timeout=5
+        )
+        async with controller:
+            self.assertEqual(controller.client.timeout, httpx.Timeout(5))
+
+    async def test_unexpected_status_code(self):
+        with self.assertRaises(Exception):
+            await self.controller.get("api/missing", expected_status_code=200)
+
+    async def test_expected_json_content(self):
+        with self.assertRaises(Exception):
+            await self.controller.get("api/not-json", expected_status_code=200)
+
+        rsp = await self.controller.delete("api/not-json", expected_status_code=200)
+        self.assertEqual(rsp.status_code, 200)
+
+
+# Run tests
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,197 @@
+# flake8: noqa
+import os
+import asyncio
+import json
+import tempfile
+import unittest
+
+import httpx
+
+from tsg_client.controllers import AsyncTSGController
+from tsg_client.controllers.SelfDescription import SelfDescription
+
+CONTRACT_OFFER = {
+    "@type": "ids:ContractOffer",
+    "@id": "https://w3id.org/idsa/autogen/contractOffer/1",
+}
+
+SELF_DESCRIPTION = {
+    "@id": "urn:ids:test:provider",
+    "ids:title": [{"@value": "Provider connector"}],
+    "ids:description": [{"@value": "Test"}],
+    "ids:securityProfile": {"@id": "idsc:BASE_SECURITY_PROFILE"},
+    "ids:curator": {"@id": "urn:ids:test:curator"},
+    "ids:maintainer": {"@id": "urn:ids:test:maintainer"},
+    "ids:hasDefaultEndpoint": {"ids:accessURL": {"@id": "https://provider.test"}},
+    "ids:resourceCatalog": [{
+        "@id": "urn:ids:test:catalog",
+        "ids:offeredResource": [{
+            "@id": "urn:ids:test:resources:1",
+            "ids:created": {"@value": "2024-03-19T21:47:18.009Z"},
+            "ids:contractOffer": [CONTRACT_OFFER],
+            "ids:representation": [{"ids:instance": [{"@id": "urn:ids:test:artifacts:1"}]}],
+        }],
+    }],
+}
+
+
+def artifact(artifact_id):
+    return {
+        "id": artifact_id,
+        "access_url": f"https://provider.test/router/artifacts/{artifact_id}",
+        "contract_offer": CONTRACT_OFFER,
+    }
+
+
+class TestAsyncTSGController(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.requests = []
+        self.tsg = AsyncTSGController(
+            api_key="key",
+            connector_id="urn:ids:test:consumer",
+            access_url="https://connector.test",
+        )
+        await self.tsg.controller.client.aclose()
+        self.tsg.controller.client = httpx.AsyncClient(
+            transport=httpx.MockTransport(self.handler)
+        )
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    async def asyncTearDown(self):
+        await self.tsg.aclose()
+
+    def handler(self, request):
+        # Fake TSG core container
+        self.requests.append(request)
+        path, params = request.url.path, request.url.params
+        if path == "/api/description":
+            if params["accessUrl"].startswith("https://offline.test"):
+                return httpx.Response(502, text="Bad gateway")
+            return httpx.Response(200, json=SELF_DESCRIPTION)
+        if path == "/api/artifacts/consumer/contractRequest":
+            if b"missing" in request.content:
+                return httpx.Response(500, text="Contract request failed")
+            return httpx.Response(200, json={"@id": "urn:ids:test:agreement"})
+        if path == "/api/artifacts/provider":
+            return httpx.Response(200, json={"@id": "urn:ids:test:artifacts:new"})
+        if path.startswith("/api/resources/"):
+            return httpx.Response(200, json={})
+        if path == "/api/artifacts/consumer/artifact":
+            return httpx.Response(200, text="a,b\n1,2\n", headers={"Content-Type": "text/csv"})
+        return httpx.Response(404, text="Not found")
+
+    async def test_get_connector_selfdescription(self):
+        self_description = await self.tsg.get_connector_selfdescription(
+            access_url="https://provider.test", connector_id="urn:ids:test:provider"
+        )
+
+        self.assertEqual(self_description, SelfDescription.from_dict(SELF_DESCRIPTION))
+        params = self.requests[0].url.params
+        self.assertEqual(params["accessUrl"], "https://provider.test/selfdescription")
+        self.assertEqual(params["connectorId"], "urn:ids:test:provider")
+
+        artifacts = self.tsg.parse_catalog_artifacts(self_description)
+        self.assertEqual([a["id"] for a in artifacts], ["urn:ids:test:artifacts:1"])
+
+    async def test_crawl_selfdescriptions(self):
+        results = [
+            connector["access_url"]
+            async for connector, _ in self.tsg.crawl_selfdescriptions(
+                ["https://provider.test", "https://offline.test"]
+            )
+        ]
+
+        # Failed connectors are skipped
+        self.assertEqual(results, ["https://provider.test"])
+
+    async def test_request_agreement(self):
+        agreement_id = await self.tsg.request_agreement(
+            connector_id="urn:ids:test:provider",
+            artifact_access_url="https://provider.test/router/artifacts/1",
+            artifact_contract_offer=CONTRACT_OFFER,
+        )
+
+        self.assertEqual(agreement_id, "urn:ids:test:agreement")
+        body = self.requests[0].content.decode()
+        self.assertIn('name="connectorId"', body)
+        self.assertIn(json.dumps(CONTRACT_OFFER, sort_keys=True, separators=(",", ":")), body)
+
+    async def test_request_data_artifact(self):
+        for stream in (False, True):
+            with self.subTest(stream=stream):
+                result = await self.tsg.request_data_artifact(
+                    artifact_id="urn:ids:test:artifacts:1",
+                    artifact_access_url="https://provider.test/router/artifacts/1",
+                    connector_id="urn:ids:test:provider",
+                    agent_id="",
+                    contract_agreement_id="urn:ids:test:agreement",
+                    keep_original_format=True,
+                    file_path=self.directory.name,
+                    stream=stream,
+                )
+
+                with open(result["file_path"]) as file:
+                    self.assertEqual(file.read(), "a,b\n1,2\n")
+                self.assertEqual(
+                    os.path.basename(result["file_path"]), "urn_ids_test_artifacts_1.csv"
+                )
+
+    async def test_download_artifacts_partial_failure(self):
+        manifest = await self.tsg.download_artifacts(
+            [artifact("urn:ids:test:artifacts:1"), artifact("urn:ids:test:artifacts:missing")],
+            connector_id="urn:ids:test:provider",
+            agent_id="",
+            file_path=self.directory.name,
+        )
+
+        self.assertEqual([entry["status"] for entry in manifest], ["success", "error"])
+        self.assertEqual(manifest[0]["contract_agreement_id"], "urn:ids:test:agreement")
+        self.assertEqual(manifest[0]["result"]["bytes_written"], 8)
+
+    async def test_download_artifacts_max_concurrency(self):
+        running = 0
+        peak = 0
+
+        async def request_data_artifact(**kwargs):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {"bytes_written": 0}
+
+        self.tsg.request_data_artifact = request_data_artifact
+        manifest = await self.tsg.download_artifacts(
+            [artifact(f"urn:ids:test:artifacts:{i}") for i in range(12)],
+            connector_id="urn:ids:test:provider",
+            agent_id="",
+            file_path=self.directory.name,
+            max_concurrency=3,
+        )
+
+        self.assertEqual([entry["status"] for entry in manifest], ["success"] * 12)
+        # Concurrent, but never more than max_concurrency downloads at once
+        self.assertEqual(peak, 3)
+
+    async def test_publish_data_artifact(self):
+        rsp_json = await self.tsg.publish_data_artifact(
+            artifact_file=("data.csv", b"a,b\n1,2\n", "text/csv"),
+            title="Test",
+            description="Test artifact",
+            contract_offer=json.dumps(CONTRACT_OFFER),
+            catalog_id="urn:ids:test:catalog",
+        )
+
+        self.assertEqual(rsp_json, {"@id": "urn:ids:test:artifacts:new"})
+        # Catalog link posted as JSON (as TSGController.publish_data_artifact)
+        link = self.requests[-1]
+        self.assertEqual(link.url.path, "/api/resources/urn:ids:test:catalog")
+        self.assertEqual(link.headers["Content-Type"], "application/json")
+        self.assertEqual(json.loads(link.content), rsp_json)
+
+
+# Run tests
+if __name__ == '__main__':
+    unittest.main()
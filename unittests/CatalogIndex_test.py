@@ -0,0 +1,112 @@
+# flake8: noqa
+import unittest
+
+from tsg_client.controllers import CatalogIndex, TSGController
+from tsg_client.controllers.SelfDescription import SelfDescription
+
+
+def raw_resource(catalog, n, created, contract_type="ids:ContractOffer",
+                 contract_end="2099-12-31T00:00:00.000Z"):
+    return {
+        "@type": "ids:DataResource",
+        "@id": f"urn:ids:test:{catalog}:resources:{n}",
+        "ids:title": [{"@value": f"{catalog} {n}", "@language": "en"}],
+        "ids:description": [{"@value": "description", "@language": "en"}],
+        "ids:contractOffer": [{
+            "@type": contract_type,
+            "@id": f"https://w3id.org/idsa/autogen/contractOffer/{catalog}-{n}",
+            "ids:contractStart": {"@value": "2024-01-01T00:00:00.000Z"},
+            "ids:contractEnd": {"@value": contract_end},
+        }],
+        "ids:representation": [{
+            "ids:instance": [{"@id": f"urn:ids:test:{catalog}:artifacts:{n}"}]
+        }],
+        "ids:resourceEndpoint": [{
+            "ids:path": f"/artifacts/{catalog}-{n}",
+            "ids:accessURL": {"@id": "https://connector.test/router"},
+        }],
+        "ids:created": {"@value": created},
+    }
+
+
+def raw_self_description():
+    return {
+        "@id": "urn:ids:test:connector",
+        "ids:title": [{"@value": "Test Connector"}],
+        "ids:description": [{"@value": "Test Connector"}],
+        "ids:securityProfile": {"@id": "idsc:BASE_SECURITY_PROFILE"},
+        "ids:curator": {"@id": "urn:ids:test:participant"},
+        "ids:maintainer": {"@id": "urn:ids:test:participant"},
+        "ids:hasDefaultEndpoint": {"ids:accessURL": {"@id": "https://connector.test/router"}},
+        "ids:resourceCatalog": [
+            {
+                "@id": "urn:ids:test:data-app",
+                "ids:offeredResource": [{"@id": "urn:ids:test:agent"}],
+            },
+            {
+                "@id": "urn:ids:test:resources",
+                "ids:offeredResource": [
+                    raw_resource("resources", 1, "2024-03-19T21:47:18.009Z"),
+                    raw_resource("resources", 2, "2024-03-01T10:00:00.000Z",
+                                 contract_type="ids:ContractRequest"),
+                    raw_resource("resources", 3, "2024-05-02T10:00:00.000Z",
+                                 contract_end="2024-06-01T00:00:00.000Z"),
+                ],
+            },
+            {
+                "@id": "urn:ids:test:other",
+                "ids:offeredResource": [
+                    raw_resource("other", 1, "2024-04-10T10:00:00.000Z"),
+                    raw_resource("other", 2, "2024-02-10T10:00:00.000Z"),
+                ],
+            },
+        ],
+    }
+
+
+class TestCatalogIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.self_description = SelfDescription.from_dict(raw_self_description())
+        self.index = CatalogIndex(self.self_description)
+
+    def test_index_size(self):
+        # Resources without contract offer are not indexed
+        self.assertEqual(len(self.index), 5)
+
+    def test_filter_matches_parse_catalog_artifacts(self):
+        queries = [
+            {},
+            {"catalog_id": "urn:ids:test:resources"},
+            {"catalog_id": "urn:ids:test:missing"},
+            {"resource_type": "ids:ContractRequest"},
+            {"creation_date_gt": "2024-03-01T10:00:00.000Z"},
+            {"creation_date_lt": "2024-04-10T10:00:00.000Z"},
+            {"creation_date_gt": "2024-02-01T00:00:00.000Z",
+             "creation_date_lt": "2024-04-01T00:00:00.000Z",
+             "resource_type": "ids:ContractOffer"},
+            {"return_last_artifact": True},
+            {"return_last_artifact": True, "catalog_id": "urn:ids:test:other"},
+            {"valid_contract_only": True},
+        ]
+        for query in queries:
+            with self.subTest(**query):
+                self.assertListEqual(
+                    self.index.filter(**query),
+                    TSGController.parse_catalog_artifacts(self.self_description, **query),
+                )
+
+    def test_last_artifacts(self):
+        last_artifacts = self.index.last_artifacts()
+
+        self.assertListEqual(
+            list(last_artifacts.keys()), ["urn:ids:test:resources", "urn:ids:test:other"]
+        )
+        self.assertEqual(
+            last_artifacts["urn:ids:test:other"]["id"], "urn:ids:test:other:artifacts:2"
+        )
+
+
+# Run tests
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+# flake8: noqa
+import copy
+import json
+import pickle
+import unittest
+from unittest import mock
+
+from tsg_client.controllers.SelfDescription import (
+    ContractOffer,
+    LazySelfDescription,
+    OfferedResource,
+    ResourceCatalog,
+    SelfDescription,
+)
+
+
+def raw_selfdescription(resources):
+    return {
+        "@id": "urn:ids:test:connector",
+        "ids:title": [{"@value": "Test connector"}],
+        "ids:description": [{"@value": "Test"}],
+        "ids:securityProfile": {"@id": "idsc:BASE_SECURITY_PROFILE"},
+        "ids:curator": {"@id": "urn:ids:test:curator"},
+        "ids:maintainer": {"@id": "urn:ids:test:maintainer"},
+        "ids:hasDefaultEndpoint": {"ids:accessURL": {"@id": "https://connector.test"}},
+        "ids:resourceCatalog": [
+            {"@id": "urn:ids:test:catalog", "ids:offeredResource": resources}
+        ],
+    }
+
+
+class TestSelfDescription(unittest.TestCase):
+
+    def test_contract_offer_structured(self):
+        raw_resource = {
+            "@id": "urn:ids:test:resources:1",
+            "ids:contractOffer": [{
+                "@type": "ids:ContractOffer",
+                "@id": "https://w3id.org/idsa/autogen/contractOffer/1",
+                "ids:title": [{"@value": "Participant's offer"}],
+            }],
+            "ids:representation": [{
+                "ids:instance": [{"@id": "urn:ids:test:artifacts:1"}]
+            }],
+        }
+
+        resource = OfferedResource.from_dict(raw_resource)
+
+        self.assertIsInstance(resource.contract_offer, ContractOffer)
+        self.assertEqual(resource.contract_offer["@type"], "ids:ContractOffer")
+        self.assertEqual(resource.contract_offer, raw_resource["ids:contractOffer"][0])
+        self.assertEqual(resource.artifact_id, "urn:ids:test:artifacts:1")
+
+        # Canonical (valid) JSON, computed once and cached
+        contract_offer_json = resource.contract_offer.to_json()
+        self.assertEqual(json.loads(contract_offer_json), raw_resource["ids:contractOffer"][0])
+        self.assertIs(resource.contract_offer.to_json(), contract_offer_json)
+        self.assertEqual(ContractOffer.dumps(resource.contract_offer), contract_offer_json)
+        self.assertEqual(
+            ContractOffer.dumps(raw_resource["ids:contractOffer"][0]), contract_offer_json
+        )
+
+    def test_contract_offer_compact(self):
+        offer = {
+            "@type": "ids:ContractOffer",
+            "@id": "https://w3id.org/idsa/autogen/contractOffer/1",
+            "ids:permission": [{"ids:action": [{"@id": "https://w3id.org/idsa/code/USE"}]}],
+        }
+
+        contract_offer = ContractOffer(offer)
+
+        # Only the JSON text is kept, the object tree is parsed on access
+        self.assertFalse(hasattr(contract_offer, "__dict__"))
+        self.assertIsInstance(contract_offer.to_json(), str)
+        self.assertEqual(contract_offer, ContractOffer(dict(reversed(offer.items()))))
+        self.assertEqual(contract_offer["ids:permission"], offer["ids:permission"])
+        self.assertEqual(contract_offer.to_dict(), offer)
+        self.assertEqual(pickle.loads(pickle.dumps(contract_offer)), contract_offer)
+
+    def test_resource_without_contract_offer(self):
+        resource = OfferedResource.from_dict({"@id": "urn:ids:test:agent"})
+
+        self.assertIsNone(resource.contract_offer)
+        self.assertEqual(resource.artifact_id, "urn:ids:test:agent")
+        self.assertIsNone(resource.to_dict()["contract_offer"])
+
+    def test_compact_models(self):
+        resources = [
+            {
+                "@id": f"urn:ids:test:resources:{i}",
+                "ids:created": {"@value": "2024-01-01T00:00:00.000Z"},
+                "ids:resourceEndpoint": [{
+                    "ids:accessURL": {"@id": "https://connector.test/data"},
+                    "ids:path": "/app",
+                }],
+            }
+            for i in range(2)
+        ]
+        self_description = SelfDescription.from_dict(raw_selfdescription(resources))
+        first, second = self_description.catalogs[0].offeredResource
+
+        for obj in (self_description, self_description.catalogs[0], first):
+            self.assertFalse(hasattr(obj, "__dict__"))
+        # Repeated strings are shared
+        self.assertIs(first.access_url, second.access_url)
+        self.assertEqual(first.to_dict()["access_url"], "https://connector.test/data/app")
+
+        self.assertEqual(pickle.loads(pickle.dumps(self_description)), self_description)
+        self.assertEqual(copy.deepcopy(self_description), self_description)
+        self.assertIsInstance(self_description.catalogs[0], ResourceCatalog)
+
+    def test_lazy_selfdescription(self):
+        resources = [
+            {"@id": "urn:ids:test:resources:1"},
+            {"@id": "urn:ids:test:resources:2"},
+        ]
+        raw = raw_selfdescription(resources)
+
+        with mock.patch.object(OfferedResource, "from_dict", wraps=OfferedResource.from_dict) as from_dict:
+            lazy = LazySelfDescription.from_dict(raw)
+            self.assertIsInstance(lazy, SelfDescription)
+            self.assertEqual(lazy.endpoints, "https://connector.test")
+            catalog = lazy.catalogs[0]
+            self.assertEqual(catalog.id, "urn:ids:test:catalog")
+            from_dict.assert_not_called()
+
+            self.assertEqual(len(catalog.offeredResource), 2)
+            self.assertIs(lazy.catalogs[0].offeredResource, catalog.offeredResource)
+            self.assertEqual(from_dict.call_count, 2)
+
+        self.assertEqual(lazy.to_dict(), SelfDescription.from_dict(raw).to_dict())
+        self.assertEqual(pickle.loads(pickle.dumps(lazy)), lazy)
+
+        with self.assertRaises(ValueError):
+            LazySelfDescription.from_dict({**raw, "ids:title": []})
+        broken = LazySelfDescription.from_dict(raw_selfdescription([{}]))
+        with self.assertRaises(ValueError):
+            broken.catalogs[0].offeredResource
+
+
+# Run tests
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,23 @@
 # flake8: noqa
+import io
+import sys
+import json
+import time
+import threading
 import unittest
 
+from types import SimpleNamespace
+from unittest import mock
+
+import requests
+
 from dotenv import dotenv_values
 from tsg_client.controllers import TSGController
+from tsg_client.controllers.Endpoints import Endpoints
+from tsg_client.controllers.RequestController import RequestController
 from tsg_client.controllers.SelfDescription import SelfDescription
+from tsg_client.utils.deadline import check_deadline, remaining
+from tsg_client.utils.transport import Transport
 
 
 class TestTSGController(unittest.TestCase):
@@ -346,18 +360,35 @@ class TestTSGController(unittest.TestCase):
         expected_parsing = [
             {
                 'id': 'urn:ids:enershare:connectors:connector-02:artifacts:61bb4fd2-896e-44bb-9326-d0944c266b01',
-                'contract_offer': "{'@type': 'ids:ContractOffer', '@id': "
-                                  "'https://w3id.org/idsa/autogen/contractOffer/85d11dd0-7402-4503-ae16-6b29c5e3e0d7"
-                                  "', 'ids:permission': [{'@type': 'ids:Permission', "
-                                  "'@id': 'https://w3id.org/idsa/autogen/permission/5c469d0a-0455-43cf-a714"
-                                  "-825c0d9e967d', 'ids:target': {'@id': "
-                                  "'urn:ids:enershare:connectors:connector-02:artifacts:61bb4fd2-896e-44bb-9326"
-                                  "-d0944c266b01'}, 'ids:action': [{'@id': 'https://w3id.org/idsa/code/READ'}, "
-                                  "{'@id': 'https://w3id.org/idsa/code/USE'}]}], 'ids:contractStart': {'@value': "
-                                  "'2024-01-01T00:00:00.000Z', '@type': "
-                                  "'http://www.w3.org/2001/XMLSchema#dateTimeStamp'}, 'ids:contractEnd': {'@value': "
-                                  "'2024-12-31T00:00:00.000Z', '@type': "
-                                  "'http://www.w3.org/2001/XMLSchema#dateTimeStamp'}}",
+                'contract_offer': {
+                    "@type": "ids:ContractOffer",
+                    "@id": "https://w3id.org/idsa/autogen/contractOffer/85d11dd0-7402-4503-ae16-6b29c5e3e0d7",
+                    "ids:permission": [
+                        {
+                            "@type": "ids:Permission",
+                            "@id": "https://w3id.org/idsa/autogen/permission/5c469d0a-0455-43cf-a714-825c0d9e967d",
+                            "ids:target": {
+                                "@id": "urn:ids:enershare:connectors:connector-02:artifacts:61bb4fd2-896e-44bb-9326-d0944c266b01"
+                            },
+                            "ids:action": [
+                                {
+                                    "@id": "https://w3id.org/idsa/code/READ"
+                                },
+                                {
+                                    "@id": "https://w3id.org/idsa/code/USE"
+                                }
+                            ]
+                        }
+                    ],
+                    "ids:contractStart": {
+                        "@value": "2024-01-01T00:00:00.000Z",
+                        "@type": "http://www.w3.org/2001/XMLSchema#dateTimeStamp"
+                    },
+                    "ids:contractEnd": {
+                        "@value": "2024-12-31T00:00:00.000Z",
+                        "@type": "http://www.w3.org/2001/XMLSchema#dateTimeStamp"
+                    }
+                },
                 'artifact_created': '2024-03-19T21:47:18.009Z',
                 'access_url': 'https://connector-02.enershare.inesctec.pt/router/artifacts/urn%3Aids%3Aenershare'
                               '%3Aconnectors%3Aconnector-02%3Aresources%3A8436fba4-e2d2-4419-b5f9-4714326f63c4',
@@ -366,18 +397,35 @@ class TestTSGController(unittest.TestCase):
             },
             {
                 'id': 'urn:ids:enershare:connectors:connector-02:artifacts:302e1c0b-b18c-4e20-ad3c-abc3606d0801',
-                'contract_offer': "{'@type': 'ids:ContractOffer', '@id': "
-                                  "'https://w3id.org/idsa/autogen/contractOffer/038d749e-34e6-4f49-84c5-de9f46acdf2c"
-                                  "', 'ids:permission': [{'@type': 'ids:Permission', "
-                                  "'@id': 'https://w3id.org/idsa/autogen/permission/d8607d1d-8fc1-487f-af84"
-                                  "-3c7d5efc3f25', 'ids:target': {'@id': "
-                                  "'urn:ids:enershare:connectors:connector-02:artifacts:302e1c0b-b18c-4e20-ad3c"
-                                  "-abc3606d0801'}, 'ids:action': [{'@id': 'https://w3id.org/idsa/code/READ'}, "
-                                  "{'@id': 'https://w3id.org/idsa/code/USE'}]}], 'ids:contractStart': {'@value': "
-                                  "'2024-01-01T00:00:00.000Z', '@type': "
-                                  "'http://www.w3.org/2001/XMLSchema#dateTimeStamp'}, 'ids:contractEnd': {'@value': "
-                                  "'2024-12-31T00:00:00.000Z', '@type': "
-                                  "'http://www.w3.org/2001/XMLSchema#dateTimeStamp'}}",
+                'contract_offer': {
+                    "@type": "ids:ContractOffer",
+                    "@id": "https://w3id.org/idsa/autogen/contractOffer/038d749e-34e6-4f49-84c5-de9f46acdf2c",
+                    "ids:permission": [
+                        {
+                            "@type": "ids:Permission",
+                            "@id": "https://w3id.org/idsa/autogen/permission/d8607d1d-8fc1-487f-af84-3c7d5efc3f25",
+                            "ids:target": {
+                                "@id": "urn:ids:enershare:connectors:connector-02:artifacts:302e1c0b-b18c-4e20-ad3c-abc3606d0801"
+                            },
+                            "ids:action": [
+                                {
+                                    "@id": "https://w3id.org/idsa/code/READ"
+                                },
+                                {
+                                    "@id": "https://w3id.org/idsa/code/USE"
+                                }
+                            ]
+                        }
+                    ],
+                    "ids:contractStart": {
+                        "@value": "2024-01-01T00:00:00.000Z",
+                        "@type": "http://www.w3.org/2001/XMLSchema#dateTimeStamp"
+                    },
+                    "ids:contractEnd": {
+                        "@value": "2024-12-31T00:00:00.000Z",
+                        "@type": "http://www.w3.org/2001/XMLSchema#dateTimeStamp"
+                    }
+                },
                 'artifact_created': '2024-03-19T21:47:30.109Z',
                 'access_url': 'https://connector-02.enershare.inesctec.pt/router/artifacts/urn%3Aids%3Aenershare'
                               '%3Aconnectors%3Aconnector-02%3Aresources%3A6fa1d16d-8f86-412b-a366-12950e3dcfa7',
@@ -386,18 +434,35 @@ class TestTSGController(unittest.TestCase):
             },
             {
                 'id': 'urn:ids:enershare:connectors:connector-02:artifacts:22e87052-c02a-4efc-b9a3-cc10a70184af',
-                'contract_offer': "{'@type': 'ids:ContractOffer', '@id': "
-                                  "'https://w3id.org/idsa/autogen/contractOffer/bc1921f9-275c-462d-add1-bfa2fc209874"
-                                  "', 'ids:permission': [{'@type': 'ids:Permission', "
-                                  "'@id': 'https://w3id.org/idsa/autogen/permission/96aff7c9-7c66-455c-8d5f"
-                                  "-fb753e2b26e0', 'ids:target': {'@id': "
-                                  "'urn:ids:enershare:connectors:connector-02:artifacts:22e87052-c02a-4efc-b9a3"
-                                  "-cc10a70184af'}, 'ids:action': [{'@id': 'https://w3id.org/idsa/code/READ'}, "
-                                  "{'@id': 'https://w3id.org/idsa/code/USE'}]}], 'ids:contractStart': {'@value': "
-                                  "'2024-01-01T00:00:00.000Z', '@type': "
-                                  "'http://www.w3.org/2001/XMLSchema#dateTimeStamp'}, 'ids:contractEnd': {'@value': "
-                                  "'2024-12-31T00:00:00.000Z', '@type': "
-                                  "'http://www.w3.org/2001/XMLSchema#dateTimeStamp'}}",
+                'contract_offer': {
+                    "@type": "ids:ContractOffer",
+                    "@id": "https://w3id.org/idsa/autogen/contractOffer/bc1921f9-275c-462d-add1-bfa2fc209874",
+                    "ids:permission": [
+                        {
+                            "@type": "ids:Permission",
+                            "@id": "https://w3id.org/idsa/autogen/permission/96aff7c9-7c66-455c-8d5f-fb753e2b26e0",
+                            "ids:target": {
+                                "@id": "urn:ids:enershare:connectors:connector-02:artifacts:22e87052-c02a-4efc-b9a3-cc10a70184af"
+                            },
+                            "ids:action": [
+                                {
+                                    "@id": "https://w3id.org/idsa/code/READ"
+                                },
+                                {
+                                    "@id": "https://w3id.org/idsa/code/USE"
+                                }
+                            ]
+                        }
+                    ],
+                    "ids:contractStart": {
+                        "@value": "2024-01-01T00:00:00.000Z",
+                        "@type": "http://www.w3.org/2001/XMLSchema#dateTimeStamp"
+                    },
+                    "ids:contractEnd": {
+                        "@value": "2024-12-31T00:00:00.000Z",
+                        "@type": "http://www.w3.org/2001/XMLSchema#dateTimeStamp"
+                    }
+                },
                 'artifact_created': '2024-03-19T21:47:41.819Z',
                 'access_url': 'https://connector-02.enershare.inesctec.pt/router/artifacts/urn%3Aids%3Aenershare'
                               '%3Aconnectors%3Aconnector-02%3Aresources%3A0631c904-94b8-43fc-84ad-2185f37a6d25',
@@ -411,6 +476,344 @@ class TestTSGController(unittest.TestCase):
         for expected_item, actual_item in zip(expected_parsing, artifacts):
             self.assertDictEqual(expected_item, actual_item)
 
+    def test_iter_catalog_artifacts(self):
+        def resource(i, created="2024-03-19T21:47:18.009Z"):
+            return {
+                "@id": f"urn:ids:test:resources:{i}",
+                "ids:created": {"@value": created},
+                "ids:contractOffer": [{"@type": "ids:ContractOffer", "@id": "urn:ids:test:offer"}],
+                "ids:representation": [{"ids:instance": [{"@id": "urn:ids:test:artifacts:same"}]}],
+            }
+
+        self_description = SelfDescription.from_dict({
+            "@id": "urn:ids:test:connector",
+            "ids:title": [{"@value": "Test connector"}],
+            "ids:description": [{"@value": "Test"}],
+            "ids:securityProfile": {"@id": "idsc:BASE_SECURITY_PROFILE"},
+            "ids:curator": {"@id": "urn:ids:test:curator"},
+            "ids:maintainer": {"@id": "urn:ids:test:maintainer"},
+            "ids:hasDefaultEndpoint": {"ids:accessURL": {"@id": "https://connector.test"}},
+            "ids:resourceCatalog": [
+                # Same artifact offered twice: only the last resource is the last artifact
+                {"@id": "urn:ids:test:catalog:1", "ids:offeredResource": [resource(1), resource(1), resource(2)]},
+                {"@id": "urn:ids:test:catalog:2", "ids:offeredResource": [resource(3, "2024-01-01T00:00:00.000Z")]},
+            ],
+        })
+
+        artifacts = TSGController.iter_catalog_artifacts(self_description)
+        self.assertEqual(next(artifacts)["id"], "urn:ids:test:artifacts:same")
+        self.assertEqual(len(list(artifacts)), 3)
+
+        self.assertEqual(len(TSGController.parse_catalog_artifacts(self_description, limit=2)), 2)
+        self.assertEqual(TSGController.parse_catalog_artifacts(self_description, limit=0), [])
+        self.assertEqual(
+            len(TSGController.parse_catalog_artifacts(self_description, return_last_artifact=True)), 2
+        )
+        self.assertEqual(
+            len(TSGController.parse_catalog_artifacts(
+                self_description,
+                return_last_artifact=True,
+                creation_date_gt="2024-02-01T00:00:00.000Z",
+            )),
+            1,
+        )
+
+    def download_controller(self, request_data_artifact):
+        # Fake TSGController (agreements for every artifact but "missing")
+        tsg = TSGController.__new__(TSGController)
+
+        def request_agreement(connector_id, artifact_access_url, artifact_contract_offer):
+            if artifact_access_url.endswith("missing"):
+                raise Exception("Expected status_code 200 but got 500")
+            return "urn:ids:test:agreement"
+
+        tsg.request_agreement = request_agreement
+        tsg.request_data_artifact = request_data_artifact
+        return tsg
+
+    @staticmethod
+    def download_artifact(artifact_id):
+        return {
+            "id": artifact_id,
+            "access_url": f"https://provider.test/router/artifacts/{artifact_id}",
+            "contract_offer": {"@type": "ids:ContractOffer"},
+        }
+
+    def test_download_artifacts_partial_failure(self):
+
+        def request_data_artifact(artifact_id, contract_agreement_id, file_path, **kwargs):
+            if artifact_id == "broken":
+                raise ValueError("Connection reset")
+            return {"file_path": f"{file_path}/{artifact_id}", "bytes_written": 8}
+
+        tsg = self.download_controller(request_data_artifact)
+        manifest = tsg.download_artifacts(
+            [self.download_artifact(a) for a in ("1", "missing", "broken", "2")],
+            connector_id="urn:ids:test:provider",
+            agent_id="",
+            file_path="files",
+        )
+
+        # One entry per artifact, in the same order
+        self.assertEqual([entry["id"] for entry in manifest], ["1", "missing", "broken", "2"])
+        self.assertEqual(
+            [entry["status"] for entry in manifest], ["success", "error", "error", "success"]
+        )
+        self.assertEqual(manifest[0]["contract_agreement_id"], "urn:ids:test:agreement")
+        self.assertEqual(manifest[0]["result"], {"file_path": "files/1", "bytes_written": 8})
+        self.assertIsNone(manifest[1]["contract_agreement_id"])
+        self.assertIn("500", manifest[1]["error"])
+        self.assertEqual(manifest[2]["contract_agreement_id"], "urn:ids:test:agreement")
+        self.assertIsNone(manifest[2]["result"])
+        self.assertIn("Connection reset", manifest[2]["error"])
+        self.assertTrue(all(entry["elapsed_seconds"] >= 0 for entry in manifest))
+
+    def test_download_artifacts_max_workers(self):
+        lock = threading.Lock()
+        running = [0]
+        peak = [0]
+
+        def request_data_artifact(artifact_id, **kwargs):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+            return {"bytes_written": 0}
+
+        tsg = self.download_controller(request_data_artifact)
+        manifest = tsg.download_artifacts(
+            [self.download_artifact(str(i)) for i in range(12)],
+            connector_id="urn:ids:test:provider",
+            agent_id="",
+            file_path="files",
+            max_workers=3,
+        )
+
+        self.assertEqual([entry["status"] for entry in manifest], ["success"] * 12)
+        # Concurrent, but never more than max_workers downloads at once
+        self.assertEqual(peak[0], 3)
+
+    def test_publish_data_artifact(self):
+        sent = []
+
+        class ConnectorSession:
+            def request(self, method, url, data=None, headers=None, **kwargs):
+                sent.append((url, data, headers))
+                response = requests.Response()
+                response.status_code = 200
+                response._content = b'{"@id": "urn:ids:test:artifacts:new"}'
+                response.headers["Content-Type"] = "application/json"
+                response.raw = io.BytesIO(response._content)
+                return response
+
+        tsg = TSGController.__new__(TSGController)
+        tsg.endpoints = Endpoints()
+        tsg.compress_uploads = False
+        tsg.controller = RequestController(
+            base_url="https://connector.test", api_key="key", connector_id="id"
+        )
+        tsg.controller.session = ConnectorSession()
+
+        tsg.publish_data_artifact(
+            artifact_file=io.BytesIO(b"a,b\n1,2\n"),
+            title="Test",
+            description="Test artifact",
+            contract_offer='{"@type": "ids:ContractOffer"}',
+            catalog_id="urn:ids:test:catalog",
+        )
+
+        # Catalog link posted as JSON (as AsyncTSGController.publish_data_artifact)
+        url, data, headers = sent[-1]
+        self.assertEqual(url, "https://connector.test/api/resources/urn:ids:test:catalog")
+        self.assertEqual(headers["Content-type"], "application/json")
+        self.assertEqual(json.loads(data), {"@id": "urn:ids:test:artifacts:new"})
+
+    def crawl_controller(self, fetch):
+        # Fake TSGController (fetch replaces the self-description requests)
+        tsg = TSGController.__new__(TSGController)
+        tsg.get_connector_selfdescription = fetch
+        return tsg
+
+    def test_crawl_selfdescriptions(self):
+        self_description = SelfDescription.__new__(SelfDescription)
+        deadlines = []
+
+        def fetch(access_url, agent_id, connector_id, timeout):
+            deadlines.append(remaining())
+            if access_url == "https://offline.test":
+                raise ValueError("Bad gateway")
+            return self_description
+
+        tsg = self.crawl_controller(fetch)
+        results = list(tsg.crawl_selfdescriptions(
+            ["https://provider.test", "https://offline.test"], timeout=5
+        ))
+
+        # Failed connectors are skipped
+        self.assertEqual(
+            [(c["access_url"], sd) for c, sd in results],
+            [("https://provider.test", self_description)],
+        )
+        # Each connector runs under its own deadline
+        self.assertEqual(len(deadlines), 2)
+        self.assertTrue(all(0 < left <= 5 for left in deadlines))
+
+    def test_crawl_selfdescriptions_timeout(self):
+        self_description = SelfDescription.__new__(SelfDescription)
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def fetch(access_url, agent_id, connector_id, timeout):
+            if access_url == "https://slow.test":
+                # Body read in chunks (the deadline is checked per chunk)
+                while True:
+                    time.sleep(0.01)
+                    check_deadline()
+            if access_url == "https://stalled.test":
+                # Stalled socket (the requests timeout is per read)
+                release.wait(5)
+            return self_description
+
+        tsg = self.crawl_controller(fetch)
+        start = time.monotonic()
+        results = list(tsg.crawl_selfdescriptions(
+            ["https://slow.test", "https://stalled.test", "https://provider.test"],
+            timeout=0.2,
+        ))
+
+        # Total time per connector, not per socket read
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertEqual([c["access_url"] for c, _ in results], ["https://provider.test"])
+
+    def test_crawl_selfdescriptions_cancel(self):
+        self_description = SelfDescription.__new__(SelfDescription)
+        fetched = []
+
+        def fetch(access_url, agent_id, connector_id, timeout):
+            fetched.append(access_url)
+            time.sleep(0.05)
+            return self_description
+
+        tsg = self.crawl_controller(fetch)
+        crawl = tsg.crawl_selfdescriptions(
+            [f"https://provider-{i}.test" for i in range(10)], max_workers=1
+        )
+        next(crawl)
+        crawl.close()
+        time.sleep(0.2)
+
+        # Pending requests are cancelled when the generator is closed
+        self.assertLess(len(fetched), 10)
+
+    def test_get_openapi_specs(self):
+        self_description = SimpleNamespace(
+            id="urn:ids:test:provider",
+            catalogs=[SimpleNamespace(
+                id="urn:ids:test:provider:data-app",
+                offeredResource=[SimpleNamespace(
+                    path="/agent/0.9.2",
+                    documentation="https://provider.test/openapi.json",
+                )],
+            )],
+        )
+
+        class OpenAPISession:
+            def request(self, method, url, **kwargs):
+                response = requests.Response()
+                response.status_code = 200
+                response._content = b'{"paths": {"/forecast": {}}}'
+                return response
+
+        controller = RequestController(
+            base_url="https://connector.test", api_key="key", connector_id="id"
+        )
+        controller.session = OpenAPISession()
+
+        # Static call (through the controller session, if given)
+        specs = TSGController.get_openapi_specs(
+            self_description, "0.9.2", controller=controller
+        )
+
+        self.assertEqual(specs, [{
+            "api_version": "0.9.2",
+            "agent": "agent",
+            "path": "agent",
+            "openapi_url": "https://provider.test/openapi.json",
+            "endpoints": ["/forecast"],
+        }])
+
+        # Without a controller: module-level pooled session, default timeout
+        session = OpenAPISession()
+        sent = []
+        request = session.request
+        session.request = lambda method, url, **kwargs: sent.append(kwargs) or request(method, url)
+        module = sys.modules[TSGController.__module__]
+        with mock.patch.object(module, "_DEFAULT_SESSION", session):
+            specs = TSGController.get_openapi_specs(self_description, "0.9.2")
+
+        self.assertEqual(specs[0]["endpoints"], ["/forecast"])
+        self.assertEqual(sent[0]["timeout"], module.DEFAULT_TIMEOUT)
+
+    def test_close(self):
+        closed = []
+
+        class ClosingTransport(Transport):
+            def request(self, method, url, **kwargs):
+                raise AssertionError("no requests expected")
+
+            def close(self):
+                closed.append(self)
+
+        tsg = TSGController.__new__(TSGController)
+        tsg.refresher = None
+        tsg.controller = RequestController(
+            base_url="https://connector.test",
+            api_key="key",
+            connector_id="id",
+            transport=ClosingTransport(),
+        )
+
+        with tsg:
+            pass
+
+        self.assertEqual(closed, [tsg.controller.transport])
+
+    def test_parse_broker_connectors(self):
+        broker_connectors = [
+            {
+                "@id": "urn:ids:enershare:connectors:connector-02",
+                "ids:hasEndpoint": [{
+                    "ids:accessURL": {
+                        "@id": "https://connector-02.enershare.inesctec.pt/router"
+                    }
+                }],
+                "ids:maintainer": {
+                    "@id": "urn:ids:enershare:participants:INESCTEC"
+                }
+            },
+            {
+                "@id": "urn:ids:enershare:connectors:no-endpoint",
+            },
+            "https://connector-03.enershare.inesctec.pt",
+        ]
+
+        connectors = TSGController.parse_broker_connectors(broker_connectors)
+
+        self.assertListEqual(connectors, [
+            {
+                "connector_id": "urn:ids:enershare:connectors:connector-02",
+                "access_url": "https://connector-02.enershare.inesctec.pt",
+                "agent_id": "urn:ids:enershare:participants:INESCTEC"
+            },
+            {
+                "connector_id": "",
+                "access_url": "https://connector-03.enershare.inesctec.pt",
+                "agent_id": ""
+            },
+        ])
+
 
 # Run tests
 if __name__ == '__main__':
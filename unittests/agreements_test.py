@@ -0,0 +1,57 @@
+# flake8: noqa
+import os
+import tempfile
+import unittest
+
+from tsg_client.controllers.SelfDescription import ContractOffer
+from tsg_client.utils.agreements import AgreementStore
+
+
+def contract_offer(contract_end):
+    return {
+        "@type": "ids:ContractOffer",
+        "@id": "https://w3id.org/idsa/autogen/contractOffer/1",
+        "ids:contractStart": {"@value": "2024-01-01T00:00:00.000Z"},
+        "ids:contractEnd": {"@value": contract_end},
+    }
+
+
+class TestAgreementStore(unittest.TestCase):
+
+    def test_get_put(self):
+        store = AgreementStore()
+        offer = contract_offer("2099-12-31T00:00:00.000Z")
+
+        self.assertIsNone(store.get("urn:connector", "https://access/url", offer))
+
+        store.put("urn:connector", "https://access/url", offer, {"@id": "urn:agreement:1"})
+
+        # Same offer, regardless of its representation
+        self.assertEqual(store.get("urn:connector", "https://access/url", offer), "urn:agreement:1")
+        self.assertEqual(
+            store.get("urn:connector", "https://access/url", ContractOffer(offer).to_json()),
+            "urn:agreement:1",
+        )
+        self.assertIsNone(store.get("urn:connector", "https://other/url", offer))
+
+    def test_expired_agreement(self):
+        store = AgreementStore()
+        offer = contract_offer("2020-12-31T00:00:00.000Z")
+
+        store.put("urn:connector", "https://access/url", offer, "urn:agreement:1")
+
+        self.assertIsNone(store.get("urn:connector", "https://access/url", offer))
+
+    def test_sqlite_persistence(self):
+        offer = contract_offer("2099-12-31T00:00:00.000Z")
+        with tempfile.TemporaryDirectory() as path:
+            db_path = os.path.join(path, "agreements.db")
+            AgreementStore(db_path).put("urn:connector", "https://access/url", offer, "urn:agreement:1")
+
+            store = AgreementStore(db_path)
+            self.assertEqual(store.get("urn:connector", "https://access/url", offer), "urn:agreement:1")
+
+
+# Run tests
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+# flake8: noqa
+import os
+import json
+import tempfile
+import unittest
+
+from helpers import FakeSession, make_controller, make_response
+from tsg_client.utils.cache import DiskCacheBackend, MemoryCacheBackend, ResponseCache
+
+
+def content(response):
+    return response.content
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = ResponseCache(ttl=60)
+        self.controller = make_controller(cache=self.cache)
+
+    def test_fresh_response_from_cache(self):
+        self.controller.session = FakeSession([make_response()])
+
+        first = self.controller.get("selfdescription", expected_status_code=200, cache=True)
+        second = self.controller.get("selfdescription", expected_status_code=200, cache=True)
+
+        self.assertIs(first, second)
+        self.assertEqual(len(self.controller.session.requests), 1)
+
+    def test_not_cached_by_default(self):
+        # Live data (e.g., data app requests, offers) is never cached
+        self.controller.session = FakeSession([make_response(), make_response()])
+
+        first = self.controller.get("api/pap/offers", expected_status_code=200)
+        second = self.controller.get("api/pap/offers", expected_status_code=200)
+
+        self.assertIsNot(first, second)
+        self.assertEqual(len(self.controller.session.requests), 2)
+
+    def test_invalidated_by_unsafe_methods(self):
+        self.controller.session = FakeSession([
+            make_response(content=b'[{"@id": "1"}]'),
+            make_response(),
+            make_response(content=b"[]"),
+            make_response(status_code=500, content=b"{}"),
+            make_response(content=b'[{"@id": "2"}]'),
+        ])
+        resources = lambda: self.controller.get("api/resources", cache=True).json()
+
+        self.assertEqual(resources(), [{"@id": "1"}])
+        # Deleting a resource drops the cached collection
+        self.controller.delete("api/resources/1", expected_status_code=200)
+        self.assertEqual(resources(), [])
+        self.assertEqual(resources(), [])
+        # Failed requests do not
+        self.controller.post("api/resources", data="{}")
+        self.assertEqual(resources(), [])
+        self.assertEqual(len(self.controller.session.requests), 4)
+
+    def test_revalidation(self):
+        self.controller.session = FakeSession([
+            make_response(headers={"ETag": '"v1"'}),
+            make_response(status_code=304, content=b""),
+        ])
+        parser = lambda rsp: rsp.json()["@id"]
+        # Cached responses expire immediately
+        self.cache.ttl = 0
+
+        first = self.controller.get_parsed("selfdescription", parser)
+        second = self.controller.get_parsed("selfdescription", parser)
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.controller.session.requests[1]["headers"]["If-None-Match"], '"v1"')
+        # The controller default headers are not changed by revalidation
+        self.assertNotIn("If-None-Match", self.controller.headers)
+
+    def test_parsed_object_reused(self):
+        self.controller.session = FakeSession([make_response()])
+        calls = []
+
+        def parser(rsp):
+            calls.append(rsp)
+            return rsp.json()
+
+        first = self.controller.get_parsed("selfdescription", parser)
+        second = self.controller.get_parsed("selfdescription", parser)
+
+        self.assertIs(first, second)
+        self.assertEqual(len(calls), 1)
+
+    def test_memory_backend_lru_eviction(self):
+        cache = ResponseCache(ttl=60, backend=MemoryCacheBackend(max_size=60))
+        for key in ("a", "b", "c"):
+            cache.set(key, make_response(content=b"x" * 20))
+        cache.get("a")
+        cache.set("d", make_response(content=b"x" * 20))
+
+        self.assertIsNone(cache.get("b"))
+        for key in ("a", "c", "d"):
+            self.assertIsNotNone(cache.get(key))
+
+    def test_disk_backend(self):
+        with tempfile.TemporaryDirectory() as directory:
+            ResponseCache(backend=DiskCacheBackend(directory)).set("a", make_response())
+
+            entry = ResponseCache(backend=DiskCacheBackend(directory)).get("a")
+
+            self.assertEqual(entry.response.json(), {"@id": "urn:ids:test"})
+            self.assertTrue(entry.is_fresh)
+
+    def test_disk_backend_format(self):
+        response = make_response(
+            content=b"\x00binary\ncontent", headers={"ETag": '"v1"', "Content-Type": "text/csv"}
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ResponseCache(backend=DiskCacheBackend(directory))
+            version = cache.set("a", response).version
+
+            # JSON metadata line, then the raw content (no pickle)
+            with open(os.path.join(directory, "a.cache"), "rb") as cache_file:
+                metadata = json.loads(cache_file.readline())
+                self.assertEqual(cache_file.read(), b"\x00binary\ncontent")
+            self.assertEqual(metadata["status_code"], 200)
+
+            entry = ResponseCache(backend=DiskCacheBackend(directory)).get("a")
+            self.assertEqual(entry.response.content, b"\x00binary\ncontent")
+            self.assertEqual(entry.response.headers["content-type"], "text/csv")
+            self.assertEqual(entry.conditional_headers, {"If-None-Match": '"v1"'})
+            self.assertEqual(entry.version, version)
+
+            # Unreadable files are dropped
+            with open(os.path.join(directory, "a.cache"), "wb") as cache_file:
+                cache_file.write(b"\x80\x04not json")
+            self.assertIsNone(ResponseCache(backend=DiskCacheBackend(directory)).get("a"))
+            self.assertFalse(os.path.exists(os.path.join(directory, "a.cache")))
+
+    def test_parsed_objects_bounded(self):
+        cache = ResponseCache(ttl=60, max_parsed_size=50)
+        for key in ("a", "b", "c"):
+            cache.set(key, make_response(content=b"x" * 20))
+            cache.parse(cache.get(key).response, content)
+
+        # Bounded by the size of the responses they come from
+        self.assertEqual(len(cache._parsed), 2)
+        self.assertLessEqual(cache._parsed_size, 50)
+
+        # Objects parsed from replaced responses are dropped
+        cache.set("c", make_response(content=b"y" * 20))
+        self.assertEqual(len(cache._parsed), 1)
+        self.assertEqual(cache.parse(cache.get("c").response, content), b"y" * 20)
+
+
+# Run tests
+if __name__ == '__main__':
+    unittest.main()
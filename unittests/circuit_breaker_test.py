@@ -0,0 +1,133 @@
+# flake8: noqa
+import time
+import asyncio
+import unittest
+
+import httpx
+import requests
+
+from helpers import (
+    FakeSession,
+    SlowSession,
+    make_async_controller,
+    make_controller,
+    make_response,
+)
+from tsg_client.utils.deadline import DeadlineExceeded, deadline
+from tsg_client.utils.rate_limit import RateLimiter
+from tsg_client.utils.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def setUp(self):
+        self.breaker = CircuitBreaker(
+            failure_threshold=3, recovery_timeout=0.05, probe_interval=0.05
+        )
+        self.controller = make_controller(circuit_breaker=self.breaker)
+        # Connector down until told otherwise
+        self.controller.session = FakeSession(
+            default=requests.exceptions.ConnectionError("connector down")
+        )
+        self.params = {"accessUrl": "https://remote.test/router"}
+
+    def get(self):
+        return self.controller.get("api/description", params=self.params)
+
+    def test_open_after_consecutive_failures(self):
+        for _ in range(3):
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                self.get()
+
+        self.assertEqual(self.breaker.state("https://remote.test"), OPEN)
+        with self.assertRaises(CircuitOpenError):
+            self.get()
+        self.assertEqual(self.controller.session.calls, 3)
+        # Other connectors are not affected
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.controller.get("api/description", params={"accessUrl": "https://other.test"})
+        self.assertEqual(self.controller.session.calls, 4)
+
+    def test_half_open_probe(self):
+        for _ in range(3):
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                self.get()
+        time.sleep(0.06)
+
+        # Failed probe: open again
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.get()
+        self.assertEqual(self.breaker.state("https://remote.test"), OPEN)
+        with self.assertRaises(CircuitOpenError):
+            self.get()
+
+        # Successful probe: closed
+        time.sleep(0.06)
+        self.controller.session.default = make_response(content=b"{}")
+        self.get()
+        self.assertEqual(self.breaker.state("https://remote.test"), CLOSED)
+
+    def test_local_deadline_not_a_peer_failure(self):
+        breaker = CircuitBreaker(failure_threshold=2)
+        limiter = RateLimiter(adaptive=True, initial_concurrency=4)
+        self.controller.circuit_breaker = breaker
+        self.controller.rate_limiter = limiter
+
+        # Expired before the request is sent
+        for _ in range(3):
+            with deadline(0):
+                with self.assertRaises(DeadlineExceeded):
+                    self.get()
+        # Ran out while waiting for the (slow) peer
+        self.controller.session = SlowSession()
+        for _ in range(2):
+            with deadline(0.02):
+                with self.assertRaises(DeadlineExceeded):
+                    self.get()
+
+        self.assertEqual(breaker.state("https://remote.test"), CLOSED)
+        self.assertEqual(limiter.stats()["https://remote.test"], {"limit": 4, "inflight": 0})
+
+    def test_async_local_deadline_not_a_peer_failure(self):
+        breaker = CircuitBreaker(failure_threshold=2)
+        limiter = RateLimiter(adaptive=True, initial_concurrency=4)
+
+        async def main():
+            controller = await make_async_controller(
+                lambda request: httpx.Response(200, json={}),
+                circuit_breaker=breaker,
+                rate_limiter=limiter,
+            )
+            try:
+                for _ in range(3):
+                    with deadline(0):
+                        with self.assertRaises(DeadlineExceeded):
+                            await controller.get("api/description", params=self.params)
+                await controller.get("api/description", params=self.params)
+            finally:
+                await controller.aclose()
+
+        asyncio.run(main())
+
+        self.assertEqual(breaker.state("https://remote.test"), CLOSED)
+        self.assertEqual(limiter.stats()["https://remote.test"]["inflight"], 0)
+
+    def test_single_probe_while_half_open(self):
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0, probe_interval=10)
+        breaker.record("peer", ok=False)
+
+        breaker.before("peer")
+        self.assertEqual(breaker.state("peer"), HALF_OPEN)
+        with self.assertRaises(CircuitOpenError):
+            breaker.before("peer")
+
+
+# Run tests
+if __name__ == '__main__':
+    unittest.main()
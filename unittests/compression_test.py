@@ -0,0 +1,83 @@
+# flake8: noqa
+import gzip
+import io
+import unittest
+
+import httpx
+
+from helpers import FakeSession, make_async_controller, make_controller, make_response
+
+PAYLOAD = {"title": "artifact", "description": "https://w3id.org/idsa/core/" * 100}
+
+
+class TestCompression(unittest.TestCase):
+
+    def setUp(self):
+        self.controller = make_controller()
+
+    def test_accept_encoding(self):
+        self.assertIn("gzip", self.controller.session.headers["Accept-Encoding"])
+
+    def test_compressed_upload(self):
+        self.controller.session = FakeSession([make_response(content=b"{}")])
+
+        self.controller.post(
+            "api/artifacts/provider",
+            data=PAYLOAD,
+            files={"artifact": io.BytesIO(b"a,b\n1,2\n")},
+            compress=True,
+        )
+
+        sent = self.controller.session.requests[0]
+        self.assertEqual(sent["headers"]["Content-Encoding"], "gzip")
+        self.assertTrue(sent["headers"]["Content-Type"].startswith("multipart/form-data"))
+        self.assertIn(b'name="artifact"', gzip.decompress(sent["data"]))
+        self.assertIsNone(sent.get("files"))
+
+    def test_small_body_not_compressed(self):
+        self.controller.session = FakeSession([make_response(content=b"{}")])
+
+        self.controller.post("api/artifacts/provider", data={"title": "a"}, compress=True)
+
+        self.assertNotIn("Content-Encoding", self.controller.session.requests[0]["headers"])
+
+    def test_unsupported_media_type_fallback(self):
+        self.controller.session = FakeSession([
+            make_response(status_code=415, content=b""),
+            make_response(content=b"{}"),
+            make_response(content=b"{}"),
+        ])
+
+        rsp = self.controller.post("api/artifacts/provider", data=PAYLOAD, compress=True)
+        self.assertEqual(rsp.status_code, 200)
+        self.controller.post("api/artifacts/provider", data=PAYLOAD, compress=True)
+
+        first, fallback, second = self.controller.session.requests
+        self.assertEqual(first["headers"]["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(first["data"]), fallback["data"])
+        # The origin is not sent compressed bodies anymore
+        self.assertNotIn("Content-Encoding", fallback["headers"])
+        self.assertNotIn("Content-Encoding", second["headers"])
+
+
+class TestAsyncCompression(unittest.IsolatedAsyncioTestCase):
+
+    async def test_compressed_upload(self):
+        bodies = []
+
+        def handler(request):
+            bodies.append(gzip.decompress(request.content))
+            self.assertEqual(request.headers["Content-Encoding"], "gzip")
+            return httpx.Response(200, json={})
+
+        controller = await make_async_controller(handler)
+
+        await controller.post("api/artifacts/provider", data=PAYLOAD, compress=True)
+        await controller.aclose()
+
+        self.assertIn(b"title=artifact", bodies[0])
+
+
+# Run tests
+if __name__ == '__main__':
+    unittest.main()
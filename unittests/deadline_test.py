@@ -0,0 +1,79 @@
+# flake8: noqa
+import time
+import unittest
+
+from concurrent.futures import ThreadPoolExecutor
+
+from helpers import FakeSession, SlowSession, make_controller
+from tsg_client.utils.deadline import (
+    DeadlineExceeded,
+    bound_timeout,
+    deadline,
+    remaining,
+    with_deadline,
+)
+
+
+class TestDeadline(unittest.TestCase):
+
+    def setUp(self):
+        self.controller = make_controller()
+
+    def test_nested_deadlines_only_shrink(self):
+        self.assertIsNone(remaining())
+        with deadline(10):
+            with deadline(60):
+                self.assertLessEqual(remaining(), 10)
+            with deadline(1):
+                self.assertLessEqual(remaining(), 1)
+            self.assertGreater(remaining(), 1)
+        self.assertIsNone(remaining())
+
+    def test_bound_timeout(self):
+        self.assertEqual(bound_timeout((5, 30)), (5, 30))
+        with deadline(10):
+            connect, read = bound_timeout((5, 30))
+            self.assertEqual(connect, 5)
+            self.assertLessEqual(read, 10)
+            self.assertLessEqual(bound_timeout(None), 10)
+
+    def test_request_timeout_capped(self):
+        self.controller.session = FakeSession()
+
+        with deadline(2):
+            self.controller.send("GET", "https://connector.test/selfdescription", timeout=(5, 30))
+
+        connect, read = self.controller.session.requests[0]["timeout"]
+        self.assertLessEqual(connect, 2)
+        self.assertLessEqual(read, 2)
+
+    def test_fail_fast(self):
+        self.controller.session = FakeSession()
+
+        with deadline(0.01):
+            time.sleep(0.02)
+            with self.assertRaises(DeadlineExceeded):
+                self.controller.get("selfdescription")
+        # No request is sent once the deadline has run out
+        self.assertEqual(self.controller.session.calls, 0)
+
+    def test_timeout_error_raised_as_deadline_exceeded(self):
+        self.controller.session = SlowSession()
+
+        with deadline(0.01):
+            with self.assertRaises(DeadlineExceeded):
+                self.controller.get("selfdescription")
+
+    def test_worker_threads_inherit_deadline(self):
+        with deadline(5):
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                inherited = executor.submit(with_deadline(remaining)).result()
+                not_inherited = executor.submit(remaining).result()
+
+        self.assertLessEqual(inherited, 5)
+        self.assertIsNone(not_inherited)
+
+
+# Run tests
+if __name__ == '__main__':
+    unittest.main()
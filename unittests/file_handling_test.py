@@ -0,0 +1,54 @@
+# flake8: noqa
+import os
+import asyncio
+import tempfile
+import unittest
+
+from tsg_client.utils.file_handling import async_save_stream_file, save_stream_file
+
+
+class TestFileHandling(unittest.TestCase):
+
+    def test_save_stream_file(self):
+        chunks = (b"x" * 1024 for _ in range(10))
+
+        with tempfile.TemporaryDirectory() as path:
+            result = save_stream_file("artifact", chunks, "csv", path)
+
+            self.assertEqual(result["file_path"], os.path.join(path, "artifact.csv"))
+            self.assertEqual(result["bytes_written"], 10 * 1024)
+            self.assertEqual(os.path.getsize(result["file_path"]), 10 * 1024)
+            self.assertGreaterEqual(result["elapsed_seconds"], 0)
+
+    def test_async_save_stream_file(self):
+        ticks = []
+
+        async def chunks():
+            for _ in range(10):
+                await asyncio.sleep(0)
+                yield b"x" * 1024
+
+        async def ticker():
+            # Other tasks keep running while the file is written
+            while True:
+                ticks.append(None)
+                await asyncio.sleep(0)
+
+        async def save(path):
+            task = asyncio.create_task(ticker())
+            try:
+                return await async_save_stream_file("artifact", chunks(), "csv", path)
+            finally:
+                task.cancel()
+
+        with tempfile.TemporaryDirectory() as path:
+            result = asyncio.run(save(path))
+
+            self.assertEqual(result["bytes_written"], 10 * 1024)
+            self.assertEqual(os.path.getsize(result["file_path"]), 10 * 1024)
+            self.assertTrue(ticks)
+
+
+# Run tests
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+# flake8: noqa
+import asyncio
+import time
+import unittest
+
+from helpers import FakeSession, make_controller, make_response
+from tsg_client.controllers.Endpoints import Endpoints
+from tsg_client.controllers.TSGController import TSGController, broker_urls
+from tsg_client.utils.hedging import HedgedRequests
+
+
+class BrokerSession(FakeSession):
+    # Fake session answering each broker (base URL) with a status code
+
+    def __init__(self, status_codes):
+        super().__init__()
+        self.status_codes = status_codes
+
+    def request(self, method, url, **kwargs):
+        super().request(method, url, **kwargs)
+        return make_response(
+            status_code=next(
+                code for base_url, code in self.status_codes.items() if url.startswith(base_url)
+            ),
+            content=b'[{"@id": "urn:ids:test:connector"}]',
+            headers={"Content-Type": "application/json"},
+        )
+
+
+def replica(name, delay=0.0, error=None):
+    def call():
+        time.sleep(delay)
+        if error is not None:
+            raise error
+        return name
+    return call
+
+
+class TestHedgedRequests(unittest.TestCase):
+
+    def setUp(self):
+        self.hedging = HedgedRequests(initial_delay=0.05, min_delay=0.01, min_samples=5)
+
+    def test_fast_primary_not_hedged(self):
+        result = self.hedging.call([replica("primary"), replica("mirror")])
+
+        self.assertEqual(result, "primary")
+        self.assertEqual(self.hedging.hedged, 0)
+
+    def test_slow_primary_hedged(self):
+        start = time.monotonic()
+        result = self.hedging.call([replica("primary", delay=0.5), replica("mirror")])
+
+        self.assertEqual(result, "mirror")
+        self.assertLess(time.monotonic() - start, 0.3)
+        self.assertEqual((self.hedging.hedged, self.hedging.hedge_wins), (1, 1))
+
+    def test_failover(self):
+        result = self.hedging.call([
+            replica("primary", error=ConnectionError("broker down")),
+            replica("mirror"),
+        ])
+        self.assertEqual(result, "mirror")
+
+        with self.assertRaises(ConnectionError):
+            self.hedging.call([replica("primary", error=ConnectionError("broker down"))])
+
+    def test_percentile_delay(self):
+        self.assertEqual(self.hedging.delay(), 0.05)
+        for latency in (0.1, 0.2, 0.3, 0.4, 1.0):
+            self.hedging._answered(0, latency)
+
+        self.hedging.percentile = 80
+        self.assertEqual(self.hedging.delay(), 0.4)
+
+    def test_slow_attempts_recorded(self):
+        # The abandoned (slow) primary and the failed attempts are recorded
+        self.hedging.call([replica("primary", delay=0.3), replica("mirror")])
+        self.hedging.call([
+            replica("primary", error=ConnectionError("broker down")),
+            replica("mirror"),
+        ])
+
+        latencies = sorted(self.hedging._latencies)
+        self.assertEqual(len(latencies), 4)
+        self.assertGreaterEqual(latencies[-1], 0.05)
+
+    def test_broker_error_fails_over(self):
+        tsg = TSGController.__new__(TSGController)
+        tsg.endpoints = Endpoints()
+        tsg.metadata_broker_urls = ["https://broker.test", "https://mirror.test"]
+        tsg.metadata_broker_url = "https://broker.test"
+        tsg.broker_hedging = self.hedging
+        tsg.controller = make_controller()
+        session = tsg.controller.session = BrokerSession(
+            {"https://broker.test": 503, "https://mirror.test": 200}
+        )
+
+        result = tsg.query_metadata_broker()
+
+        self.assertEqual(result, [{"@id": "urn:ids:test:connector"}])
+        self.assertEqual(len(session.urls), 2)
+        self.assertTrue(session.urls[1].startswith("https://mirror.test"))
+
+    def test_async_slow_primary_hedged(self):
+        async def call(name, delay):
+            await asyncio.sleep(delay)
+            return name
+
+        result = asyncio.run(self.hedging.async_call([
+            lambda: call("primary", 0.5),
+            lambda: call("mirror", 0),
+        ]))
+
+        self.assertEqual(result, "mirror")
+        self.assertEqual(self.hedging.hedge_wins, 1)
+
+    def test_broker_urls(self):
+        self.assertEqual(broker_urls(None), [])
+        self.assertEqual(broker_urls("https://broker.test"), ["https://broker.test"])
+        self.assertEqual(
+            broker_urls(("https://broker.test", "https://mirror.test")),
+            ["https://broker.test", "https://mirror.test"],
+        )
+
+
+# Run tests
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+# flake8: noqa
+"""Fakes shared by the RequestController/AsyncRequestController tests."""
+import io
+import threading
+import time
+
+import httpx
+import requests
+
+from tsg_client.controllers.AsyncRequestController import AsyncRequestController
+from tsg_client.controllers.RequestController import RequestController
+
+
+def make_response(status_code=200, content=b'{"@id": "urn:ids:test"}', headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content
+    response.raw = io.BytesIO(content)
+    response.headers.update(headers or {})
+    return response
+
+
+def make_controller(**kwargs):
+    return RequestController(
+        base_url="https://connector.test", api_key="key", connector_id="id", **kwargs
+    )
+
+
+async def make_async_controller(handler, **kwargs):
+    # Async controller answering every request with handler (see httpx.MockTransport)
+    controller = AsyncRequestController(
+        base_url="https://connector.test", api_key="key", connector_id="id", **kwargs
+    )
+    await controller.client.aclose()
+    controller.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return controller
+
+
+class FakeSession(requests.Session):
+    """
+    Session replaying the given outcomes (responses or exceptions to raise) in order,
+    then ``default`` for any further request. The URL and keyword arguments of each
+    request are recorded.
+    """
+
+    def __init__(self, outcomes=(), default=None, delay=0.0):
+        super().__init__()
+        self.outcomes = list(outcomes)
+        self.default = default
+        self.delay = delay
+        self.urls = []
+        self.requests = []
+        self.lock = threading.Lock()
+
+    @property
+    def calls(self):
+        return len(self.requests)
+
+    def request(self, method, url, **kwargs):
+        with self.lock:
+            self.urls.append(url)
+            self.requests.append(kwargs)
+            outcome = self.outcomes.pop(0) if self.outcomes else self.default
+        time.sleep(self.delay)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+class SlowSession:
+    # Session whose requests always run into their (read) timeout
+
+    def request(self, method, url, timeout=None, **kwargs):
+        time.sleep(timeout)
+        raise requests.exceptions.ReadTimeout("read timed out")
@@ -0,0 +1,47 @@
+# flake8: noqa
+import unittest
+
+import requests
+
+from tsg_client.utils import json_codec
+from tsg_client.utils.response import JSONResponse
+
+
+class TestJSONCodec(unittest.TestCase):
+
+    def tearDown(self):
+        json_codec.use_backend()
+
+    def test_backends(self):
+        document = {"@id": "urn:ids:test", "title": "Ação", "ids:permission": [1, 2.5, None]}
+
+        for backend, codec in json_codec.BACKENDS.items():
+            if codec is None:
+                continue
+            with self.subTest(backend=backend):
+                json_codec.use_backend(backend)
+                encoded = json_codec.dumps(document)
+
+                self.assertIsInstance(encoded, str)
+                self.assertIn("Ação", encoded)
+                self.assertEqual(json_codec.loads(encoded), document)
+                self.assertEqual(json_codec.loads(encoded.encode("utf-8")), document)
+                with self.assertRaises(ValueError):
+                    json_codec.loads(b"not json")
+
+    def test_unavailable_backend(self):
+        with self.assertRaises(ValueError):
+            json_codec.use_backend("simplejson")
+
+    def test_response_fallback(self):
+        # Non UTF-8 bodies are decoded by requests
+        response = requests.Response()
+        response._content = '{"title": "Ação"}'.encode("utf-16")
+        response.encoding = "utf-16"
+
+        self.assertEqual(JSONResponse.wrap(response).json(), {"title": "Ação"})
+
+
+# Run tests
+if __name__ == '__main__':
+    unittest.main()
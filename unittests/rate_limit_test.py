@@ -0,0 +1,150 @@
+# flake8: noqa
+import asyncio
+import threading
+import time
+import unittest
+
+from concurrent.futures import ThreadPoolExecutor
+
+from helpers import FakeSession, make_controller, make_response
+from tsg_client.utils.deadline import DeadlineExceeded, deadline
+from tsg_client.utils.rate_limit import RateLimiter, peer_key
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def test_peer_key(self):
+        url = "https://core.test/api/description"
+        self.assertEqual(
+            peer_key(url, params={"accessUrl": "https://Remote.test/router"}),
+            "https://remote.test",
+        )
+        self.assertEqual(
+            peer_key(url, headers={"Forward-AccessURL": "https://remote.test:8080/router"}),
+            "https://remote.test:8080",
+        )
+        self.assertEqual(peer_key(url), "https://core.test")
+
+    def test_token_bucket(self):
+        limiter = RateLimiter(rate=50, burst=1)
+
+        start = time.monotonic()
+        for _ in range(6):
+            limiter.acquire("peer")
+            limiter.release("peer", 0.01)
+
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+    def test_concurrency_cap(self):
+        limiter = RateLimiter(max_concurrency=2)
+        active, peak = [0], [0]
+        lock = threading.Lock()
+
+        def call(_):
+            limiter.acquire("peer")
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+            limiter.release("peer", 0.02)
+
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            list(executor.map(call, range(6)))
+
+        self.assertEqual(peak[0], 2)
+
+    def test_deadline(self):
+        limiter = RateLimiter(rate=1, burst=1)
+        limiter.acquire("peer")
+
+        with deadline(0.1):
+            with self.assertRaises(DeadlineExceeded):
+                limiter.acquire("peer")
+
+    def test_wait_for_release(self):
+        limiter = RateLimiter(max_concurrency=1)
+        reserve = limiter._reserve
+        attempts = []
+
+        def counting_reserve(peer):
+            attempts.append(peer)
+            return reserve(peer)
+
+        limiter._reserve = counting_reserve
+        limiter.acquire("peer")
+        timer = threading.Timer(0.1, limiter.release, ("peer", 0.1))
+        timer.start()
+        limiter.acquire("peer")
+        timer.join()
+
+        # Woken by the release (no polling while waiting)
+        self.assertLessEqual(len(attempts), 3)
+        self.assertEqual(limiter.stats()["peer"]["inflight"], 1)
+
+        with deadline(0.05):
+            with self.assertRaises(DeadlineExceeded):
+                limiter.acquire("peer")
+
+    def test_async_wait_for_release(self):
+        limiter = RateLimiter(max_concurrency=1)
+
+        async def main():
+            await limiter.async_acquire("peer")
+            # Released from another thread
+            timer = threading.Timer(0.1, limiter.release, ("peer", 0.1))
+            timer.start()
+            start = time.monotonic()
+            await asyncio.wait_for(limiter.async_acquire("peer"), 1)
+            waited = time.monotonic() - start
+            timer.join()
+
+            with deadline(0.05):
+                with self.assertRaises(DeadlineExceeded):
+                    await limiter.async_acquire("peer")
+            return waited
+
+        waited = asyncio.run(main())
+
+        self.assertGreaterEqual(waited, 0.09)
+        self.assertLess(waited, 0.5)
+        self.assertEqual(limiter.stats()["peer"]["inflight"], 1)
+        self.assertEqual(limiter._peers["peer"].waiters, [])
+
+    def test_adaptive_concurrency(self):
+        limiter = RateLimiter(adaptive=True, initial_concurrency=4, max_concurrency=8)
+
+        # Healthy peer: additive increase
+        for _ in range(20):
+            limiter.acquire("peer")
+            limiter.release("peer", 0.01)
+        increased = limiter.stats()["peer"]["limit"]
+        self.assertGreater(increased, 4)
+        self.assertLessEqual(increased, 8)
+
+        # Overloaded peer (e.g., 503): multiplicative decrease
+        limiter.acquire("peer")
+        limiter.release("peer", 0.01, ok=False)
+        self.assertAlmostEqual(limiter.stats()["peer"]["limit"], increased / 2)
+
+        # Degraded latency also backs off (once per round trip)
+        time.sleep(0.1)
+        limiter.acquire("peer")
+        limiter.release("peer", 0.05)
+        self.assertAlmostEqual(limiter.stats()["peer"]["limit"], increased / 4)
+
+    def test_request_controller(self):
+        limiter = RateLimiter(adaptive=True)
+        controller = make_controller(rate_limiter=limiter)
+        controller.session = FakeSession(default=make_response(status_code=503, content=b""))
+        controller.get("api/description", params={"accessUrl": "https://remote.test/router"})
+
+        stats = limiter.stats()["https://remote.test"]
+        self.assertEqual(stats["inflight"], 0)
+        self.assertEqual(stats["limit"], 2)
+
+
+# Run tests
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+# flake8: noqa
+import threading
+import time
+import unittest
+
+from tsg_client.utils.refresher import BackgroundRefresher
+
+
+class TestBackgroundRefresher(unittest.TestCase):
+
+    def setUp(self):
+        self.loads = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def loader(self, value):
+        self.release.wait()
+        self.loads.append(value)
+        return f"{value}-{len(self.loads)}"
+
+    def test_stale_value_served_while_refreshing(self):
+        refresher = BackgroundRefresher(self.loader, ttl=0.05, poll_interval=10)
+        self.addCleanup(refresher.stop)
+
+        self.assertEqual(refresher.get("key", "a"), "a-1")
+        time.sleep(0.1)
+
+        # Expired: last good value returned immediately, single reload
+        self.release.clear()
+        self.assertEqual(refresher.get("key", "a"), "a-1")
+        self.assertEqual(refresher.get("key", "a"), "a-1")
+        self.release.set()
+        time.sleep(0.05)
+
+        self.assertEqual(refresher.get("key", "a"), "a-2")
+        self.assertEqual(len(self.loads), 2)
+
+    def test_hot_keys_refreshed_ahead_of_expiry(self):
+        refresher = BackgroundRefresher(
+            self.loader, ttl=0.2, refresh_ahead=0.15, min_reads=2, poll_interval=0.01
+        )
+        self.addCleanup(refresher.stop)
+
+        refresher.get("hot", "hot")
+        refresher.get("hot", "hot")
+        refresher.get("cold", "cold")
+        time.sleep(0.1)
+
+        self.assertIn("hot", self.loads[2:])
+        self.assertNotIn("cold", self.loads[2:])
+
+    def test_failing_loader_backoff(self):
+        calls = []
+
+        def flaky_loader():
+            calls.append(1)
+            if len(calls) > 1:
+                raise ConnectionError("connector down")
+            return "value"
+
+        refresher = BackgroundRefresher(flaky_loader, ttl=0.01, poll_interval=10)
+        self.addCleanup(refresher.stop)
+
+        self.assertEqual(refresher.get("key"), "value")
+        time.sleep(0.02)
+
+        # Last good value is served, failing reloads are backed off
+        for _ in range(5):
+            self.assertEqual(refresher.get("key"), "value")
+            time.sleep(0.01)
+        self.assertEqual(len(calls), 2)
+
+    def test_first_load_failure(self):
+        def failing_loader():
+            raise ConnectionError("connector down")
+
+        refresher = BackgroundRefresher(failing_loader, poll_interval=10)
+        self.addCleanup(refresher.stop)
+
+        with self.assertRaises(ConnectionError):
+            refresher.get("key")
+
+
+# Run tests
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+# flake8: noqa
+import unittest
+from unittest import mock
+
+import requests
+
+from tsg_client.controllers.RequestController import RequestController
+from tsg_client.utils.response import JSONResponse, looks_like_json
+
+
+def make_response(content, content_type=None, status_code=200):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content
+    if content_type:
+        response.headers["Content-Type"] = content_type
+    return response
+
+
+class TestJSONResponse(unittest.TestCase):
+
+    def test_looks_like_json(self):
+        self.assertTrue(looks_like_json(make_response(b'\n  {"@id": "urn:ids:test"}', "application/ld+json")))
+        self.assertTrue(looks_like_json(make_response(b"[1, 2]", "application/json")))
+        # Content type and first bytes are both needed
+        self.assertFalse(looks_like_json(make_response(b"", "application/ld+json")))
+        self.assertFalse(looks_like_json(make_response(b"<html></html>", "application/json")))
+        self.assertFalse(looks_like_json(make_response(b"[1, 2]")))
+        self.assertFalse(looks_like_json(make_response(b"<html></html>", "text/html")))
+
+    def test_json_decoded_once(self):
+        response = JSONResponse.wrap(make_response(b'{"@id": "urn:ids:test"}'))
+
+        with mock.patch("tsg_client.utils.json_codec.loads", return_value={}) as json:
+            first = response.json()
+            second = response.json()
+
+        self.assertIs(first, second)
+        self.assertEqual(json.call_count, 1)
+        self.assertIs(JSONResponse.wrap(response), response)
+
+    def test_check_response_without_parsing(self):
+        response = make_response(b'{"@id": "urn:ids:test"}', "application/json")
+
+        with mock.patch("requests.Response.json") as json:
+            RequestController.check_response("GET", response, 200)
+        json.assert_not_called()
+
+    def test_check_response_not_json(self):
+        with self.assertRaises(Exception):
+            RequestController.check_response("GET", make_response(b"plain text"), 200)
+        for body in (b"not found", b"true story", b"404 page"):
+            with self.subTest(body=body), self.assertRaises(Exception):
+                RequestController.check_response("GET", make_response(body), 200)
+        with self.assertRaises(Exception):
+            RequestController.check_response(
+                "GET", make_response(b"<html></html>", "application/json"), 200
+            )
+        # JSON scalars are still valid JSON bodies
+        RequestController.check_response("GET", make_response(b"true"), 200)
+        # DELETE responses may have no JSON body
+        RequestController.check_response("DELETE", make_response(b""), 200)
+
+
+# Run tests
+if __name__ == '__main__':
+    unittest.main()
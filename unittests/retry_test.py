@@ -0,0 +1,120 @@
+# flake8: noqa
+import io
+import unittest
+
+import requests
+
+from helpers import FakeSession, make_controller, make_response
+from tsg_client.utils.retry import RetryPolicy
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def setUp(self):
+        self.policy = RetryPolicy(max_attempts=3, backoff_base=0, max_total_time=5)
+        self.controller = make_controller(retry_policy=self.policy)
+
+    def test_retry_status_code(self):
+        self.controller.session = FakeSession([
+            make_response(status_code=502, content=b""),
+            make_response(),
+        ])
+
+        response = self.controller.get("selfdescription", expected_status_code=200)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.controller.session.calls, 2)
+        self.assertEqual(self.policy.stats["retries"], 1)
+        self.assertEqual(self.policy.stats["status_502"], 1)
+
+    def test_max_attempts(self):
+        self.controller.session = FakeSession(
+            [requests.exceptions.ConnectionError("reset")] * 3
+        )
+
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.controller.get("selfdescription")
+        self.assertEqual(self.controller.session.calls, 3)
+        self.assertEqual(self.policy.stats["gave_up"], 1)
+
+    def test_non_idempotent_methods(self):
+        # POST requests that may have reached the server are not retried
+        self.controller.session = FakeSession([
+            make_response(status_code=503, content=b""),
+        ])
+        response = self.controller.post("api/artifacts/consumer/contractRequest")
+        self.assertEqual(response.status_code, 503)
+
+        self.controller.session = FakeSession([requests.exceptions.ReadTimeout()])
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            self.controller.post("api/artifacts/consumer/contractRequest")
+
+        # ... unless the connection was never established
+        self.controller.session = FakeSession([
+            requests.exceptions.ConnectTimeout(),
+            make_response(),
+        ])
+        response = self.controller.post("api/artifacts/consumer/contractRequest")
+        self.assertEqual(response.status_code, 200)
+
+    def test_retry_multipart_body(self):
+        bodies = []
+
+        class RecordingSession(FakeSession):
+            def request(self, method, url, data=None, files=None, headers=None, **kwargs):
+                # Encode the body as requests does (reading the files)
+                prepared = requests.Request(
+                    method, url, data=data, files=files, headers=headers
+                ).prepare()
+                bodies.append(prepared.body)
+                return super().request(method, url, **kwargs)
+
+        self.controller.session = RecordingSession([
+            requests.exceptions.ConnectTimeout(),
+            make_response(),
+        ])
+        self.controller.post(
+            "api/artifacts/provider", files={"artifact": io.BytesIO(b"artifact content")}
+        )
+
+        self.assertEqual(len(bodies), 2)
+        self.assertEqual(bodies[0], bodies[1])
+        self.assertIn(b"artifact content", bodies[1])
+
+    def test_streamed_body_not_retried(self):
+        self.controller.session = FakeSession([requests.exceptions.ConnectTimeout()])
+
+        with self.assertRaises(requests.exceptions.ConnectTimeout):
+            self.controller.post("api/artifacts/provider", data=(b"chunk" for _ in range(2)))
+        self.assertEqual(self.controller.session.calls, 1)
+
+    def test_retry_after(self):
+        self.assertEqual(
+            RetryPolicy.retry_after(make_response(429, headers={"Retry-After": "2"})), 2
+        )
+        self.assertEqual(
+            RetryPolicy.retry_after(
+                make_response(429, headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+            ),
+            0,
+        )
+
+        # A Retry-After beyond the total time budget is not waited for
+        self.controller.session = FakeSession([
+            make_response(status_code=429, content=b"", headers={"Retry-After": "60"}),
+        ])
+        response = self.controller.get("selfdescription")
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(self.controller.session.calls, 1)
+
+    def test_full_jitter_backoff(self):
+        policy = RetryPolicy(backoff_base=1, backoff_max=4)
+        for attempt in range(6):
+            delay = policy.backoff(attempt)
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, min(4, 2 ** attempt))
+
+
+# Run tests
+if __name__ == '__main__':
+    unittest.main()
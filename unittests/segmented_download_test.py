@@ -0,0 +1,105 @@
+# flake8: noqa
+import os
+import tempfile
+import unittest
+
+from tsg_client.utils.segmented_download import SegmentedDownload, parse_content_range
+
+CONTENT = bytes(range(256)) * 40
+
+
+class FakeRangeResponse:
+
+    def __init__(self, start, end, fail_after=None):
+        self.status_code = 206
+        self.content = CONTENT[start:end + 1]
+        self.fail_after = fail_after
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.content), chunk_size):
+            if self.fail_after is not None and i >= self.fail_after:
+                raise ConnectionError("connection reset")
+            yield self.content[i:i + chunk_size]
+
+
+class TestSegmentedDownload(unittest.TestCase):
+
+    def test_parse_content_range(self):
+        self.assertEqual(parse_content_range("bytes 0-0/1234"), 1234)
+        self.assertIsNone(parse_content_range("bytes 0-0/*"))
+        self.assertIsNone(parse_content_range(None))
+
+    def test_segmented_download(self):
+        with tempfile.TemporaryDirectory() as path:
+            file_path = os.path.join(path, "artifact.csv")
+            download = SegmentedDownload(file_path, len(CONTENT), segments=4, chunk_size=100)
+
+            result = download.run(lambda start, end: FakeRangeResponse(start, end))
+
+            self.assertEqual(result["bytes_written"], len(CONTENT))
+            self.assertEqual(result["segments"], 4)
+            with open(file_path, "rb") as f:
+                self.assertEqual(f.read(), CONTENT)
+            self.assertFalse(os.path.exists(file_path + ".part.json"))
+
+    def test_resume_interrupted_download(self):
+        with tempfile.TemporaryDirectory() as path:
+            file_path = os.path.join(path, "artifact.csv")
+
+            download = SegmentedDownload(file_path, len(CONTENT), validator='"v1"', segments=3, chunk_size=100)
+            with self.assertRaises(ConnectionError):
+                download.run(lambda start, end: FakeRangeResponse(start, end, fail_after=500))
+            self.assertTrue(os.path.exists(file_path + ".part.json"))
+
+            download = SegmentedDownload(file_path, len(CONTENT), validator='"v1"', segments=3, chunk_size=100)
+            self.assertEqual(download.bytes_done, 3 * 500)
+            result = download.run(lambda start, end: FakeRangeResponse(start, end))
+
+            self.assertEqual(result["resumed_bytes"], 3 * 500)
+            self.assertEqual(result["bytes_written"], len(CONTENT) - 3 * 500)
+            with open(file_path, "rb") as f:
+                self.assertEqual(f.read(), CONTENT)
+
+    def test_checkpoint_interval(self):
+        saved = []
+
+        class CountingDownload(SegmentedDownload):
+            def _save_state(self, state):
+                saved.append(sum(done for _, _, done in state["segments"]))
+                super()._save_state(state)
+
+        with tempfile.TemporaryDirectory() as path:
+            file_path = os.path.join(path, "artifact.csv")
+            download = CountingDownload(
+                file_path, len(CONTENT), segments=1, chunk_size=100,
+                checkpoint_bytes=1000, checkpoint_interval=60,
+            )
+            download.run(lambda start, end: FakeRangeResponse(start, end))
+
+            # Initial state, every 1000 bytes and on segment completion
+            # (instead of once per chunk)
+            self.assertEqual(saved, [0, 1000, 2000, 3000, 4000, 5000, 6000, 7000, 8000, 9000, 10000, 10240])
+
+            saved.clear()
+            download = CountingDownload(
+                file_path, len(CONTENT), segments=2, chunk_size=100,
+                checkpoint_bytes=len(CONTENT), checkpoint_interval=60,
+            )
+            with self.assertRaises(ConnectionError):
+                download.run(lambda start, end: FakeRangeResponse(start, end, fail_after=500))
+
+            # Progress saved when the segments fail
+            self.assertEqual(saved[0], 0)
+            self.assertEqual(saved[-1], 2 * 500)
+            self.assertLessEqual(len(saved), 3)
+
+
+# Run tests
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+# flake8: noqa
+import io
+import os
+import json
+import sys
+import subprocess
+import unittest
+
+from tsg_client.controllers.SelfDescription import SelfDescription
+from tsg_client.utils.selfdescription_stream import (
+    iter_catalogs,
+    iter_offered_resources,
+    parse_selfdescription,
+)
+
+
+def resource(index):
+    return {
+        "@id": f"urn:ids:test:resources:{index}",
+        "ids:title": [{"@value": f"Resource {index}"}],
+        "ids:created": {"@value": "2024-01-01T00:00:00.000Z"},
+        "ids:contractOffer": [{
+            "@id": f"https://w3id.org/idsa/autogen/contractOffer/{index}",
+            "ids:price": 1.5,
+        }],
+        "ids:representation": [{
+            "ids:instance": [{"@id": f"urn:ids:test:artifacts:{index}"}]
+        }],
+        "ids:keyword": [{"@value": "unused"}],
+    }
+
+
+SELFDESCRIPTION = {
+    "@context": {"ids": "https://w3id.org/idsa/core/"},
+    "@id": "urn:ids:test:connector",
+    "ids:publicKey": {"ids:keyValue": "A" * 4096},
+    "ids:resourceCatalog": [
+        {"@id": "urn:ids:test:catalog:1", "ids:offeredResource": [resource(1), resource(2)]},
+        {"ids:offeredResource": [resource(3)], "@id": "urn:ids:test:catalog:2"},
+    ],
+    "ids:title": [{"@value": "Test connector"}],
+    "ids:description": [{"@value": "Test"}],
+    "ids:securityProfile": {"@id": "idsc:BASE_SECURITY_PROFILE"},
+    "ids:curator": {"@id": "urn:ids:test:curator"},
+    "ids:maintainer": {"@id": "urn:ids:test:maintainer"},
+    "ids:hasDefaultEndpoint": {"ids:accessURL": {"@id": "https://connector.test"}},
+}
+
+
+def chunks(document, size=64):
+    data = json.dumps(document).encode("utf-8")
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+
+class TestSelfDescriptionStream(unittest.TestCase):
+
+    def test_same_as_from_dict(self):
+        expected = SelfDescription.from_dict(SELFDESCRIPTION)
+
+        self.assertEqual(parse_selfdescription(chunks(SELFDESCRIPTION)), expected)
+        data = io.BytesIO(json.dumps(SELFDESCRIPTION).encode("utf-8"))
+        self.assertEqual(parse_selfdescription(data), expected)
+
+    def test_interned_ids(self):
+        expected = SelfDescription.from_dict(SELFDESCRIPTION)
+        document = {
+            **SELFDESCRIPTION,
+            "ids:resourceCatalog": [
+                *SELFDESCRIPTION["ids:resourceCatalog"],
+                {"ids:offeredResource": [resource(4)]},
+            ],
+        }
+
+        # Same (interned) catalog ID strings as from_dict
+        streamed = parse_selfdescription(chunks(SELFDESCRIPTION))
+        for catalog, expected_catalog in zip(streamed.catalogs, expected.catalogs):
+            self.assertIs(catalog.id, expected_catalog.id)
+        # Catalogs without @id (as from_dict)
+        self.assertEqual(parse_selfdescription(chunks(document)), SelfDescription.from_dict(document))
+        self.assertIs(
+            parse_selfdescription(chunks(document)).catalogs[-1].id,
+            SelfDescription.from_dict(document).catalogs[-1].id,
+        )
+
+    def test_iter_catalogs(self):
+        catalogs = iter_catalogs(chunks(SELFDESCRIPTION))
+
+        first = next(catalogs)
+        self.assertEqual(first.id, "urn:ids:test:catalog:1")
+        self.assertEqual(
+            [r.artifact_id for r in first.offeredResource],
+            ["urn:ids:test:artifacts:1", "urn:ids:test:artifacts:2"],
+        )
+        # Catalog ID after its resources
+        self.assertEqual(next(catalogs).id, "urn:ids:test:catalog:2")
+        self.assertEqual(list(catalogs), [])
+
+    def test_iter_offered_resources(self):
+        resources = list(iter_offered_resources(chunks(SELFDESCRIPTION)))
+
+        self.assertEqual(
+            [(catalog_id, r.title) for catalog_id, r in resources],
+            [
+                ("urn:ids:test:catalog:1", "Resource 1"),
+                ("urn:ids:test:catalog:1", "Resource 2"),
+                ("urn:ids:test:catalog:2", "Resource 3"),
+            ],
+        )
+        # Full (float valued) contract offer, for the contract requests
+        self.assertEqual(
+            json.loads(resources[0][1].contract_offer.to_json()),
+            resource(1)["ids:contractOffer"][0],
+        )
+
+    def test_import(self):
+        # Importable on its own (no circular import with tsg_client.controllers)
+        result = subprocess.run(
+            [sys.executable, "-c", "import tsg_client.utils.selfdescription_stream"],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            capture_output=True,
+            text=True,
+        )
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+    def test_invalid_selfdescription(self):
+        document = {**SELFDESCRIPTION, "ids:curator": None}
+
+        with self.assertRaises(ValueError):
+            parse_selfdescription(chunks(document))
+
+
+# Run tests
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+# flake8: noqa
+import asyncio
+import threading
+import time
+import unittest
+
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from helpers import FakeSession, make_async_controller, make_controller, make_response
+from tsg_client.utils.single_flight import SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def setUp(self):
+        self.controller = make_controller(coalesce=True)
+        self.controller.session = FakeSession(default=make_response(), delay=0.1)
+
+    def test_concurrent_identical_gets_coalesced(self):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            responses = list(executor.map(
+                lambda _: self.controller.get("selfdescription", expected_status_code=200),
+                range(8),
+            ))
+
+        self.assertEqual(self.controller.session.calls, 1)
+        self.assertTrue(all(rsp is responses[0] for rsp in responses))
+        self.assertEqual(self.controller.single_flight.coalesced, 7)
+
+    def test_different_requests_not_coalesced(self):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(
+                lambda agent: self.controller.get("selfdescription", params={"agentId": agent}),
+                ["a", "b"],
+            ))
+        # Sequential and non GET requests are not coalesced either
+        self.controller.get("selfdescription", params={"agentId": "a"})
+        self.controller.post("selfdescription")
+
+        self.assertEqual(self.controller.session.calls, 4)
+
+    def test_exception_shared(self):
+        flight = SingleFlight()
+        started = threading.Event()
+
+        def failing():
+            started.set()
+            time.sleep(0.05)
+            raise ConnectionError("connector down")
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(flight.do, "key", failing)
+            started.wait()
+            follower = executor.submit(flight.do, "key", failing)
+
+            for future in (leader, follower):
+                with self.assertRaises(ConnectionError):
+                    future.result()
+        self.assertEqual(flight.coalesced, 1)
+
+
+class TestAsyncSingleFlight(unittest.IsolatedAsyncioTestCase):
+
+    async def test_concurrent_identical_gets_coalesced(self):
+        calls = []
+
+        async def handler(request):
+            calls.append(request)
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json={"@id": "urn:ids:test"})
+
+        controller = await make_async_controller(handler, coalesce=True)
+
+        responses = await asyncio.gather(
+            *(controller.get("selfdescription", expected_status_code=200) for _ in range(8))
+        )
+        await controller.aclose()
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(rsp is responses[0] for rsp in responses))
+
+
+# Run tests
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+# flake8: noqa
+import unittest
+
+import httpx
+import requests
+
+from tsg_client.controllers.RequestController import RequestController
+from tsg_client.utils.retry import RetryPolicy
+from tsg_client.utils.transport import HTTP2Transport, Transport
+
+
+class TestHTTP2Transport(unittest.TestCase):
+
+    def setUp(self):
+        self.requests = []
+        self.transport = HTTP2Transport()
+        self.addCleanup(self.transport.close)
+        self.controller = RequestController(
+            base_url="https://connector.test",
+            api_key="key",
+            connector_id="id",
+            transport=self.transport,
+        )
+
+    def mock(self, handler):
+        def record(request):
+            self.requests.append(request)
+            return handler(request)
+
+        self.transport.client.close()
+        self.transport.client = httpx.Client(transport=httpx.MockTransport(record))
+
+    def test_request(self):
+        self.mock(lambda request: httpx.Response(200, json={"@id": "urn:ids:test"}))
+
+        rsp = self.controller.get(
+            "selfdescription", params={"a": "1", "b": None}, expected_status_code=200
+        )
+
+        self.assertIsInstance(rsp, requests.Response)
+        self.assertEqual(rsp.json(), {"@id": "urn:ids:test"})
+        self.assertEqual(rsp.headers["content-type"], "application/json")
+        self.assertEqual(str(self.requests[0].url), "https://connector.test/selfdescription?a=1")
+        self.assertEqual(self.requests[0].headers["Authorization"], "Bearer key")
+
+    def test_streamed_response(self):
+        self.mock(lambda request: httpx.Response(200, content=b"x" * 1000))
+
+        with self.controller.get("api/artifacts/consumer/artifact", stream=True) as rsp:
+            chunks = list(rsp.iter_content(chunk_size=256))
+
+        self.assertEqual(b"".join(chunks), b"x" * 1000)
+        self.assertGreater(len(chunks), 1)
+
+    def test_connect_errors(self):
+        def handler(request):
+            if len(self.requests) == 1:
+                raise httpx.ConnectError("connection refused")
+            return httpx.Response(200, json={})
+
+        self.mock(handler)
+        # Raised as requests exceptions, and retried as such
+        self.controller.retry_policy = RetryPolicy(backoff_base=0)
+
+        rsp = self.controller.post("api/artifacts/consumer/contractRequest")
+
+        self.assertEqual(rsp.status_code, 200)
+        self.assertEqual(len(self.requests), 2)
+
+    def test_retried_status_code(self):
+        def handler(request):
+            if len(self.requests) == 1:
+                return httpx.Response(503, content=b"unavailable")
+            return httpx.Response(200, json={"@id": "urn:ids:test"})
+
+        self.mock(handler)
+        self.controller.retry_policy = RetryPolicy(backoff_base=0)
+
+        rsp = self.controller.get("selfdescription", expected_status_code=200)
+
+        self.assertEqual(rsp.json(), {"@id": "urn:ids:test"})
+        self.assertEqual(len(self.requests), 2)
+
+    def test_request_options(self):
+        self.mock(lambda request: httpx.Response(302, headers={"Location": "/moved"}))
+
+        rsp = self.transport.request("GET", "https://connector.test/a", allow_redirects=False)
+        self.assertEqual(rsp.status_code, 302)
+
+        # Other TLS settings are sent through a separate client
+        client = self.transport._client(verify=False)
+        self.assertIsNot(client, self.transport.client)
+        self.assertIs(self.transport._client(verify=False), client)
+        self.assertIs(self.transport._client(verify=True), self.transport.client)
+
+        with self.assertRaises(TypeError):
+            self.transport.request("GET", "https://connector.test/a", proxies={})
+
+    def test_transport_interface(self):
+        with self.assertRaises(TypeError):
+            Transport()
+
+        class Incomplete(Transport):
+            pass
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+    def test_close(self):
+        client = self.transport._client(verify=False)
+
+        with self.controller:
+            pass
+
+        # Closing the controller closes every transport client
+        self.assertTrue(self.transport.client.is_closed)
+        self.assertTrue(client.is_closed)
+
+
+# Run tests
+if __name__ == '__main__':
+    unittest.main()
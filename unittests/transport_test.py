@@ -0,0 +1,51 @@
+# flake8: noqa
+import unittest
+
+from helpers import FakeSession, make_controller
+from tsg_client.utils.transport import TransportProfile, url_origin
+
+
+class TestTransportProfile(unittest.TestCase):
+
+    def setUp(self):
+        self.controller = make_controller()
+        self.broker = TransportProfile(pool_maxsize=4, timeout=(3, 30), verify="/ca.pem")
+        self.controller.mount("https://broker.test/infrastructure", self.broker)
+
+    def test_url_origin(self):
+        self.assertEqual(url_origin("HTTPS://Broker.test:8080/a/b?c=d"), "https://broker.test:8080")
+
+    def test_adapter_per_origin(self):
+        session = self.controller.session
+
+        adapter = session.get_adapter("https://broker.test/connectors/")
+        self.assertEqual(adapter._pool_maxsize, 4)
+        # Other hosts (including look-alike ones) use the default profile
+        adapter = session.get_adapter("https://broker.test.example/connectors/")
+        self.assertEqual(adapter._pool_maxsize, 10)
+
+    def test_request_settings(self):
+        self.controller.session = FakeSession()
+
+        self.controller.send("GET", "https://broker.test/connectors/")
+        self.controller.send("GET", "https://docs.test/openapi.json", timeout=5)
+
+        broker_kwargs, docs_kwargs = self.controller.session.requests
+        self.assertEqual(broker_kwargs["timeout"], (3, 30))
+        self.assertEqual(broker_kwargs["verify"], "/ca.pem")
+        self.assertEqual(docs_kwargs["timeout"], 5)
+        self.assertTrue(docs_kwargs["verify"])
+
+    def test_keep_alive(self):
+        self.controller.mount("https://once.test", TransportProfile(keep_alive=False))
+        self.controller.session = FakeSession()
+
+        self.controller.send("GET", "https://once.test/data", headers={"Accept": "*/*"})
+
+        headers = self.controller.session.requests[0]["headers"]
+        self.assertEqual(headers, {"Accept": "*/*", "Connection": "close"})
+
+
+# Run tests
+if __name__ == '__main__':
+    unittest.main()